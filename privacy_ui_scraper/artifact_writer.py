@@ -0,0 +1,79 @@
+"""Batched, atomic artifact writes that stay off the event loop.
+
+metadata.json, README.md, summary.json and index.html are rewritten every
+time a capture or pattern finishes. Writes are queued per path (the latest
+content wins), held for a short delay so a burst of updates turns into one
+batch, and written with aiofiles to a temp file that is renamed into place.
+Readers therefore never see a half-written file, and in-flight captures never
+wait on the disk.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiofiles
+import aiofiles.os
+
+from config import ARTIFACT_FLUSH_DELAY
+
+logger = logging.getLogger(__name__)
+
+async def write_atomic(path: Path, data: bytes):
+    """Write `data` to a temp file next to `path` and rename it into place, off the event loop."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    async with aiofiles.open(tmp_path, 'wb') as f:
+        await f.write(data)
+    await aiofiles.os.replace(tmp_path, path)
+
+class ArtifactWriter:
+    """Coalesce artifact writes per path and flush them in batches."""
+
+    def __init__(self, delay: float = ARTIFACT_FLUSH_DELAY):
+        self.delay = delay
+        self.batches = 0
+        self.files_written = 0
+        self._pending: Dict[Path, bytes] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def write(self, path: Path, data: bytes):
+        """Queue `data` for `path`, replacing anything still queued for it. Needs a running loop."""
+        self._pending[path] = data
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def flush(self):
+        """Write everything queued so far and wait until it is on disk."""
+        await self._flush_pending()
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        try:
+            await self._flush_pending()
+        except Exception as e:
+            logger.error(f"Artifact write failed: {e}")
+
+    async def _flush_pending(self):
+        # One batch at a time, so an older batch can't land after a newer one.
+        # A failed write doesn't stop the flush: everything else queued,
+        # including writes queued meanwhile, still goes out before the first
+        # error is raised.
+        async with self._lock:
+            errors = []
+            while self._pending:
+                batch, self._pending = self._pending, {}
+                outcomes = await asyncio.gather(
+                    *(write_atomic(path, data) for path, data in batch.items()), return_exceptions=True
+                )
+                batch_errors = [
+                    (path, outcome) for path, outcome in zip(batch, outcomes) if isinstance(outcome, Exception)
+                ]
+                self.batches += 1
+                self.files_written += len(batch) - len(batch_errors)
+                for path, error in batch_errors:
+                    logger.error(f"Could not write {path}: {error}")
+                errors.extend(batch_errors)
+            if errors:
+                raise errors[0][1]
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+"""Offline capture benchmark: drive ScreenshotCapture through the local fixture
+site and report throughput, latency percentiles and detection accuracy.
+
+Each run is saved as JSON and compared with the previous run, so regressions
+show up run over run without touching live sites. --compare-blocking runs the
+fixtures with and without request blocking and reports what blocking saves."""
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from capture_fixtures import FIXTURES, Fixture, fixture_server, recorded_fixtures
+from capture_scheduler import CaptureScheduler
+from capture_timing import percentile, summarize_phases
+from config import BASE_DIR, BLOCK_HEAVY_RESOURCES
+from html_parser import PrivacyExample
+from records import CaptureResult, write_json
+from screenshot_capture import ScreenshotCapture
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+REPORT_PATH = BASE_DIR / "capture_benchmark.json"
+
+def _latency_ms(result: CaptureResult) -> Optional[float]:
+    """Time spent in the browser: the sum of the capture's phases."""
+    if not result.phases_ms:
+        return None
+    return round(sum(result.phases_ms.values()), 1)
+
+def _latency_summary(values: List[float]) -> Dict:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.5), 1),
+        "p95_ms": round(percentile(values, 0.95), 1),
+        "max_ms": round(max(values), 1)
+    }
+
+def _transfer_summary(results: List[CaptureResult]) -> Dict:
+    """Requests and bytes the browser loaded, and what the request blocker kept out."""
+    counted = [result for result in results if result.allowed_bytes is not None]
+    blocked_by_reason: Counter = Counter()
+    for result in counted:
+        blocked_by_reason.update(result.blocked_by_reason or {})
+    allowed_bytes = sum(result.allowed_bytes for result in counted)
+    return {
+        "captures": len(counted),
+        "allowed_requests": sum(result.allowed_requests or 0 for result in counted),
+        "allowed_bytes": allowed_bytes,
+        "bytes_per_capture": round(allowed_bytes / len(counted)) if counted else None,
+        "blocked_requests": sum(blocked_by_reason.values()),
+        "blocked_by_reason": dict(blocked_by_reason)
+    }
+
+def build_report(fixtures: List[Fixture], results: List[CaptureResult], wall_seconds: float, settings: Dict) -> Dict:
+    """Score results against their fixtures; `results[i]` belongs to `fixtures[i % len(fixtures)]`."""
+    per_fixture: Dict[str, Dict] = {
+        fixture.name: {"runs": 0, "outcome_correct": 0, "banner_correct": 0, "latencies": []}
+        for fixture in fixtures
+    }
+    latencies = []
+    phase_samples: Dict[str, List[float]] = {}
+    for index, result in enumerate(results):
+        fixture = fixtures[index % len(fixtures)]
+        stats = per_fixture[fixture.name]
+        stats["runs"] += 1
+        stats["outcome_correct"] += result.success == fixture.expect_success
+        stats["banner_correct"] += (result.banner_selector is not None) == fixture.expect_banner
+        latency = _latency_ms(result)
+        if latency is not None:
+            stats["latencies"].append(latency)
+            latencies.append(latency)
+        for phase, ms in (result.phases_ms or {}).items():
+            phase_samples.setdefault(phase, []).append(ms)
+
+    total = len(results)
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "settings": settings,
+        "captures": total,
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput_per_min": round(total / wall_seconds * 60, 1) if wall_seconds else None,
+        "latency": _latency_summary(latencies),
+        "outcome_accuracy": round(sum(s["outcome_correct"] for s in per_fixture.values()) / total, 3) if total else None,
+        "banner_accuracy": round(sum(s["banner_correct"] for s in per_fixture.values()) / total, 3) if total else None,
+        "phase_timings": summarize_phases(phase_samples),
+        "transfer": _transfer_summary(results),
+        "fixtures": {
+            name: {
+                "runs": stats["runs"],
+                "outcome_accuracy": round(stats["outcome_correct"] / stats["runs"], 3) if stats["runs"] else None,
+                "banner_accuracy": round(stats["banner_correct"] / stats["runs"], 3) if stats["runs"] else None,
+                "latency": _latency_summary(stats["latencies"])
+            }
+            for name, stats in per_fixture.items()
+        }
+    }
+
+def compare_blocking(blocking: Dict, no_blocking: Dict) -> Dict:
+    """What request blocking saves: the same fixtures captured with it on and off."""
+    def side(report: Dict) -> Dict:
+        return {
+            "bytes_per_capture": report["transfer"]["bytes_per_capture"],
+            "p50_ms": report["latency"].get("p50_ms"),
+            "p95_ms": report["latency"].get("p95_ms"),
+            "throughput_per_min": report["throughput_per_min"],
+            "banner_accuracy": report["banner_accuracy"]
+        }
+
+    on, off = side(blocking), side(no_blocking)
+    return {
+        "blocking": on,
+        "no_blocking": off,
+        "saved": {
+            key: round(off[key] - on[key], 1) if on[key] is not None and off[key] is not None else None
+            for key in ("bytes_per_capture", "p50_ms", "p95_ms")
+        },
+        "blocked_by_reason": blocking["transfer"]["blocked_by_reason"]
+    }
+
+async def run_benchmark(
+    repeat: int,
+    concurrency: int,
+    validate: bool,
+    recorded_dir: Optional[Path],
+    block_resources: bool = BLOCK_HEAVY_RESOURCES
+) -> Dict:
+    """Capture every fixture `repeat` times and score the results."""
+    fixtures = FIXTURES + (recorded_fixtures(recorded_dir) if recorded_dir else [])
+
+    async with fixture_server(recorded_dir) as base_url:
+        examples = [
+            PrivacyExample(
+                example_number=run * len(fixtures) + index + 1,
+                company=fixture.name,
+                # A distinct URL per run, so nothing is served from an earlier capture
+                url=f"{base_url}{fixture.path}?run={run}",
+                title=fixture.description,
+                use_case="benchmark"
+            )
+            for run in range(repeat)
+            for index, fixture in enumerate(fixtures)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Every fixture shares one host, so lift the per-host politeness limits
+            scheduler = CaptureScheduler(max_concurrent=concurrency, max_per_host=concurrency, host_delay=0)
+            capture = ScreenshotCapture(
+                Path(tmp), scheduler=scheduler, validate=validate, block_resources=block_resources
+            )
+            await capture.initialize()
+            try:
+                start_time = time.perf_counter()
+                results = await capture.capture_pattern_screenshots(
+                    0, "Capture Benchmark", examples, save_metadata=False
+                )
+                wall_seconds = time.perf_counter() - start_time
+            finally:
+                await capture.cleanup()
+
+    settings = {
+        "repeat": repeat, "concurrency": concurrency, "validate": validate,
+        "block_resources": block_resources, "fixtures": len(fixtures)
+    }
+    return build_report(fixtures, list(results.examples), wall_seconds, settings)
+
+def _delta(current, previous, higher_is_better: bool) -> str:
+    if current is None or previous is None:
+        return ""
+    change = current - previous
+    if not change:
+        return "  (=)"
+    better = (change > 0) == higher_is_better
+    return f"  ({'+' if change > 0 else ''}{change:.3g}, {'better' if better else 'worse'})"
+
+def print_report(report: Dict, baseline: Optional[Dict]):
+    baseline = baseline or {}
+    previous_latency = baseline.get("latency", {})
+    print(f"\n📊 CAPTURE BENCHMARK ({report['captures']} captures, {report['wall_seconds']} s)")
+    print(f"Throughput: {report['throughput_per_min']} captures/min"
+          f"{_delta(report['throughput_per_min'], baseline.get('throughput_per_min'), True)}")
+    for key in ("p50_ms", "p95_ms", "max_ms"):
+        print(f"Latency {key[:-3]}: {report['latency'].get(key)} ms"
+              f"{_delta(report['latency'].get(key), previous_latency.get(key), False)}")
+    print(f"Outcome accuracy: {report['outcome_accuracy']:.1%}"
+          f"{_delta(report['outcome_accuracy'], baseline.get('outcome_accuracy'), True)}")
+    print(f"Banner accuracy: {report['banner_accuracy']:.1%}"
+          f"{_delta(report['banner_accuracy'], baseline.get('banner_accuracy'), True)}")
+
+    print(f"\n{'Fixture':<20} {'Outcome':>8} {'Banner':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for name, stats in report["fixtures"].items():
+        latency = stats["latency"]
+        print(f"{name:<20} {stats['outcome_accuracy']:>8.0%} {stats['banner_accuracy']:>8.0%} "
+              f"{latency.get('p50_ms', '-'):>9} {latency.get('p95_ms', '-'):>9}")
+
+    print(f"\n{'Phase':<14} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for phase, timing in report["phase_timings"].items():
+        print(f"{phase:<14} {timing['p50_ms']:>9} {timing['p95_ms']:>9}")
+
+    transfer = report["transfer"]
+    if transfer["captures"]:
+        print(f"\nTransfer: {transfer['bytes_per_capture']:,} bytes/capture"
+              f"{_delta(transfer['bytes_per_capture'], baseline.get('transfer', {}).get('bytes_per_capture'), False)}"
+              f", blocked {transfer['blocked_requests']} requests {transfer['blocked_by_reason']}")
+
+def print_blocking_comparison(comparison: Dict):
+    on, off, saved = comparison["blocking"], comparison["no_blocking"], comparison["saved"]
+    print(f"\n🚫 REQUEST BLOCKING (blocked {comparison['blocked_by_reason']})")
+    print(f"{'':<20} {'Blocking':>12} {'No blocking':>12} {'Saved':>12}")
+    for key, label in (("bytes_per_capture", "Bytes/capture"), ("p50_ms", "Latency p50"), ("p95_ms", "Latency p95")):
+        print(f"{label:<20} {on[key] if on[key] is not None else '-':>12} "
+              f"{off[key] if off[key] is not None else '-':>12} {saved[key] if saved[key] is not None else '-':>12}")
+    print(f"{'Throughput/min':<20} {on['throughput_per_min']:>12} {off['throughput_per_min']:>12}")
+    print(f"{'Banner accuracy':<20} {on['banner_accuracy']:>12.0%} {off['banner_accuracy']:>12.0%}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Captures per fixture (default: 3)")
+    arg_parser.add_argument("--concurrency", type=int, default=4, help="Pages in flight (default: 4)")
+    arg_parser.add_argument(
+        "--no-validate", action="store_true",
+        help="Send every fixture to the browser instead of pre-flight checking it first"
+    )
+    arg_parser.add_argument("--recorded", type=Path, help="Directory of recorded *.html pages to add as fixtures")
+    blocking_group = arg_parser.add_mutually_exclusive_group()
+    blocking_group.add_argument(
+        "--no-block", action="store_true", help="Let video, ad and analytics requests through"
+    )
+    blocking_group.add_argument(
+        "--compare-blocking", action="store_true",
+        help="Run once with request blocking and once without, and report what blocking saves"
+    )
+    arg_parser.add_argument(
+        "--report", type=Path, default=REPORT_PATH,
+        help=f"Where to save this run (default: {REPORT_PATH.name}); the previous run there is the baseline"
+    )
+    arg_parser.add_argument("--baseline", type=Path, help="Compare with this report instead of the previous run")
+    args = arg_parser.parse_args()
+
+    baseline_path = args.baseline or args.report
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else None
+
+    block_resources = BLOCK_HEAVY_RESOURCES and not args.no_block
+    report = asyncio.run(run_benchmark(
+        args.repeat, args.concurrency, not args.no_validate, args.recorded,
+        block_resources=block_resources or args.compare_blocking
+    ))
+    print_report(report, baseline)
+    if args.compare_blocking:
+        no_blocking = asyncio.run(run_benchmark(
+            args.repeat, args.concurrency, not args.no_validate, args.recorded, block_resources=False
+        ))
+        report["blocking_comparison"] = compare_blocking(report, no_blocking)
+        print_blocking_comparison(report["blocking_comparison"])
+    write_json(args.report, report)
+    print(f"\n💾 Report saved to {args.report}")
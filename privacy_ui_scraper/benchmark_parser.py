@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+"""Benchmark HTML parse time on the real library file and synthetic copies,
+cold versus warm (cached) startup with --cache, or the text fallback on
+adversarial input with --pathological."""
+
+import argparse
+import logging
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from html_parser import PrivacyPatternParser, BACKENDS
+from config import HTML_PATH
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+def build_synthetic_copy(html_content: str, scale: int) -> str:
+    """Repeat the document body `scale` times inside a single html/body."""
+    body_open = re.search(r'<body[^>]*>', html_content, re.IGNORECASE)
+    body_close = html_content.lower().rfind('</body>')
+    if not body_open or body_close == -1:
+        return html_content * scale
+
+    head = html_content[:body_open.end()]
+    body = html_content[body_open.end():body_close]
+    tail = html_content[body_close:]
+    return head + body * scale + tail
+
+def time_parse(html_path: Path, use_cache: bool = False, cache_dir: Path = None, backend: str = None) -> tuple:
+    """Parse a file once and return (seconds, patterns, examples)."""
+    options = {"use_cache": use_cache}
+    if cache_dir is not None:
+        options["cache_dir"] = cache_dir
+    if backend is not None:
+        options["backend"] = backend
+    parser = PrivacyPatternParser(html_path, **options)
+    start_time = time.perf_counter()
+    patterns = parser.parse()
+    duration = time.perf_counter() - start_time
+    return duration, len(patterns), sum(len(p.examples) for p in patterns)
+
+def benchmark_parser(scales, backends):
+    """Time each parser backend on 1x and scaled copies of the library document."""
+    print(f"\nBenchmarking HTML parser with: {HTML_PATH}")
+    print("=" * 70)
+
+    if not HTML_PATH.exists():
+        print(f"ERROR: HTML file not found at {HTML_PATH}")
+        return
+
+    with open(HTML_PATH, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    print(f"{'Scale':>6} {'Backend':>12} {'Size (MB)':>10} {'Patterns':>9} {'Examples':>9} {'Time (s)':>9} {'s/MB':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            if scale == 1:
+                html_path = HTML_PATH
+            else:
+                html_path = Path(tmp_dir) / f"library_x{scale}.html"
+                html_path.write_text(build_synthetic_copy(html_content, scale), encoding='utf-8')
+
+            size_mb = html_path.stat().st_size / 1024 / 1024
+            for backend in backends:
+                duration, pattern_count, example_count = time_parse(html_path, backend=backend)
+
+                print(f"{scale:>5}x {backend:>12} {size_mb:>10.1f} {pattern_count:>9} {example_count:>9} "
+                      f"{duration:>9.2f} {duration / size_mb:>7.3f}")
+
+            if html_path != HTML_PATH:
+                html_path.unlink()
+
+    print("\nA roughly constant s/MB column means parse time scales linearly.")
+
+# The regexes the text fallback used to run over whole section slices
+LEGACY_ROW_PATTERN = re.compile(r'(\d+)\s*\|\s*([^|]+?)\s+(https?://[^\s|]+)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|\n]+)')
+LEGACY_SIMPLE_PATTERN = re.compile(r'(\d+)\s*\|\s*([^|]+?)\s+(https?://[^\s|]+)\s*\|\s*([^|]+?)\s*\|\s*([^|\n]+)')
+LEGACY_URL_PATTERN = re.compile(r'(\d+)[\s.]+([^\n]+?)\s+(https?://[^\s]+)')
+
+def pathological_text(newlines: int) -> str:
+    """An unterminated table row followed by a long run of blank lines."""
+    return "1. Cookie Consent Banners\n1 | Acme https://acme.example |" + "\n" * newlines + "end\n"
+
+def time_legacy_fallback(text: str) -> float:
+    """Time the old regex scan of a single-section document."""
+    section_text = text.split('\n', 1)[1]
+    start_time = time.perf_counter()
+    matches = list(LEGACY_ROW_PATTERN.finditer(section_text)) or list(LEGACY_SIMPLE_PATTERN.finditer(section_text))
+    if not matches:
+        list(LEGACY_URL_PATTERN.finditer(section_text))
+    return time.perf_counter() - start_time
+
+def time_streaming_fallback(text: str) -> float:
+    parser = PrivacyPatternParser(Path("pathological.txt"), use_cache=False)
+    start_time = time.perf_counter()
+    parser._parse_patterns(text)
+    return time.perf_counter() - start_time
+
+def benchmark_pathological(sizes, legacy_budget: float):
+    """Compare the old regex fallback with the streaming one on adversarial text."""
+    print("\nBenchmarking text fallback on pathological input")
+    print("=" * 70)
+    print(f"{'Newlines':>9} {'Legacy (s)':>11} {'Streaming (s)':>14}")
+
+    legacy_enabled = True
+    for size in sizes:
+        text = pathological_text(size)
+        legacy = "skipped"
+        if legacy_enabled:
+            seconds = time_legacy_fallback(text)
+            legacy = f"{seconds:.3f}"
+            # Legacy time grows roughly with the cube of the size; stop before it hangs
+            legacy_enabled = seconds * 8 <= legacy_budget
+        print(f"{size:>9} {legacy:>11} {time_streaming_fallback(text):>14.4f}")
+
+def time_startup(cached: bool) -> float:
+    """Time a fresh interpreter importing the parser and loading the document."""
+    script = (
+        "import time; start = time.perf_counter()\n"
+        "from html_parser import PrivacyPatternParser\n"
+        "from config import HTML_PATH\n"
+        f"PrivacyPatternParser(HTML_PATH, use_cache={cached}).parse()\n"
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).parent,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def benchmark_cache(runs: int):
+    """Compare a cold parse (cache miss) with warm loads from the parse cache."""
+    print(f"\nBenchmarking parse cache with: {HTML_PATH}")
+    print("=" * 70)
+
+    if not HTML_PATH.exists():
+        print(f"ERROR: HTML file not found at {HTML_PATH}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cold = [time_parse(HTML_PATH, use_cache=True, cache_dir=Path(tmp_dir) / f"cold{i}")[0] for i in range(runs)]
+        warm = [time_parse(HTML_PATH, use_cache=True, cache_dir=Path(tmp_dir) / "cold0")[0] for _ in range(runs)]
+
+    # Whole-process startup, including imports; prime the real cache first
+    time_parse(HTML_PATH, use_cache=True)
+    cold_startup = [time_startup(cached=False) for _ in range(runs)]
+    warm_startup = [time_startup(cached=True) for _ in range(runs)]
+
+    print(f"{'':<24} {'Cold (ms)':>10} {'Warm (ms)':>10} {'Speedup':>8}")
+    for label, cold_times, warm_times in [
+        ("parse()", cold, warm),
+        ("process startup", cold_startup, warm_startup),
+    ]:
+        cold_ms = statistics.median(cold_times) * 1000
+        warm_ms = statistics.median(warm_times) * 1000
+        print(f"{label:<24} {cold_ms:>10.1f} {warm_ms:>10.1f} {cold_ms / warm_ms:>7.0f}x")
+
+    print(f"\nMedians of {runs} runs. Cold parses include writing the cache file.")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 10, 100],
+        help="Document size multipliers to benchmark (default: 1 10 100)"
+    )
+    arg_parser.add_argument(
+        "--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS),
+        help="Parser backends to compare (default: all)"
+    )
+    arg_parser.add_argument(
+        "--cache", action="store_true",
+        help="Benchmark cold versus warm startup with the parse cache instead"
+    )
+    arg_parser.add_argument(
+        "--runs", type=int, default=5,
+        help="Runs per measurement for --cache (default: 5)"
+    )
+    arg_parser.add_argument(
+        "--pathological", type=int, nargs="*", metavar="NEWLINES",
+        help="Benchmark the text fallback on adversarial input of these sizes (default: 250 500 1000 2000 100000)"
+    )
+    arg_parser.add_argument(
+        "--legacy-budget", type=float, default=60.0,
+        help="Skip the legacy regexes once a run would exceed this many seconds (default: 60)"
+    )
+    args = arg_parser.parse_args()
+    if args.pathological is not None:
+        benchmark_pathological(args.pathological or [250, 500, 1000, 2000, 100000], args.legacy_budget)
+    elif args.cache:
+        benchmark_cache(args.runs)
+    else:
+        benchmark_parser(args.scales, args.backends)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+"""Benchmark memory and serialization of capture results on a synthetic library:
+the old per-example dicts (asdict() plus a spread result dict) against the
+slotted CaptureResult records and the records JSON writer."""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime
+
+import records
+from html_parser import PrivacyExample
+from records import CaptureResult, PatternResults
+
+EXAMPLES_PER_PATTERN = 100
+
+def build_examples(count: int):
+    """Synthetic parsed rows with text of realistic length."""
+    return [
+        PrivacyExample(
+            example_number=index % EXAMPLES_PER_PATTERN + 1,
+            company=f"Company {index}",
+            url=f"https://www.example{index}.com/privacy",
+            title=f"Banner offering Accept All / Manage Cookies with a secondary panel {index}",
+            use_case="Large media sites targeting both EU & global visitors.",
+            why_selected="Demonstrates a balanced default and quick access to detailed settings.",
+            pbd_alignment="Proactive, Visibility, End-to-End Security",
+            nielsen_heuristics="Visibility of system status; User control & freedom"
+        )
+        for index in range(count)
+    ]
+
+def capture_fields(index: int) -> dict:
+    return {
+        "screenshot_file": f"example_{index}.png",
+        "timestamp": datetime(2025, 1, 1).isoformat(),
+        "success": index % 10 != 0,
+        "error": None if index % 10 else "Timeout",
+        "http_status": 200,
+        "goto_ms": 812.4,
+        "blocked_requests": 17,
+        "setup_ms": 3.1,
+        "banner_selector": '[id*="cookie"]',
+        "banner_detect_ms": 240.0,
+        "capture_mode": "element",
+        "preflight": "working",
+        "final_url": None
+    }
+
+def dict_results(examples):
+    """What the pipeline used to hold: one spread dict per example."""
+    return [{**asdict(example), **capture_fields(index)} for index, example in enumerate(examples)]
+
+def record_results(examples):
+    return [CaptureResult(example, **capture_fields(index)) for index, example in enumerate(examples)]
+
+def group(results, make_pattern):
+    return [
+        make_pattern(number, results[start:start + EXAMPLES_PER_PATTERN])
+        for number, start in enumerate(range(0, len(results), EXAMPLES_PER_PATTERN), 1)
+    ]
+
+def measure(build):
+    """Return (value, seconds, bytes still allocated) for building `value`."""
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    value = build()
+    duration = time.perf_counter() - start_time
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, duration, size
+
+def time_call(function, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+def benchmark_records(count: int, runs: int):
+    print(f"\nBenchmarking capture results for {count:,} synthetic examples")
+    print("=" * 70)
+
+    examples = build_examples(count)
+
+    dicts, dict_seconds, dict_bytes = measure(lambda: dict_results(examples))
+    results, record_seconds, record_bytes = measure(lambda: record_results(examples))
+
+    print(f"{'':<28} {'Build (s)':>10} {'Memory (MB)':>12} {'Bytes/result':>13}")
+    print(f"{'dicts (asdict + spread)':<28} {dict_seconds:>10.2f} {dict_bytes / 1e6:>12.1f} {dict_bytes / count:>13.0f}")
+    print(f"{'CaptureResult records':<28} {record_seconds:>10.2f} {record_bytes / 1e6:>12.1f} {record_bytes / count:>13.0f}")
+
+    dict_patterns = group(dicts, lambda number, rows: {
+        "pattern_number": number, "pattern_name": f"Pattern {number}",
+        "folder": f"{number:04d}_Pattern", "examples": rows
+    })
+    record_patterns = group(results, lambda number, rows: PatternResults(
+        number, f"Pattern {number}", f"{number:04d}_Pattern", tuple(rows)
+    ))
+
+    def old_writer():
+        for pattern in dict_patterns:
+            json.dumps(pattern, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def new_writer():
+        for pattern in record_patterns:
+            records.dumps(pattern, indent=True)
+
+    def stdlib_writer():
+        orjson, records.orjson = records.orjson, None
+        try:
+            new_writer()
+        finally:
+            records.orjson = orjson
+
+    print(f"\n{'metadata.json writer':<28} {'Time (s)':>10} {'Speedup':>8}")
+    baseline = time_call(old_writer, runs)
+    rows = [("json.dumps(dicts)", baseline), ("records.dumps, json", time_call(stdlib_writer, runs))]
+    if records.orjson is not None:
+        rows.append(("records.dumps, orjson", time_call(new_writer, runs)))
+    for label, seconds in rows:
+        print(f"{label:<28} {seconds:>10.2f} {baseline / seconds:>7.1f}x")
+
+    # Both writers must produce the same documents
+    assert json.loads(records.dumps(record_patterns[0], indent=True)) == dict_patterns[0]
+    print(f"\nBest of {runs} runs. Memory is what the results hold beyond the parsed examples.")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--examples", type=int, default=100_000,
+        help="Number of synthetic examples (default: 100000)"
+    )
+    arg_parser.add_argument(
+        "--runs", type=int, default=3,
+        help="Runs per serialization measurement (default: 3)"
+    )
+    args = arg_parser.parse_args()
+    benchmark_records(args.examples, args.runs)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""Benchmark assembling tall full-page screenshots from viewport strips: one
+full-height bitmap (what full_page=True builds) against the bounded-memory
+PngRowWriter stitching in tiled_capture.
+
+Each measurement runs in a fresh process so its peak RSS is its own."""
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from config import VIEWPORT
+from tiled_capture import Tile, stitch_tiles
+
+def write_strips(folder: Path, height: int, width: int = VIEWPORT["width"], viewport: int = VIEWPORT["height"]):
+    """Synthetic strips with text-like noise, so they compress like real pages."""
+    rng = np.random.default_rng(0)
+    tiles = []
+    for index, top in enumerate(range(0, height, viewport)):
+        rows = min(viewport, height - top)
+        strip = np.full((viewport, width, 3), 250, dtype=np.uint8)
+        ink = rng.random((viewport, width)) < 0.08
+        strip[ink] = rng.integers(0, 120, size=(int(ink.sum()), 3), dtype=np.uint8)
+        path = folder / f"tile_{index:03d}.png"
+        Image.fromarray(strip).save(path, compress_level=1)
+        tiles.append(Tile(path, 0, rows))
+    return tiles
+
+def stitch_in_memory(tiles, output_path: Path) -> int:
+    """The one-bitmap approach: paste every strip into a full-height image, then encode it."""
+    with Image.open(tiles[0].path) as first:
+        width = first.width
+    height = sum(tile.rows for tile in tiles)
+    canvas = Image.new("RGB", (width, height))
+    top = 0
+    for tile in tiles:
+        with Image.open(tile.path) as image:
+            canvas.paste(image.convert("RGB").crop((0, tile.offset, width, tile.offset + tile.rows)), (0, top))
+        top += tile.rows
+    canvas.save(output_path)
+    return height
+
+def _measure(method: str, tiles, output_path: Path, queue):
+    start = time.perf_counter()
+    stitch = stitch_tiles if method == "rows" else stitch_in_memory
+    stitch(tiles, output_path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+def measure(method: str, tile_dir: Path, tiles):
+    """(seconds, peak RSS in MB) of one stitch in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(method, tiles, tile_dir / f"{method}.png", queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def benchmark_tiles(heights):
+    print(f"{'Height (px)':>12} {'Strips':>7} {'Bitmap s':>9} {'Bitmap RSS MB':>14} {'Rows s':>8} {'Rows RSS MB':>12}")
+    for height in heights:
+        with tempfile.TemporaryDirectory() as tmp:
+            tile_dir = Path(tmp)
+            tiles = write_strips(tile_dir, height)
+            bitmap_s, bitmap_mb = measure("bitmap", tile_dir, tiles)
+            rows_s, rows_mb = measure("rows", tile_dir, tiles)
+        print(f"{height:>12,} {len(tiles):>7} {bitmap_s:>9.2f} {bitmap_mb:>14.1f} {rows_s:>8.2f} {rows_mb:>12.1f}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--heights", type=int, nargs="+", default=[5_000, 20_000, 60_000],
+        help="Page heights in px to stitch (default: 5000 20000 60000)"
+    )
+    args = arg_parser.parse_args()
+    benchmark_tiles(args.heights)
@@ -0,0 +1,150 @@
+"""Local fixture site for offline capture benchmarks and tests.
+
+Synthetic pages cover the situations captures meet on real sites: banners
+injected after a delay, consent managers in iframes, huge scrolling pages,
+autoplaying video, 404s, login walls and bot walls. Recorded pages (saved HTML files) can be
+served next to them.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from aiohttp import web
+
+class Fixture(NamedTuple):
+    """A fixture page and what a correct capture of it looks like."""
+    name: str
+    path: str
+    expect_success: bool  # Should the capture succeed (not an error page)?
+    expect_banner: bool  # Should a privacy banner be detected?
+    description: str
+
+FIXTURES = [
+    Fixture("instant_banner", "/fixtures/instant-banner", True, True, "Cookie banner in the initial HTML"),
+    Fixture("delayed_banner", "/fixtures/delayed-banner", True, True, "Cookie banner injected 2 s after load"),
+    Fixture("cmp_iframe", "/fixtures/cmp-iframe", True, True, "Consent manager iframe in a consent container"),
+    Fixture("cmp_iframe_bare", "/fixtures/cmp-iframe-bare", True, True, "Consent manager iframe in an unlabelled container"),
+    Fixture("huge_page", "/fixtures/huge-page", True, True, "Several MB of scrolling content with a fixed banner"),
+    Fixture("heavy_media", "/fixtures/heavy-media", True, True, "Autoplaying video behind a cookie banner"),
+    Fixture("no_banner", "/fixtures/no-banner", True, False, "Plain article page without a banner"),
+    Fixture("not_found", "/fixtures/missing-page", False, False, "HTTP 404 page"),
+    Fixture("login_wall", "/fixtures/members-only", False, False, "Redirect to a sign-in page"),
+    Fixture("bot_wall", "/fixtures/bot-wall", False, False, "HTTP 403 access denied page"),
+]
+
+MEDIA_BYTES = 4 * 1024 * 1024  # Streamed without a Content-Length, like most video CDNs
+MEDIA_CHUNK = 64 * 1024
+
+ARTICLE = "<p>" + "Privacy settings let you choose how your information is used. " * 8 + "</p>"
+
+def _page(title: str, body: str, head: str = "") -> str:
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{title}</title>"
+        "<style>body{font-family:sans-serif;margin:0 auto;max-width:960px}"
+        ".banner{position:fixed;bottom:0;left:0;right:0;padding:24px;background:#222;color:#fff}"
+        "iframe{border:0;width:100%;height:160px}</style>"
+        f"{head}</head><body><h1>{title}</h1>{body}</body></html>"
+    )
+
+BANNER = (
+    '<div id="cookie-banner" class="banner">We use cookies to improve your experience. '
+    '<button>Accept all</button> <button>Manage choices</button></div>'
+)
+
+CMP_FRAME = _page("Consent", '<div class="message">We and our partners use cookies. <button>Accept</button></div>')
+
+PAGES = {
+    "instant-banner": _page("Daily News", ARTICLE * 4 + BANNER),
+    "delayed-banner": _page("Daily News", ARTICLE * 4, head=(
+        "<script>setTimeout(() => document.body.insertAdjacentHTML('beforeend', "
+        + json.dumps(BANNER) + "), 2000);</script>"
+    )),
+    "cmp-iframe": _page("Daily News", ARTICLE * 4 + (
+        '<div id="consent-frame-container" class="banner"><iframe src="/fixtures/cmp-frame" '
+        'title="Consent Message"></iframe></div>'
+    )),
+    "cmp-iframe-bare": _page("Daily News", ARTICLE * 4 + (
+        '<div id="sp_message_container_1054" class="banner"><iframe src="/fixtures/cmp-frame" '
+        'title="SP Message"></iframe></div>'
+    )),
+    "cmp-frame": CMP_FRAME,
+    "huge-page": _page("Daily News", ARTICLE * 8000 + BANNER),
+    "heavy-media": _page("Daily News", ARTICLE * 2 + (
+        '<video src="/fixtures/media/clip.mp4" autoplay muted loop preload="auto" width="640"></video>'
+    ) + ARTICLE * 2 + BANNER),
+    "no-banner": _page("Daily News", ARTICLE * 4),
+    "members-area": _page("Sign in", "<p>Sign in required to view this page.</p><form><input name=email></form>"),
+}
+
+def build_fixture_app(recorded_dir: Optional[Path] = None) -> web.Application:
+    """The fixture site; recorded pages are served from /recorded/<file stem>."""
+
+    async def page(request):
+        name = request.match_info["name"]
+        if name not in PAGES:
+            raise web.HTTPNotFound(text=_page("Page not found", "<p>Sorry, that page doesn't exist.</p>"),
+                                   content_type="text/html")
+        return web.Response(text=PAGES[name], content_type="text/html")
+
+    async def members_only(request):
+        raise web.HTTPFound("/fixtures/members-area")
+
+    async def bot_wall(request):
+        raise web.HTTPForbidden(text=_page("Access denied", "<p>Access denied.</p>"), content_type="text/html")
+
+    async def media(request):
+        response = web.StreamResponse(headers={"Content-Type": "video/mp4"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        chunk = b"\0" * MEDIA_CHUNK
+        for _ in range(MEDIA_BYTES // MEDIA_CHUNK):
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+    async def recorded(request):
+        path = recorded_dir / f"{request.match_info['name']}.html"
+        if not path.is_file():
+            raise web.HTTPNotFound()
+        return web.FileResponse(path, headers={"Content-Type": "text/html"})
+
+    app = web.Application()
+    app.router.add_get("/fixtures/members-only", members_only)
+    app.router.add_get("/fixtures/bot-wall", bot_wall)
+    app.router.add_get("/fixtures/media/{name}", media)
+    app.router.add_get("/fixtures/{name}", page)
+    if recorded_dir is not None:
+        app.router.add_get("/recorded/{name}", recorded)
+    return app
+
+def recorded_fixtures(recorded_dir: Path) -> List[Fixture]:
+    """Fixtures for saved pages in `recorded_dir`.
+
+    Recorded pages are expected to capture with a banner unless an
+    expectations.json there says otherwise, e.g. {"ico": {"banner": false}}.
+    """
+    expectations_path = recorded_dir / "expectations.json"
+    expectations = json.loads(expectations_path.read_text(encoding='utf-8')) if expectations_path.exists() else {}
+    fixtures = []
+    for path in sorted(recorded_dir.glob("*.html")):
+        expected = expectations.get(path.stem, {})
+        fixtures.append(Fixture(
+            f"recorded_{path.stem}", f"/recorded/{path.stem}",
+            expected.get("success", True), expected.get("banner", True), f"Recorded page {path.name}"
+        ))
+    return fixtures
+
+@asynccontextmanager
+async def fixture_server(recorded_dir: Optional[Path] = None, host: str = "127.0.0.1"):
+    """Serve the fixture site on a free port and yield its base URL."""
+    runner = web.AppRunner(build_fixture_app(recorded_dir), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import MANIFEST_PATH, MANIFEST_MAX_AGE_DAYS
+from html_parser import PrivacyExample
+from records import CaptureResult, dumps
+
+logger = logging.getLogger(__name__)
+
+# Plan categories, in the order they are reported
+PLAN_CATEGORIES = ["new", "changed", "stale", "failed", "missing", "unchanged"]
+
+def row_hash(example: PrivacyExample) -> str:
+    """Hash the parsed example row (only the PrivacyExample fields)."""
+    row = example.to_dict()
+    return hashlib.sha256(json.dumps(row, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def file_hash(path: Path) -> Optional[str]:
+    """Hash a screenshot file, or None if it doesn't exist."""
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class CaptureManifest:
+    """Append-only JSONL event log of every capture, keyed by pattern, example and URL.
+
+    One line is flushed as each capture finishes, recording when the row was
+    captured, the HTTP status, a hash of the parsed example row and a hash of
+    the PNG, plus the full flattened result. The last line for a key wins. With
+    `reuse` on, unchanged rows are served from the log without opening the
+    browser.
+    """
+
+    def __init__(
+        self,
+        path: Path = MANIFEST_PATH,
+        max_age_days: float = MANIFEST_MAX_AGE_DAYS,
+        reuse: bool = True
+    ):
+        self.path = path
+        self.max_age = timedelta(days=max_age_days)
+        self.reuse = reuse
+        self.entries: Dict[str, Dict] = {}
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = MANIFEST_PATH,
+        max_age_days: float = MANIFEST_MAX_AGE_DAYS,
+        reuse: bool = True
+    ) -> "CaptureManifest":
+        manifest = cls(path, max_age_days, reuse)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping malformed manifest line {line_number} in {path}")
+                        continue
+                    manifest.entries[entry["key"]] = entry
+        return manifest
+
+    @staticmethod
+    def key_for(folder: str, example: PrivacyExample) -> str:
+        return f"{folder}|{example.example_number}|{example.url}"
+
+    def classify(self, folder: str, example: PrivacyExample, output_dir: Path) -> str:
+        """Decide whether an example row needs capturing; see PLAN_CATEGORIES."""
+        entry = self.entries.get(self.key_for(folder, example))
+        if entry is None:
+            return "new"
+        if entry["row_hash"] != row_hash(example):
+            return "changed"
+        if not entry["success"]:
+            return "failed"
+        if datetime.now() - datetime.fromisoformat(entry["captured_at"]) > self.max_age:
+            return "stale"
+        screenshot_file = entry["result"].get("screenshot_file")
+        if not screenshot_file or not (output_dir / folder / screenshot_file).exists():
+            return "missing"
+        return "unchanged"
+
+    def cached_result(self, folder: str, example: PrivacyExample, output_dir: Path) -> Optional[CaptureResult]:
+        """Return the stored result for an unchanged row, or None if it must be captured."""
+        if not self.reuse or self.classify(folder, example, output_dir) != "unchanged":
+            return None
+        return CaptureResult.from_dict(self.entries[self.key_for(folder, example)]["result"], example)
+
+    def plan(self, patterns: List[Dict], output_dir: Path) -> Counter:
+        """Count examples per plan category.
+
+        `patterns` are dicts with "folder" and "examples" (PrivacyExample) keys.
+        """
+        counts = Counter({category: 0 for category in PLAN_CATEGORIES})
+        for pattern in patterns:
+            for example in pattern["examples"]:
+                counts[self.classify(pattern["folder"], example, output_dir)] += 1
+        return counts
+
+    def record(self, folder: str, result: CaptureResult, output_dir: Path):
+        """Append one entry for a finished capture and flush it to disk immediately.
+
+        Each entry is written with a single O_APPEND write, so a killed run
+        keeps every capture that finished and shard workers can share the file.
+        """
+        screenshot_file = result.screenshot_file
+        entry = {
+            "key": self.key_for(folder, result.example),
+            "folder": folder,
+            "example_number": result.example.example_number,
+            "url": result.example.url,
+            "captured_at": result.timestamp or datetime.now().isoformat(),
+            "http_status": result.http_status,
+            "success": result.success,
+            "row_hash": row_hash(result.example),
+            "png_hash": file_hash(output_dir / folder / screenshot_file) if screenshot_file else None,
+            "result": result.to_dict()
+        }
+        self.entries[entry["key"]] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = dumps(entry) + b'\n'
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+from config import MAX_CONCURRENT_CAPTURES, MAX_CONCURRENT_PER_HOST, DELAY_BETWEEN_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+class CaptureScheduler:
+    """Bound how many pages are in flight overall and per hostname.
+
+    A global semaphore caps the number of concurrent captures, while each
+    hostname gets its own semaphore and a minimum interval between request
+    starts, so politeness delays only hold back captures for the same site.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_CAPTURES,
+        max_per_host: int = MAX_CONCURRENT_PER_HOST,
+        host_delay: float = DELAY_BETWEEN_REQUESTS
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self.host_delay = host_delay
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+        self._host_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._host_last_start: Dict[str, float] = {}
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Return the hostname used as the politeness key for a URL."""
+        return (urlparse(url).hostname or "").lower()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for a free capture slot for `url`, respecting per-host limits."""
+        host = self.host_for(url)
+        loop = asyncio.get_running_loop()
+
+        async with self._host_semaphores[host]:
+            async with self._host_locks[host]:
+                last_start = self._host_last_start.get(host)
+                if last_start is not None:
+                    wait = last_start + self.host_delay - loop.time()
+                    if wait > 0:
+                        logger.debug(f"Waiting {wait:.1f}s before next request to {host}")
+                        await asyncio.sleep(wait)
+
+                await self._semaphore.acquire()
+                self._host_last_start[host] = loop.time()
+
+            try:
+                yield
+            finally:
+                self._semaphore.release()
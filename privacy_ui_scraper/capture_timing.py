@@ -0,0 +1,106 @@
+"""Per-phase timing spans for captures, their percentiles and Chrome trace export."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple
+
+# Phases of one capture attempt, in the order they run; "reset" is the pool
+# cleaning the context after the capture, before anyone else can use it
+PHASES = ["context", "goto", "error_check", "banner_wait", "reload", "screenshot", "write", "reset"]
+
+class Span(NamedTuple):
+    """One timed phase of a capture attempt."""
+    phase: str
+    label: str  # The screenshot filename
+    url: str
+    attempt: int
+    start_us: int  # Wall clock, so spans from shard worker processes line up
+    duration_ms: float
+    pid: int
+
+class PhaseTimer:
+    """Collects the spans of one capture attempt."""
+
+    def __init__(self, label: str, url: str, attempt: int = 1):
+        self.label = label
+        self.url = url
+        self.attempt = attempt
+        self.spans: List[Span] = []
+
+    def add(self, phase: str, perf_start: float):
+        """Record a phase that started at `perf_start` (a time.perf_counter() value) and ends now."""
+        duration = time.perf_counter() - perf_start
+        start_us = time.time_ns() // 1000 - int(duration * 1_000_000)
+        self.spans.append(Span(
+            phase, self.label, self.url, self.attempt, start_us, round(duration * 1000, 1), os.getpid()
+        ))
+
+    @contextmanager
+    def span(self, phase: str):
+        perf_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_start)
+
+    def phases_ms(self) -> Dict[str, float]:
+        """Total milliseconds per phase; phases that run twice (banner_wait) are summed."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.phase] = round(totals.get(span.phase, 0) + span.duration_ms, 1)
+        return totals
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Linearly interpolated percentile of a non-empty list, e.g. fraction=0.95 for p95."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize_phases(samples: Dict[str, List[float]]) -> Dict[str, Dict]:
+    """p50/p95 per phase from per-example phase timings, in PHASES order."""
+    return {
+        phase: {
+            "count": len(samples[phase]),
+            "p50_ms": round(percentile(samples[phase], 0.5), 1),
+            "p95_ms": round(percentile(samples[phase], 0.95), 1)
+        }
+        for phase in PHASES + sorted(set(samples) - set(PHASES))
+        if samples.get(phase)
+    }
+
+def chrome_trace(spans: Iterable[Span]) -> Dict:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto): one track per screenshot."""
+    events = []
+    tracks: Dict[tuple, int] = {}
+    for span in sorted(spans, key=lambda span: span.start_us):
+        track = (span.pid, span.label)
+        if track not in tracks:
+            tracks[track] = len(tracks) + 1
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": span.pid, "tid": tracks[track],
+                "args": {"name": span.label}
+            })
+        events.append({
+            "name": span.phase,
+            "cat": "capture",
+            "ph": "X",
+            "ts": span.start_us,
+            "dur": int(span.duration_ms * 1000),
+            "pid": span.pid,
+            "tid": tracks[track],
+            "args": {"url": span.url, "attempt": span.attempt}
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def write_chrome_trace(spans: Iterable[Span], path: Path) -> int:
+    """Write spans as a Chrome trace file and return how many were written."""
+    trace = chrome_trace(spans)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace, f)
+    return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
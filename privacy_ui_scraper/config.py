@@ -1,25 +1,99 @@
 from pathlib import Path
 import logging
+import os
 
 # Project paths
 BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "privacy_ui_screenshots"
 HTML_PATH = BASE_DIR.parent / "UI_Libary_2025.html"
+PARSE_CACHE_DIR = BASE_DIR / ".cache"  # Cached parses of the HTML document
+PARSER_BACKEND = "lxml"  # "lxml" (fast) or "html.parser" (BeautifulSoup)
 
 # Browser settings
 VIEWPORT = {"width": 1920, "height": 1080}
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+ACCEPT_LANGUAGE = "en-GB,en;q=0.9"  # Sent by the browser and by pre-flight checks
 HEADLESS = True
 TIMEOUT = 30000  # 30 seconds
 SCREENSHOT_TIMEOUT = 60000  # 60 seconds for full page screenshots
+BANNER_TIMEOUT = 8000  # overall deadline for a privacy banner to become visible
+BANNER_RELOAD_TIMEOUT = 2000  # ms to wait again after reloading a page that showed no banner (0: don't reload)
+ERROR_CHECK_TEXT_CHARS = 1000  # visible text from the top of the page checked for error/login markers
+CAPTURE_MODE = "element"  # "element" (banner only, viewport fallback), "viewport" or "full_page"
+FULL_PAGE_PATTERNS = []  # Pattern numbers that opt in to full-page screenshots
+FULL_PAGE_TILED = True  # Capture full pages in viewport-height strips streamed to disk, not one giant bitmap
+FULL_PAGE_STITCH = True  # Stitch the strips into one PNG; False keeps them in <screenshot>_tiles/
+TILE_DIR_SUFFIX = "_tiles"  # Strip folders; image analysis skips them, they aren't screenshots
+FULL_PAGE_MAX_HEIGHT = 20000  # px; taller (or endlessly growing) pages are cut off here
+MIN_BANNER_SIZE = {"width": 200, "height": 40}  # Smaller matches fall back to the viewport
 
 # Scraping settings
-DELAY_BETWEEN_REQUESTS = 2  # seconds
-MAX_RETRIES = 3
-RESUME_MODE = True  # Skip existing screenshots
+DELAY_BETWEEN_REQUESTS = 2  # seconds between requests to the same host
+MAX_CONCURRENT_CAPTURES = 4  # pages in flight across all hosts
+MAX_CONCURRENT_PER_HOST = 1  # pages in flight per hostname
+CONTEXT_POOL_SIZE = MAX_CONCURRENT_CAPTURES  # pre-warmed browser contexts reused between captures
+MAX_RETRIES = 3  # attempts per example; only transient failures are retried
+RETRY_BACKOFF_BASE = 2  # seconds before the first retry, doubling per attempt (jittered)
+RETRY_BACKOFF_MAX = 30  # cap on a single retry delay
+CIRCUIT_BREAKER_THRESHOLD = 3  # consecutive timeouts/DNS/TLS/5xx failures before a host is skipped
+CIRCUIT_BREAKER_COOLDOWN = 120  # seconds a host is skipped before one probe capture is let through
+RESUME_MODE = True  # Skip unchanged examples (tracked in the capture manifest)
+MANIFEST_PATH = OUTPUT_DIR / "capture_manifest.jsonl"
+MANIFEST_MAX_AGE_DAYS = 30  # Recapture examples older than this
+EXPORT_TRACE = False  # Write every capture phase span as a Chrome trace (also --trace)
+TRACE_PATH = OUTPUT_DIR / "capture_trace.json"  # Open in chrome://tracing or Perfetto
+ARTIFACT_FLUSH_DELAY = 0.5  # seconds metadata/README/summary writes are held so bursts are written as one batch
 CAPTURE_PRIVACY_BANNERS = True  # Don't dismiss banners, capture them
 EU_MODE = True  # Use EU locale/geolocation to trigger GDPR banners
 
+# Record/replay HTTP cache: "record" stores every response a capture fetches,
+# "replay" serves captures only from the cache (no network, no pre-flight)
+HTTP_CACHE_MODE = os.environ.get("PRIVACY_UI_HTTP_CACHE", "off")  # "off", "record" or "replay"
+HTTP_CACHE_DIR = PARSE_CACHE_DIR / "http"
+
+# URL pre-flight validation
+VALIDATE_BEFORE_CAPTURE = True  # Only send working/redirected URLs to the browser
+VALIDATOR_MAX_CONCURRENT = 16  # URLs checked at once
+VALIDATOR_MAX_PER_HOST = 2  # URLs checked at once per hostname
+VALIDATOR_TIMEOUT = 10  # seconds per request
+VALIDATOR_HEAD_TIMEOUT = 3  # seconds for the HEAD probe; a HEAD that hangs falls back to GET
+VALIDATOR_MAX_BODY_KB = 64  # Stop reading a page body after this much
+
+# Screenshot analysis (image_analysis.py)
+IMAGE_REPORT_PATH = OUTPUT_DIR / "image_report.json"
+IMAGE_ANALYSIS_WORKERS = None  # Worker processes; None uses every CPU
+DUPLICATE_HASH_DISTANCE = 6  # Max differing bits (of 64) for near-duplicates
+BLANK_ENTROPY_THRESHOLD = 1.0  # Grey-level entropy (bits) below which a page is blank
+ERROR_ENTROPY_THRESHOLD = 2.0  # ...and below which it looks like a bare error page
+
+# Post-capture image derivatives (image_derivatives.py)
+BUILD_DERIVATIVES = True  # Optimize PNGs and write derivatives after each run
+DERIVATIVE_FORMATS = ["webp"]  # Full-size derivative formats; add "avif" if Pillow supports it
+DERIVATIVE_QUALITY = 80  # Lossy quality for WebP/AVIF derivatives and thumbnails
+THUMBNAIL_WIDTH = 480  # Thumbnail width in pixels (height keeps the aspect ratio)
+
+# Request blocking during capture
+BLOCK_HEAVY_RESOURCES = True  # Abort requests matching the lists below
+BLOCKED_RESOURCE_TYPES = ["media"]  # Playwright resource types (video/audio)
+BLOCKED_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "adservice.google.com", "google-analytics.com", "amazon-adsystem.com",
+    "adnxs.com", "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+    "scorecardresearch.com", "chartbeat.com", "chartbeat.net", "hotjar.com",
+    "newrelic.com", "nr-data.net", "quantserve.com", "moatads.com",
+    "rubiconproject.com", "pubmatic.com", "casalemedia.com", "adsrvr.org",
+    "segment.io", "mixpanel.com", "jwplayer.com", "brightcove.net"
+]
+# Consent-management platforms are never blocked: their banners are the target
+CMP_ALLOWED_DOMAINS = [
+    "cookielaw.org", "onetrust.com", "cookiepro.com", "sourcepoint.com",
+    "sp-prod.net", "privacy-mgmt.com", "quantcast.com", "consensu.org",
+    "trustarc.com", "truste.com", "didomi.io", "cookiebot.com",
+    "usercentrics.eu", "iubenda.com", "consentmanager.net", "osano.com",
+    "termly.io", "fundingchoicesmessages.google.com", "cmp.inmobi.com",
+    "privacymanager.io", "evidon.com", "crownpeak.com"
+]
+
 # Privacy pattern categories (expected 29 patterns)
 PATTERN_CATEGORIES = [
     "Cookie Consent Banners",
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+from playwright.async_api import Browser, BrowserContext
+
+from config import VIEWPORT, USER_AGENT, ACCEPT_LANGUAGE, CONTEXT_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+# EU settings to trigger GDPR banners
+CONTEXT_OPTIONS = {
+    "viewport": VIEWPORT,
+    "user_agent": USER_AGENT,
+    "locale": 'en-GB',  # UK locale for GDPR
+    "timezone_id": 'Europe/London',
+    "geolocation": {'latitude': 51.5074, 'longitude': -0.1278},  # London coordinates
+    "permissions": ['geolocation'],
+    "extra_http_headers": {
+        'Accept-Language': ACCEPT_LANGUAGE
+    }
+}
+
+class ContextPool:
+    """A bounded pool of pre-warmed browser contexts.
+
+    Contexts are reset between uses (pages closed, cookies cleared, storage
+    of every visited origin wiped, permissions re-granted) so each capture
+    still sees the site as a fresh visitor without paying for a new context.
+    A context that fails to reset is closed and replaced; if the replacement
+    can't be created either, the slot stays in the pool empty and the next
+    borrower creates its context.
+    """
+
+    def __init__(self, browser: Browser, size: int = CONTEXT_POOL_SIZE):
+        self.browser = browser
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._contexts: List[BrowserContext] = []
+        self._origins: Dict[BrowserContext, Set[str]] = {}
+
+    async def start(self):
+        """Create all contexts up front."""
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._new_context())
+        logger.info(f"Context pool started with {self.size} contexts")
+
+    async def close(self):
+        """Close every context owned by the pool."""
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context: {e}")
+        self._contexts.clear()
+        self._origins.clear()
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a clean context, resetting it when it is returned."""
+        context = await self._idle.get()
+        if context is None:
+            try:
+                context = await self._new_context()
+            except BaseException:
+                self._idle.put_nowait(None)
+                raise
+        try:
+            yield context
+        finally:
+            # Always give the slot back, so the pool never shrinks
+            replacement = None
+            try:
+                replacement = await self._reset_or_replace(context)
+            finally:
+                self._idle.put_nowait(replacement)
+
+    async def _new_context(self) -> BrowserContext:
+        context = await self.browser.new_context(**CONTEXT_OPTIONS)
+        origins: Set[str] = set()
+        context.on("request", lambda request: self._record_origin(origins, request))
+        self._contexts.append(context)
+        self._origins[context] = origins
+        return context
+
+    @staticmethod
+    def _record_origin(origins: Set[str], request):
+        """Remember every frame origin navigated to, so its storage can be wiped."""
+        if request.is_navigation_request():
+            parsed = urlparse(request.url)
+            if parsed.scheme in ("http", "https"):
+                origins.add(f"{parsed.scheme}://{parsed.netloc}")
+
+    async def _reset_or_replace(self, context: BrowserContext) -> Optional[BrowserContext]:
+        """The context, reset; a new one if that fails; None if that fails too."""
+        try:
+            await self._reset(context)
+            return context
+        except Exception as e:
+            logger.warning(f"Context reset failed, replacing context: {e}")
+            self._contexts.remove(context)
+            self._origins.pop(context, None)
+            try:
+                await context.close()
+            except Exception:
+                pass
+        try:
+            return await self._new_context()
+        except Exception as e:
+            logger.warning(f"Could not replace context, the next borrower will retry: {e}")
+            return None
+
+    async def _reset(self, context: BrowserContext):
+        """Return a used context to the fresh-visitor state."""
+        for page in list(context.pages):
+            await page.close()
+
+        await context.clear_cookies()
+        await context.clear_permissions()
+        await context.grant_permissions(CONTEXT_OPTIONS["permissions"])
+
+        origins = self._origins[context]
+        if origins:
+            page = await context.new_page()
+            try:
+                cdp = await context.new_cdp_session(page)
+                for origin in origins:
+                    await cdp.send("Storage.clearDataForOrigin", {
+                        "origin": origin,
+                        "storageTypes": "all"
+                    })
+                await cdp.detach()
+            finally:
+                await page.close()
+            origins.clear()
@@ -1,14 +1,112 @@
 import re
+import io
+import os
 import json
+import hashlib
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, NamedTuple, Iterable, Iterator
 from bs4 import BeautifulSoup
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+from config import PARSE_CACHE_DIR, PARSER_BACKEND
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # BeautifulSoup's html.parser is always available
+    lxml_html = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Bump whenever a parser change alters its output, so cached parses are not reused
+PARSER_VERSION = 3
+
+# Pattern headers in the Word export look like "1. Cookie Consent Banners"
+HEADER_PATTERN = re.compile(r'\d+\.\s+[A-Z][^\n]{10,}')
+
+# Text fallback: every pattern is matched against a single line from its start
+SECTION_HEADER = re.compile(r'\s*(\d+)\.\s+(\S.*?)\s*$')
+ROW_START = re.compile(r'\s*(\d+)\s*\|')
+URL_PREFIX = re.compile(r'https?://')
+LOOSE_URL = re.compile(r'\shttps?://\S+')
+LOOSE_EXAMPLE = re.compile(r'(\d+)[\s.]+([^\n]+?)\s+(https?://\S+)')
+
+def _iter_lines(strings: Iterable[str]) -> Iterator[str]:
+    """Join text fragments and yield complete lines, without building the whole text."""
+    pending = []
+    for fragment in strings:
+        if '\n' not in fragment:
+            pending.append(fragment)
+            continue
+        lines = fragment.split('\n')
+        pending.append(lines[0])
+        yield ''.join(pending)
+        yield from lines[1:-1]
+        pending = [lines[-1]]
+    yield ''.join(pending)
+
+def _split_url_cell(cell: str) -> Optional[Tuple[str, str]]:
+    """Split "Company https://url" into (company, url); the URL must be the cell's last word."""
+    words = cell.rsplit(None, 1)
+    if len(words) != 2 or not URL_PREFIX.match(words[1]):
+        return None
+    return words[0], words[1]
+
+class _TextSection:
+    """Rows and description lines collected for one pattern section of the text fallback."""
+    
+    def __init__(self, number: int, name: str):
+        self.number = number
+        self.name = name
+        self.description: List[str] = []
+        self.detailed_rows: List[Tuple[str, ...]] = []
+        self.simple_rows: List[Tuple[str, ...]] = []
+        self.loose_rows: List[Tuple[str, ...]] = []
+        self._in_description = True
+    
+    def add_line(self, line: str) -> None:
+        stripped = line.strip()
+        if self._in_description:
+            # Descriptive text runs until the first blank, table or heading line
+            if not stripped or '|' in stripped or stripped.startswith('#'):
+                self._in_description = False
+            elif len(stripped) > 20:
+                self.description.append(stripped)
+        
+        row = ROW_START.match(line)
+        if row:
+            cells = line[row.end():].split('|')
+            url_cell = _split_url_cell(cells[0])
+            if url_cell and len(cells) >= 3 and all(cells[1:3]):
+                number = row.group(1)
+                if len(cells) >= 6 and all(cells[1:6]):
+                    self.detailed_rows.append((number, *url_cell, *cells[1:6]))
+                self.simple_rows.append((number, *url_cell, cells[1], cells[2]))
+        
+        if not self.detailed_rows and not self.simple_rows:
+            # Only search up to the last URL, so failed matches can't rescan the line
+            last_url = None
+            for last_url in LOOSE_URL.finditer(line):
+                pass
+            if last_url:
+                for match in LOOSE_EXAMPLE.finditer(line, 0, last_url.end()):
+                    self.loose_rows.append(match.groups())
+    
+    def rows(self) -> List[Tuple[str, ...]]:
+        """Detailed rows if there are any, else simple rows, else loosely matched URLs."""
+        return self.detailed_rows or self.simple_rows or self.loose_rows
+
+# Parser backends: "lxml" walks an lxml.html tree directly, "html.parser"
+# uses BeautifulSoup. Both produce identical patterns.
+BACKENDS = ("lxml", "html.parser")
+
+class Cell(NamedTuple):
+    """A table cell: its text and the href of its first link (None if it has no link)."""
+    text: str
+    link: Optional[str]
+
+@dataclass(frozen=True, slots=True)
 class PrivacyExample:
     example_number: int
     company: str
@@ -19,8 +117,15 @@ class PrivacyExample:
     why_selected: str = ""
     pbd_alignment: str = ""
     nielsen_heuristics: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Much cheaper than asdict(), which deep-copies every value
+        return dict(zip(EXAMPLE_FIELDS, _example_values(self)))
 
-@dataclass
+EXAMPLE_FIELDS = tuple(f.name for f in fields(PrivacyExample))
+_example_values = attrgetter(*EXAMPLE_FIELDS)
+
+@dataclass(frozen=True, slots=True)
 class PrivacyPattern:
     pattern_number: int
     pattern_name: str
@@ -28,26 +133,55 @@ class PrivacyPattern:
     examples: List[PrivacyExample]
 
 class PrivacyPatternParser:
-    def __init__(self, html_path: Path):
+    def __init__(
+        self,
+        html_path: Path,
+        use_cache: bool = True,
+        cache_dir: Path = PARSE_CACHE_DIR,
+        backend: str = PARSER_BACKEND
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown parser backend {backend!r}; expected one of {BACKENDS}")
         self.html_path = html_path
+        self.backend = backend
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
         self.patterns: List[PrivacyPattern] = []
         
     def parse(self) -> List[PrivacyPattern]:
-        """Parse the HTML and extract all privacy patterns with their examples."""
+        """Parse the HTML and extract all privacy patterns with their examples.
+        
+        Results are cached on disk keyed by the file's content hash and
+        PARSER_VERSION, so an unchanged document is loaded instead of parsed.
+        """
         try:
-            with open(self.html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            with open(self.html_path, 'rb') as f:
+                raw = f.read()
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            cache_path = self._cache_path(hashlib.sha256(raw).hexdigest())
+            if self.use_cache and self._load_cache(cache_path):
+                return self.patterns
             
-            # Try to parse as structured HTML first
-            if self._parse_structured_html(soup):
-                logger.info(f"Successfully parsed {len(self.patterns)} privacy patterns from structured HTML")
+            # Same newline handling as reading the file in text mode
+            html_content = io.StringIO(raw.decode('utf-8'), newline=None).read()
+            
+            if self.backend == "lxml" and lxml_html is None:
+                logger.warning("lxml is not installed; falling back to html.parser")
+            
+            # Try to parse as structured HTML first, with lxml if selected
+            if self.backend == "lxml" and lxml_html is not None and self._parse_structured_lxml(html_content):
+                logger.info(f"Successfully parsed {len(self.patterns)} privacy patterns from structured HTML (lxml)")
             else:
-                # Fall back to text-based parsing
-                text = soup.get_text()
-                self._parse_patterns(text)
-                logger.info(f"Successfully parsed {len(self.patterns)} privacy patterns from text")
+                soup = BeautifulSoup(html_content, 'html.parser')
+                if self._parse_structured_html(soup):
+                    logger.info(f"Successfully parsed {len(self.patterns)} privacy patterns from structured HTML")
+                else:
+                    # Fall back to text-based parsing, streaming the text line by line
+                    self._parse_text_lines(_iter_lines(soup.strings))
+                    logger.info(f"Successfully parsed {len(self.patterns)} privacy patterns from text")
+            
+            if self.use_cache and self.patterns:
+                self._write_cache(cache_path)
                 
             return self.patterns
             
@@ -55,23 +189,83 @@ class PrivacyPatternParser:
             logger.error(f"Error parsing HTML: {e}")
             raise
     
+    def _cache_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{self.html_path.stem}-{content_hash[:16]}-v{PARSER_VERSION}.json"
+    
+    def _load_cache(self, cache_path: Path) -> bool:
+        """Fill self.patterns from a cached parse; False if there is no usable cache."""
+        if not cache_path.exists():
+            return False
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.patterns = [
+                PrivacyPattern(
+                    pattern_number=p["pattern_number"],
+                    pattern_name=p["pattern_name"],
+                    description=p["description"],
+                    examples=[PrivacyExample(**e) for e in p["examples"]]
+                )
+                for p in data["patterns"]
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable parse cache {cache_path}: {e}")
+            self.patterns = []
+            return False
+        logger.info(f"Loaded {len(self.patterns)} privacy patterns from parse cache {cache_path.name}")
+        return True
+    
+    def _write_cache(self, cache_path: Path) -> None:
+        """Store the parse atomically and drop older cache files for this document."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        
+        for old_path in self.cache_dir.glob(f"{self.html_path.stem}-*.json"):
+            if old_path != cache_path:
+                old_path.unlink()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "patterns": [
+                {
+                    "pattern_number": p.pattern_number,
+                    "pattern_name": p.pattern_name,
+                    "description": p.description,
+                    "examples": [e.to_dict() for e in p.examples]
+                }
+                for p in self.patterns
+            ]
+        }
+    
     def _parse_structured_html(self, soup: BeautifulSoup) -> bool:
         """Try to parse HTML with structured elements like tables."""
         # Look for pattern headers in Microsoft Word HTML format
-        pattern_headers = []
-        
-        # Find all paragraphs that might be pattern headers
-        for p in soup.find_all('p'):
-            text = p.get_text().strip()
-            # Look for pattern headers like "1. Cookie Consent Banners"
-            if re.match(r'\d+\.\s+[A-Z][^\n]{10,}', text) and 'Pattern' not in text:
-                pattern_headers.append((p, text))
+        return self._build_patterns(self._index_sections(soup), self._table_rows)
+    
+    def _parse_structured_lxml(self, html_content: str) -> bool:
+        """Structured parse with lxml.html, walking the tree the same way as _parse_structured_html."""
+        root = lxml_html.document_fromstring(html_content)
+        sections: List[Tuple[str, list]] = []
         
-        if not pattern_headers:
-            return False
+        for elem in root.iter('p', 'table'):
+            if elem.tag == 'table':
+                if sections:
+                    sections[-1][1].append(elem)
+                continue
+            
+            text = elem.text_content().strip()
+            if HEADER_PATTERN.match(text) and 'Pattern' not in text:
+                sections.append((text, []))
         
+        return self._build_patterns(sections, self._table_rows_lxml)
+    
+    def _build_patterns(self, sections: List[Tuple[str, list]], table_rows: Callable[[Any], List[List[Cell]]]) -> bool:
+        """Turn (header text, tables) sections into patterns; `table_rows` reads a table's cells."""
         # Process each pattern
-        for i, (header_elem, header_text) in enumerate(pattern_headers):
+        for header_text, tables_found in sections:
             # Extract pattern number and name
             match = re.match(r'(\d+)\.\s+(.+)', header_text)
             if not match:
@@ -80,38 +274,10 @@ class PrivacyPatternParser:
             pattern_number = int(match.group(1))
             pattern_name = match.group(2).strip()
             
-            # Find the next elements after this header until next pattern or end
-            current_elem = header_elem.next_sibling
-            tables_found = []
-            
-            # Look for tables following this header
-            next_pattern_pos = None
-            if i + 1 < len(pattern_headers):
-                next_pattern_elem = pattern_headers[i + 1][0]
-                # Find position of next pattern in document
-                all_elements = list(soup.find_all(['p', 'table']))
-                try:
-                    next_pattern_pos = all_elements.index(next_pattern_elem)
-                except ValueError:
-                    next_pattern_pos = None
-            
-            # Find all tables between current pattern and next pattern
-            all_elements = list(soup.find_all(['p', 'table']))
-            try:
-                current_pos = all_elements.index(header_elem)
-                end_pos = next_pattern_pos if next_pattern_pos else len(all_elements)
-                
-                for j in range(current_pos + 1, end_pos):
-                    if j < len(all_elements) and all_elements[j].name == 'table':
-                        tables_found.append(all_elements[j])
-                        
-            except ValueError:
-                continue
-            
             # Parse examples from all tables found for this pattern
             all_examples = []
             for table in tables_found:
-                examples = self._parse_table_examples(table)
+                examples = self._parse_table_examples(table_rows(table))
                 all_examples.extend(examples)
             
             if all_examples:
@@ -126,42 +292,85 @@ class PrivacyPatternParser:
         
         return len(self.patterns) > 0
     
-    def _parse_table_examples(self, table) -> List[PrivacyExample]:
-        """Parse examples from an HTML table."""
-        examples = []
+    def _index_sections(self, soup: BeautifulSoup) -> List[Tuple[str, list]]:
+        """Walk the document once and group tables under their pattern header.
+        
+        Every ``p``/``table`` is visited in document order; a paragraph that
+        looks like a pattern header (e.g. "1. Cookie Consent Banners") opens a
+        new section and each table is handed to the section it falls in.
+        Tables before the first header are ignored.
+        """
+        sections: List[Tuple[str, list]] = []
+        
+        for elem in soup.find_all(['p', 'table']):
+            if elem.name == 'table':
+                if sections:
+                    sections[-1][1].append(elem)
+                continue
+            
+            text = elem.get_text().strip()
+            # Look for pattern headers like "1. Cookie Consent Banners"
+            if HEADER_PATTERN.match(text) and 'Pattern' not in text:
+                sections.append((text, []))
         
-        rows = table.find_all('tr')
+        return sections
+    
+    @staticmethod
+    def _table_rows(table) -> List[List[Cell]]:
+        """Read a BeautifulSoup table into rows of cells."""
+        rows = []
+        for row in table.find_all('tr'):
+            cells = []
+            for cell in row.find_all(['td', 'th']):
+                link = cell.find('a')
+                cells.append(Cell(cell.get_text(), (link.get('href') or "") if link else None))
+            rows.append(cells)
+        return rows
+    
+    @staticmethod
+    def _table_rows_lxml(table) -> List[List[Cell]]:
+        """Read an lxml table into rows of cells."""
+        rows = []
+        for row in table.iterdescendants('tr'):
+            cells = []
+            for cell in row.iterdescendants('td', 'th'):
+                link = next(cell.iterdescendants('a'), None)
+                cells.append(Cell(cell.text_content(), (link.get('href') or "") if link is not None else None))
+            rows.append(cells)
+        return rows
+    
+    def _parse_table_examples(self, rows: List[List[Cell]]) -> List[PrivacyExample]:
+        """Parse examples from the rows of an HTML table."""
+        examples = []
         
         # Skip header rows - look for rows with actual data
         data_rows = []
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
+        for cells in rows:
             if cells:
                 # Check if this looks like a data row (has number and URL)
-                first_cell_text = cells[0].get_text().strip()
+                first_cell_text = cells[0].text.strip()
                 if len(cells) >= 2 and first_cell_text.isdigit():
-                    data_rows.append(row)
+                    data_rows.append(cells)
         
-        for row in data_rows:
-            cells = row.find_all(['td', 'th'])
+        for cells in data_rows:
             if len(cells) >= 2:
                 try:
                     # Extract example number
-                    example_num_text = cells[0].get_text().strip()
+                    example_num_text = cells[0].text.strip()
                     if not example_num_text.isdigit():
                         continue
                     
                     example_number = int(example_num_text)
                     
                     # Extract URL and company from second cell
-                    url_cell_text = cells[1].get_text().strip()
+                    url_cell_text = cells[1].text.strip()
                     
                     # Look for URLs in the cell text
                     url_match = re.search(r'https?://[^\s\n]+', url_cell_text)
                     
                     # Also check for actual links
-                    link = cells[1].find('a')
-                    url = link.get('href') if link else (url_match.group(0) if url_match else "")
+                    link = cells[1].link
+                    url = link if link is not None else (url_match.group(0) if url_match else "")
                     
                     if url:
                         # Extract company name (text before URL)
@@ -169,10 +378,10 @@ class PrivacyPatternParser:
                         company = self._extract_company_name(company_text) if company_text else self._extract_company_from_url(url)
                         
                         # Extract description from third cell if available
-                        title = cells[2].get_text().strip() if len(cells) > 2 else ""
+                        title = cells[2].text.strip() if len(cells) > 2 else ""
                         
                         # Extract use case from fourth cell if available
-                        use_case = cells[3].get_text().strip() if len(cells) > 3 else ""
+                        use_case = cells[3].text.strip() if len(cells) > 3 else ""
                         
                         example = PrivacyExample(
                             example_number=example_number,
@@ -180,9 +389,9 @@ class PrivacyPatternParser:
                             url=url,
                             title=title[:200] if title else "",  # Limit title length
                             use_case=use_case[:200] if use_case else "",  # Limit use case length
-                            why_selected=cells[4].get_text().strip()[:200] if len(cells) > 4 else "",
-                            pbd_alignment=cells[5].get_text().strip()[:200] if len(cells) > 5 else "",
-                            nielsen_heuristics=cells[6].get_text().strip()[:200] if len(cells) > 6 else ""
+                            why_selected=cells[4].text.strip()[:200] if len(cells) > 4 else "",
+                            pbd_alignment=cells[5].text.strip()[:200] if len(cells) > 5 else "",
+                            nielsen_heuristics=cells[6].text.strip()[:200] if len(cells) > 6 else ""
                         )
                         examples.append(example)
                         logger.debug(f"Parsed example {example_number}: {company} - {url}")
@@ -194,98 +403,76 @@ class PrivacyPatternParser:
         return examples
     
     def _parse_patterns(self, text: str) -> None:
-        """Parse individual privacy patterns from the text."""
-        # Pattern to match section headers like "1. Cookie Consent Banners"
-        section_pattern = r'(\d+)\.\s+([^\n]+?)\s*\n'
-        
-        # Find all section headers
-        sections = list(re.finditer(section_pattern, text))
+        """Parse individual privacy patterns from plain text."""
+        self._parse_text_lines(iter(text.split('\n')))
+    
+    def _parse_text_lines(self, lines: Iterable[str]) -> None:
+        """Parse patterns from a stream of text lines in a single pass.
         
-        for i, match in enumerate(sections):
-            pattern_number = int(match.group(1))
-            pattern_name = match.group(2).strip()
-            
-            # Get text for this section (until next section or end)
-            start_pos = match.end()
-            end_pos = sections[i + 1].start() if i + 1 < len(sections) else len(text)
-            section_text = text[start_pos:end_pos]
-            
-            # Parse examples from the section
-            examples = self._parse_examples(section_text)
-            
-            if examples:
-                pattern = PrivacyPattern(
-                    pattern_number=pattern_number,
-                    pattern_name=pattern_name,
-                    description=self._extract_description(section_text),
-                    examples=examples
-                )
-                self.patterns.append(pattern)
-                logger.info(f"Parsed pattern {pattern_number}: {pattern_name} with {len(examples)} examples")
+        A line like "1. Cookie Consent Banners" opens a section; rows inside a
+        section are "number | company url | title | use case ..." lines.
+        Sections are never sliced out of the text, and every pattern is
+        anchored at the start of a line, so runtime stays linear in the
+        input even for long runs of whitespace or rows that never match.
+        """
+        section = None
+        for line in lines:
+            header = SECTION_HEADER.match(line)
+            if header:
+                self._finish_text_section(section)
+                section = _TextSection(int(header.group(1)), header.group(2).strip())
+                continue
+            if section is not None:
+                section.add_line(line)
+        self._finish_text_section(section)
     
-    def _parse_examples(self, section_text: str) -> List[PrivacyExample]:
-        """Extract examples from a pattern section."""
+    def _finish_text_section(self, section: Optional["_TextSection"]) -> None:
+        if section is None:
+            return
         examples = []
-        
-        # Look for table rows with example data
-        # Pattern: number | company/url | description | use case | why selected | etc.
-        row_pattern = r'(\d+)\s*\|\s*([^|]+?)\s+(https?://[^\s|]+)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|]+?)\s*\|\s*([^|\n]+)'
-        
-        # Alternative pattern for simpler format
-        simple_pattern = r'(\d+)\s*\|\s*([^|]+?)\s+(https?://[^\s|]+)\s*\|\s*([^|]+?)\s*\|\s*([^|\n]+)'
-        
-        # Try detailed pattern first
-        matches = list(re.finditer(row_pattern, section_text))
-        
-        if not matches:
-            # Try simpler pattern
-            matches = list(re.finditer(simple_pattern, section_text))
-            
-        for match in matches:
+        for groups in section.rows():
             try:
-                if len(match.groups()) >= 8:  # Detailed format
-                    example = PrivacyExample(
-                        example_number=int(match.group(1)),
-                        company=match.group(2).strip(),
-                        url=match.group(3).strip(),
-                        title=match.group(4).strip(),
-                        use_case=match.group(5).strip(),
-                        why_selected=match.group(6).strip(),
-                        pbd_alignment=match.group(7).strip(),
-                        nielsen_heuristics=match.group(8).strip()
-                    )
-                else:  # Simple format
-                    example = PrivacyExample(
-                        example_number=int(match.group(1)),
-                        company=match.group(2).strip(),
-                        url=match.group(3).strip(),
-                        title=match.group(4).strip(),
-                        use_case=match.group(5).strip() if len(match.groups()) > 4 else ""
-                    )
-                
-                examples.append(example)
-                
+                examples.append(self._example_from_groups(groups))
             except Exception as e:
                 logger.warning(f"Error parsing example: {e}")
-                continue
         
-        # If no examples found with table format, try to find URLs in the text
-        if not examples:
-            url_pattern = r'(\d+)[\s.]+([^\n]+?)\s+(https?://[^\s]+)'
-            for match in re.finditer(url_pattern, section_text):
-                try:
-                    example = PrivacyExample(
-                        example_number=int(match.group(1)),
-                        company=self._extract_company_name(match.group(2)),
-                        url=match.group(3).strip(),
-                        title=match.group(2).strip(),
-                        use_case=""
-                    )
-                    examples.append(example)
-                except Exception as e:
-                    logger.warning(f"Error parsing URL example: {e}")
-        
-        return examples
+        if examples:
+            pattern = PrivacyPattern(
+                pattern_number=section.number,
+                pattern_name=section.name,
+                description=' '.join(section.description[:3]),  # Take first 3 lines max
+                examples=examples
+            )
+            self.patterns.append(pattern)
+            logger.info(f"Parsed pattern {section.number}: {section.name} with {len(examples)} examples")
+    
+    def _example_from_groups(self, groups: Tuple[str, ...]) -> PrivacyExample:
+        if len(groups) == 3:  # Number, text and URL found loosely in a line
+            return PrivacyExample(
+                example_number=int(groups[0]),
+                company=self._extract_company_name(groups[1]),
+                url=groups[2].strip(),
+                title=groups[1].strip(),
+                use_case=""
+            )
+        if len(groups) >= 8:  # Detailed format
+            return PrivacyExample(
+                example_number=int(groups[0]),
+                company=groups[1].strip(),
+                url=groups[2].strip(),
+                title=groups[3].strip(),
+                use_case=groups[4].strip(),
+                why_selected=groups[5].strip(),
+                pbd_alignment=groups[6].strip(),
+                nielsen_heuristics=groups[7].strip()
+            )
+        return PrivacyExample(  # Simple format
+            example_number=int(groups[0]),
+            company=groups[1].strip(),
+            url=groups[2].strip(),
+            title=groups[3].strip(),
+            use_case=groups[4].strip()
+        )
     
     def _extract_company_name(self, text: str) -> str:
         """Extract company name from text."""
@@ -310,36 +497,9 @@ class PrivacyPatternParser:
         except:
             return "Unknown"
     
-    def _extract_description(self, section_text: str) -> str:
-        """Extract pattern description from section text."""
-        # Look for descriptive text before the table
-        lines = section_text.split('\n')
-        description_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line or '|' in line or line.startswith('#'):
-                break
-            if len(line) > 20:  # Likely a description line
-                description_lines.append(line)
-        
-        return ' '.join(description_lines[:3])  # Take first 3 lines max
-    
     def save_parsed_data(self, output_path: Path) -> None:
         """Save parsed data to JSON for inspection."""
-        data = {
-            "patterns": [
-                {
-                    "pattern_number": p.pattern_number,
-                    "pattern_name": p.pattern_name,
-                    "description": p.description,
-                    "examples": [asdict(e) for e in p.examples]
-                }
-                for p in self.patterns
-            ]
-        }
-        
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
         
         logger.info(f"Saved parsed data to {output_path}")
\ No newline at end of file
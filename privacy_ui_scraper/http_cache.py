@@ -0,0 +1,182 @@
+"""Record/replay cache of HTTP responses for repeat captures.
+
+In record mode every request a capture makes is fetched from the network,
+stored and then served to the page. In replay mode pages are served only from
+the cache and anything missing is aborted, so re-runs are fast, deterministic
+and need no network.
+
+Bodies are stored once per content hash under blobs/, and index.jsonl maps
+each request (method, URL and POST body) to its status, headers and body hash.
+The index is append-only; the last line for a request wins.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urldefrag, urljoin
+
+from playwright.async_api import Page, Request, Route
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MODE
+from records import dumps
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay")
+
+# The stored body is already decoded, so these no longer describe it
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+MAX_REDIRECTS = 10
+
+def request_key(method: str, url: str, post_data: Optional[bytes] = None) -> str:
+    """Cache key of a request; URL fragments never reach the server, so they are ignored."""
+    digest = hashlib.sha256(f"{method.upper()} {urldefrag(url)[0]}".encode('utf-8'))
+    if post_data:
+        digest.update(b"\0" + post_data)
+    return digest.hexdigest()
+
+def _loose_key(method: str, url: str) -> str:
+    """Method and URL without its query string, for cache-busting parameters."""
+    return f"{method.upper()} {urldefrag(url)[0].split('?', 1)[0]}"
+
+class HttpCache:
+    """On-disk HTTP response cache that pages are routed through."""
+
+    def __init__(self, cache_dir: Path = HTTP_CACHE_DIR, mode: str = HTTP_CACHE_MODE):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"HTTP cache mode must be 'record' or 'replay', not {mode!r}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.blob_dir = cache_dir / "blobs"
+        self.index_path = cache_dir / "index.jsonl"
+        self.entries: Dict[str, Dict] = {}
+        self._loose: Dict[str, str] = {}
+        self.stats = Counter()
+
+    @classmethod
+    def load(cls, cache_dir: Path = HTTP_CACHE_DIR, mode: str = HTTP_CACHE_MODE) -> "HttpCache":
+        cache = cls(cache_dir, mode)
+        if cache.index_path.exists():
+            with open(cache.index_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        cache._add(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        logger.warning(f"Skipping malformed HTTP cache line {line_number} in {cache.index_path}")
+        logger.info(f"HTTP cache ({mode}): {len(cache.entries)} responses in {cache_dir}")
+        return cache
+
+    def _add(self, entry: Dict):
+        self.entries[entry["key"]] = entry
+        self._loose[_loose_key(entry["method"], entry["url"])] = entry["key"]
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def lookup(self, method: str, url: str, post_data: Optional[bytes] = None) -> Optional[Dict]:
+        """The stored response for a request; GETs fall back to the same URL with any query string."""
+        entry = self.entries.get(request_key(method, url, post_data))
+        if entry is None and method.upper() == "GET":
+            entry = self.entries.get(self._loose.get(_loose_key(method, url)))
+        return entry
+
+    def store(self, method: str, url: str, post_data: Optional[bytes], status: int, headers: Dict, body: bytes) -> Dict:
+        """Save a response: the body under its hash (once), then an index line."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "key": request_key(method, url, post_data),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            "body": digest,
+            "recorded_at": datetime.now().isoformat()
+        }
+        # One write per line, so shard workers can append to the same index
+        with open(self.index_path, 'ab') as f:
+            f.write(dumps(entry) + b'\n')
+        self._add(entry)
+        return entry
+
+    def record_redirect(self, url: str, final_url: str) -> Dict:
+        """Store a redirect that was followed outside the browser, e.g. by pre-flight.
+
+        Captures of redirected URLs navigate straight to the final address,
+        so without this the original URL would never be recorded.
+        """
+        return self.store("GET", url, None, 301, {"location": final_url}, b"")
+
+    def resolve(self, url: str) -> str:
+        """Where navigating to `url` ends up, following recorded redirects."""
+        for _ in range(MAX_REDIRECTS):
+            entry = self.lookup("GET", url)
+            if entry is None or not 300 <= entry["status"] < 400:
+                break
+            location = next((value for name, value in entry["headers"].items() if name.lower() == "location"), None)
+            if not location:
+                break
+            url = urljoin(url, location)
+        return url
+
+    async def attach(self, page: Page):
+        """Route every request of `page` through the cache.
+
+        Attach before other routes (e.g. the RequestBlocker), so that they run
+        first and fall back to the cache for requests they let through.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        await page.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Route, request: Request):
+        if self.mode == "replay":
+            await self._replay(route, request)
+        else:
+            await self._record(route, request)
+
+    async def _replay(self, route: Route, request: Request):
+        entry = self.lookup(request.method, request.url, request.post_data_buffer)
+        if entry is None:
+            self.stats["misses"] += 1
+            logger.debug(f"Not in HTTP cache: {request.method} {request.url}")
+            await route.abort("internetdisconnected")
+            return
+        self.stats["hits"] += 1
+        body = await asyncio.get_running_loop().run_in_executor(None, self.blob_path(entry["body"]).read_bytes)
+        await route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+
+    async def _record(self, route: Route, request: Request):
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as e:
+            # Let the browser make the request itself, so it fails the way it would uncached
+            logger.debug(f"Not recording {request.url}: {e}")
+            await route.fallback()
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.store, request.method, request.url, request.post_data_buffer,
+            response.status, response.headers, body
+        )
+        self.stats["recorded"] += 1
+        await route.fulfill(response=response, body=body)
+
+    def get_stats(self) -> Dict:
+        return {"mode": self.mode, "hits": self.stats["hits"], "misses": self.stats["misses"],
+                "recorded": self.stats["recorded"]}
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+"""Perceptual hashing, duplicate clustering and blank/error-page scoring for screenshots."""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from config import (
+    OUTPUT_DIR, IMAGE_REPORT_PATH, IMAGE_ANALYSIS_WORKERS,
+    DUPLICATE_HASH_DISTANCE, BLANK_ENTROPY_THRESHOLD, ERROR_ENTROPY_THRESHOLD, TILE_DIR_SUFFIX
+)
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8  # 8x8 bits -> 64-bit hashes
+PHASH_SIZE = 32  # pHash takes the low frequencies of a 32x32 DCT
+ENTROPY_SIZE = 256  # Entropy and background share are scored on a 256x256 thumbnail
+BLANK_DOMINANT_FRACTION = 0.99  # Share of pixels in the most common shade for a blank page
+REDUCIBLE_MODES = {"L", "LA", "RGB", "RGBA", "I", "F"}  # Modes Image.reduce() accepts
+
+# Bits set in every byte value, for vectorized Hamming distances
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so a 2-D DCT is two matrix products."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+DCT_MATRIX = _dct_matrix(PHASH_SIZE)
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+def dhash(gray: Image.Image) -> int:
+    """Difference hash: is each pixel brighter than its right-hand neighbour?"""
+    pixels = np.asarray(gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR), dtype=np.int16)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+def phash(gray: Image.Image) -> int:
+    """DCT hash: are the lowest frequencies above their median?"""
+    pixels = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.BILINEAR), dtype=np.float64)
+    low = (DCT_MATRIX @ pixels @ DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE]
+    return _bits_to_int(low > np.median(low.ravel()[1:]))
+
+def entropy_stats(gray: Image.Image) -> Dict:
+    """Shannon entropy (bits) of the grey histogram and the share of the most common shade."""
+    pixels = np.asarray(gray.resize((ENTROPY_SIZE, ENTROPY_SIZE), Image.BILINEAR))
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    probabilities = histogram[histogram > 0] / pixels.size
+    return {
+        "entropy": round(abs(float((probabilities * np.log2(probabilities)).sum())), 3),
+        "dominant_fraction": round(float(histogram.max() / pixels.size), 4)
+    }
+
+def classify_entropy(entropy: float, dominant_fraction: float) -> str:
+    """Label a screenshot "blank", "error_like" or "ok" from its entropy stats.
+
+    Blank pages are a single flat colour; error pages are mostly background
+    with a line or two of text, which keeps their entropy low.
+    """
+    if entropy < BLANK_ENTROPY_THRESHOLD or dominant_fraction >= BLANK_DOMINANT_FRACTION:
+        return "blank"
+    if entropy < ERROR_ENTROPY_THRESHOLD:
+        return "error_like"
+    return "ok"
+
+def analyze_image(path: str) -> Dict:
+    """Hash and score one PNG. Runs in a worker process."""
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            # Cheap integer downscale first, so the full image is never resampled
+            factor = max(1, min(width, height) // (ENTROPY_SIZE * 2))
+            if image.mode not in REDUCIBLE_MODES:
+                image = image.convert("L")  # e.g. palette PNGs, which reduce() rejects
+            gray = image.reduce(factor).convert("L") if factor > 1 else image.convert("L")
+    except Exception as e:
+        return {"path": path, "verdict": "unreadable", "error": str(e) or e.__class__.__name__}
+
+    stats = entropy_stats(gray)
+    return {
+        "path": path,
+        "width": width,
+        "height": height,
+        "file_size": os.path.getsize(path),
+        "dhash": f"{dhash(gray):016x}",
+        "phash": f"{phash(gray):016x}",
+        **stats,
+        "verdict": classify_entropy(stats["entropy"], stats["dominant_fraction"])
+    }
+
+def analyze_images(paths: List[Path], workers: Optional[int] = IMAGE_ANALYSIS_WORKERS) -> List[Dict]:
+    """Analyze screenshots across worker processes, returning records in input order."""
+    paths = [str(path) for path in paths]
+    if not paths:
+        return []
+    if workers == 1:
+        return [analyze_image(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_image, paths, chunksize=max(1, len(paths) // 64)))
+
+def hamming_matrix(hashes: List[str]) -> np.ndarray:
+    """Pairwise Hamming distances between 64-bit hex hashes."""
+    values = np.array([int(value, 16) for value in hashes], dtype=np.uint64)
+    xor = values[:, None] ^ values[None, :]
+    return POPCOUNT_TABLE[xor.view(np.uint8)].reshape(len(values), len(values), 8).sum(axis=2, dtype=np.uint8)
+
+def find_duplicate_clusters(records: List[Dict], max_distance: int = DUPLICATE_HASH_DISTANCE) -> List[List[Dict]]:
+    """Group near-duplicate screenshots.
+
+    Two images are near-duplicates when both their dHash and pHash are within
+    `max_distance` bits; clusters are the connected groups of such pairs.
+    """
+    records = [record for record in records if "error" not in record]
+    if len(records) < 2:
+        return []
+
+    close = (
+        (hamming_matrix([record["dhash"] for record in records]) <= max_distance)
+        & (hamming_matrix([record["phash"] for record in records]) <= max_distance)
+    )
+
+    parents = list(range(len(records)))
+
+    def find(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for left, right in zip(*np.nonzero(np.triu(close, k=1))):
+        parents[find(int(left))] = find(int(right))
+
+    groups: Dict[int, List[Dict]] = {}
+    for index, record in enumerate(records):
+        groups.setdefault(find(index), []).append(record)
+    return [group for group in groups.values() if len(group) > 1]
+
+def build_report(records: List[Dict], clusters: List[List[Dict]], root: Path) -> Dict:
+    """Assemble the image report, with paths relative to `root`."""
+    def relative(path: str) -> str:
+        return str(Path(path).relative_to(root))
+
+    duplicate_of = {}
+    for cluster in clusters:
+        for record in cluster:
+            duplicate_of[record["path"]] = [relative(other["path"]) for other in cluster if other is not record]
+
+    images = []
+    for record in records:
+        entry = {**record, "path": relative(record["path"])}
+        if record["path"] in duplicate_of:
+            entry["duplicates"] = duplicate_of[record["path"]]
+        images.append(entry)
+
+    verdicts = [record["verdict"] for record in records]
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "summary": {
+            "total_images": len(records),
+            "blank": verdicts.count("blank"),
+            "error_like": verdicts.count("error_like"),
+            "unreadable": verdicts.count("unreadable"),
+            "duplicate_clusters": len(clusters),
+            "duplicate_images": sum(len(cluster) for cluster in clusters)
+        },
+        "duplicate_clusters": [[relative(record["path"]) for record in cluster] for cluster in clusters],
+        "images": images
+    }
+
+def screenshot_paths(root: Path) -> List[Path]:
+    """Every screenshot PNG under `root`; unstitched full-page strips are left out."""
+    return sorted(path for path in root.rglob("*.png") if not path.parent.name.endswith(TILE_DIR_SUFFIX))
+
+def analyze_tree(root: Path = OUTPUT_DIR, report_path: Path = IMAGE_REPORT_PATH) -> Dict:
+    """Analyze every screenshot under `root` and write the report to `report_path`."""
+    paths = screenshot_paths(root)
+    logger.info(f"Analyzing {len(paths)} screenshots under {root}")
+
+    records = analyze_images(paths)
+    clusters = find_duplicate_clusters(records)
+    report = build_report(records, clusters, root)
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    report = analyze_tree()
+    summary = report["summary"]
+
+    print(f"\n📊 IMAGE ANALYSIS SUMMARY")
+    print(f"Total screenshots: {summary['total_images']}")
+    print(f"Blank pages: {summary['blank']}")
+    print(f"Error-like pages: {summary['error_like']}")
+    print(f"Unreadable files: {summary['unreadable']}")
+    print(f"Near-duplicate clusters: {summary['duplicate_clusters']} ({summary['duplicate_images']} images)")
+
+    for cluster in report["duplicate_clusters"]:
+        print(f"\n🔁 {len(cluster)} near-identical screenshots:")
+        for path in cluster:
+            print(f"  {path}")
+
+    print(f"\n💾 Report saved to {IMAGE_REPORT_PATH}")
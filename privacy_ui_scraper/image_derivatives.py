@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+"""Post-capture stage: lossless PNG recompression, WebP/AVIF derivatives and thumbnails."""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from config import (
+    OUTPUT_DIR, DERIVATIVE_FORMATS, DERIVATIVE_QUALITY, THUMBNAIL_WIDTH, IMAGE_ANALYSIS_WORKERS
+)
+from capture_manifest import file_hash
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = "derivatives"  # Per-pattern subfolder for generated files
+INDEX_FILE = "index.json"  # Entries by screenshot file, kept even when metadata.json is rewritten
+
+def _save_atomic(image: Image.Image, path: Path, **options):
+    """Write to a temp file next to `path` and rename it into place."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    image.save(tmp_path, **options)
+    os.replace(tmp_path, path)
+
+def optimize_png(path: Path) -> int:
+    """Recompress a PNG losslessly, keeping it only if it got smaller. Returns the final size."""
+    original_size = path.stat().st_size
+    tmp_path = path.with_name(path.name + ".tmp")
+    with Image.open(path) as image:
+        image.load()
+        image.save(tmp_path, format="PNG", optimize=True)
+    if tmp_path.stat().st_size < original_size:
+        os.replace(tmp_path, path)
+    else:
+        tmp_path.unlink()
+    return path.stat().st_size
+
+def process_screenshot(job: Dict) -> Dict:
+    """Optimize one screenshot and write its derivatives. Runs in a worker process.
+
+    Returns the entry stored under "derivatives" in the example's metadata,
+    with paths relative to the pattern folder.
+    """
+    source = Path(job["source"])
+    folder = source.parent
+    out_dir = folder / DERIVATIVES_DIR
+    out_dir.mkdir(exist_ok=True)
+
+    try:
+        original_size = source.stat().st_size
+        png_size = optimize_png(source)
+        entry = {
+            "source_hash": file_hash(source),
+            "png_original_bytes": original_size,
+            "png_bytes": png_size,
+        }
+
+        with Image.open(source) as image:
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            for image_format in job["formats"]:
+                target = out_dir / f"{source.stem}.{image_format}"
+                _save_atomic(image, target, format=image_format.upper(), quality=job["quality"])
+                entry[image_format] = {
+                    "file": f"{DERIVATIVES_DIR}/{target.name}",
+                    "bytes": target.stat().st_size
+                }
+
+            width = min(job["thumbnail_width"], image.width)
+            height = max(1, round(image.height * width / image.width))
+            thumbnail = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+            target = out_dir / f"{source.stem}_thumb.webp"
+            _save_atomic(thumbnail, target, format="WEBP", quality=job["quality"])
+            entry["thumbnail"] = {
+                "file": f"{DERIVATIVES_DIR}/{target.name}",
+                "width": width,
+                "height": height,
+                "bytes": target.stat().st_size
+            }
+        return entry
+    except Exception as e:
+        return {"error": str(e) or e.__class__.__name__}
+
+def _is_current(folder: Path, screenshot_file: str, entry: Optional[Dict], formats: List[str]) -> bool:
+    """True if the recorded derivatives still match the screenshot on disk."""
+    if not entry or "error" in entry or any(image_format not in entry for image_format in formats):
+        return False
+    files = [entry[image_format]["file"] for image_format in formats] + [entry["thumbnail"]["file"]]
+    if not all((folder / file).exists() for file in files):
+        return False
+    return entry["source_hash"] == file_hash(folder / screenshot_file)
+
+def _load_index(folder: Path) -> Dict[str, Dict]:
+    index_path = folder / DERIVATIVES_DIR / INDEX_FILE
+    if not index_path.exists():
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_derivatives(
+    output_dir: Path = OUTPUT_DIR,
+    folders: Optional[List[str]] = None,
+    workers: Optional[int] = IMAGE_ANALYSIS_WORKERS,
+    formats: List[str] = DERIVATIVE_FORMATS
+) -> Dict:
+    """Process every captured screenshot whose source changed and update metadata.json.
+
+    `folders` limits the run to those pattern folders; by default every folder
+    with a metadata.json is processed. Each folder's derivatives/index.json
+    remembers the source hashes, so a capture run that rewrites metadata.json
+    doesn't force everything to be regenerated.
+    """
+    if folders is None:
+        folders = sorted(path.parent.name for path in output_dir.glob("*/metadata.json"))
+
+    metadata_by_folder: Dict[str, Dict] = {}
+    index_by_folder: Dict[str, Dict[str, Dict]] = {}
+    changed_folders = set()
+    jobs = []
+    skipped = 0
+    for folder_name in folders:
+        folder = output_dir / folder_name
+        metadata_path = folder / "metadata.json"
+        if not metadata_path.exists():
+            continue
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        metadata_by_folder[folder_name] = metadata
+        index = index_by_folder[folder_name] = _load_index(folder)
+
+        for example_index, example in enumerate(metadata["examples"]):
+            screenshot_file = example.get("screenshot_file")
+            if not screenshot_file or not (folder / screenshot_file).exists():
+                continue
+            entry = index.get(screenshot_file)
+            if _is_current(folder, screenshot_file, entry, formats):
+                if example.get("derivatives") != entry:
+                    example["derivatives"] = entry
+                    changed_folders.add(folder_name)
+                skipped += 1
+                continue
+            jobs.append((folder_name, example_index, {
+                "source": str(folder / screenshot_file),
+                "formats": formats,
+                "quality": DERIVATIVE_QUALITY,
+                "thumbnail_width": THUMBNAIL_WIDTH
+            }))
+
+    logger.info(f"Processing {len(jobs)} screenshots ({skipped} unchanged)")
+
+    if workers == 1 or len(jobs) < 2:
+        entries = [process_screenshot(job) for _, _, job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(process_screenshot, [job for _, _, job in jobs]))
+
+    errors = 0
+    for (folder_name, example_index, job), entry in zip(jobs, entries):
+        example = metadata_by_folder[folder_name]["examples"][example_index]
+        if "error" in entry:
+            errors += 1
+            logger.warning(f"Could not process {job['source']}: {entry['error']}")
+        else:
+            index_by_folder[folder_name][example["screenshot_file"]] = entry
+        example["derivatives"] = entry
+        changed_folders.add(folder_name)
+
+    for folder_name in changed_folders:
+        folder = output_dir / folder_name
+        with open(folder / "metadata.json", 'w', encoding='utf-8') as f:
+            json.dump(metadata_by_folder[folder_name], f, indent=2, ensure_ascii=False)
+        if index_by_folder[folder_name]:
+            with open(folder / DERIVATIVES_DIR / INDEX_FILE, 'w', encoding='utf-8') as f:
+                json.dump(index_by_folder[folder_name], f, indent=2, ensure_ascii=False)
+
+    processed = [entry for entry in entries if "error" not in entry]
+    return {
+        "processed": len(processed),
+        "skipped": skipped,
+        "errors": errors,
+        "png_bytes_before": sum(entry["png_original_bytes"] for entry in processed),
+        "png_bytes_after": sum(entry["png_bytes"] for entry in processed),
+        "derivative_bytes": sum(
+            entry[key]["bytes"] for entry in processed for key in formats + ["thumbnail"]
+        )
+    }
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    stats = build_derivatives()
+
+    print(f"\n📊 DERIVATIVES SUMMARY")
+    print(f"Processed: {stats['processed']}")
+    print(f"Unchanged (skipped): {stats['skipped']}")
+    print(f"Errors: {stats['errors']}")
+    if stats['processed']:
+        print(f"PNG bytes: {stats['png_bytes_before']:,} -> {stats['png_bytes_after']:,}")
+        print(f"Derivative bytes: {stats['derivative_bytes']:,}")
@@ -1,20 +1,31 @@
 #!/usr/bin/env python3
 
+import argparse
 import asyncio
 import logging
+import multiprocessing
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.logging import RichHandler
 from rich.table import Table
-from dataclasses import asdict
 
-from config import OUTPUT_DIR, HTML_PATH, LOG_FILE, LOG_LEVEL, LOG_FORMAT
+from config import (
+    OUTPUT_DIR, HTML_PATH, LOG_FILE, LOG_LEVEL, LOG_FORMAT, RESUME_MODE, BUILD_DERIVATIVES,
+    EXPORT_TRACE, TRACE_PATH, HTTP_CACHE_MODE
+)
 from html_parser import PrivacyPatternParser
 from screenshot_capture import ScreenshotCapture
 from metadata_manager import MetadataManager
+from capture_manifest import CaptureManifest, PLAN_CATEGORIES
+from sharding import split_patterns, run_shard, merge_shard_results
+from image_derivatives import build_derivatives
+from parse_diff import diff_parses, load_parsed_data, pattern_key
+from records import write_json
+from capture_timing import write_chrome_trace
 
 # Set up logging
 logging.basicConfig(
@@ -29,7 +40,26 @@ logger = logging.getLogger(__name__)
 
 console = Console()
 
-async def main():
+async def capture_sharded(patterns, shard_count: int, reuse: bool, http_cache_mode: str = HTTP_CACHE_MODE):
+    """Capture patterns across `shard_count` worker processes, each with its own browser.
+    
+    Returns the merged results and every worker's phase spans.
+    """
+    shards = [shard for shard in split_patterns(patterns, shard_count) if shard]
+    loop = asyncio.get_running_loop()
+    
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        shard_results = await asyncio.gather(
+            *(loop.run_in_executor(executor, run_shard, OUTPUT_DIR, shard, reuse, http_cache_mode) for shard in shards)
+        )
+    
+    spans = [span for _, shard_spans in shard_results for span in shard_spans]
+    return merge_shard_results(patterns, [results for results, _ in shard_results]), spans
+
+async def main(shards: int = 1, use_cache: bool = True, trace: bool = EXPORT_TRACE, http_cache: str = HTTP_CACHE_MODE):
     """Main function to orchestrate the privacy UI screenshot capture process."""
     console.print("[bold blue]Privacy UI Pattern Screenshot Scraper[/bold blue]")
     console.print(f"Starting at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -37,7 +67,7 @@ async def main():
     try:
         # Step 1: Parse the HTML document
         console.print("[yellow]Step 1: Parsing HTML document...[/yellow]")
-        parser = PrivacyPatternParser(HTML_PATH)
+        parser = PrivacyPatternParser(HTML_PATH, use_cache=use_cache)
         patterns = parser.parse()
         
         if not patterns:
@@ -64,24 +94,76 @@ async def main():
         console.print(table)
         console.print(f"\nTotal examples to capture: {total_examples}\n")
         
-        # Save parsed data for inspection
+        # Diff against the previous parse and save parsed data for inspection
         parsed_data_path = OUTPUT_DIR / "parsed_data.json"
-        parser.save_parsed_data(parsed_data_path)
-        console.print(f"[dim]Saved parsed data to {parsed_data_path}[/dim]\n")
+        parsed_data = parser.to_dict()
+        changeset = diff_parses(load_parsed_data(parsed_data_path), parsed_data)
+        console.print(f"[bold]Document changes:[/bold] {changeset.summary()}")
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        write_json(OUTPUT_DIR / "parse_changeset.json", changeset.to_dict())
+        if changeset.is_empty and parsed_data_path.exists():
+            console.print(f"[dim]Parsed data unchanged: {parsed_data_path}[/dim]\n")
+        else:
+            parser.save_parsed_data(parsed_data_path)
+            console.print(f"[dim]Saved parsed data to {parsed_data_path}[/dim]\n")
+        
+        # Every finished capture is appended to the manifest; with RESUME_MODE
+        # it also decides what needs capturing before the browser launches
+        manifest = CaptureManifest.load(reuse=RESUME_MODE)
+        planned_patterns = [
+            {
+                "folder": ScreenshotCapture.folder_name_for(p.pattern_number, p.pattern_name),
+                "examples": p.examples
+            }
+            for p in patterns
+        ]
+        metadata_manager = MetadataManager(OUTPUT_DIR)
+        unchanged_results = {}
+        if RESUME_MODE:
+            plan = manifest.plan(planned_patterns, OUTPUT_DIR)
+            console.print(
+                "[bold]Capture plan:[/bold] "
+                + ", ".join(f"{plan[category]} {category}" for category in PLAN_CATEGORIES)
+                + "\n"
+            )
+            
+            # Sections the document diff and the manifest both leave untouched
+            # keep their existing metadata and are not captured or rewritten
+            unchanged_keys = set(changeset.unchanged_patterns)
+            for index, (pattern_dict, planned) in enumerate(zip(parsed_data["patterns"], planned_patterns)):
+                if pattern_key(pattern_dict) not in unchanged_keys:
+                    continue
+                if any(manifest.classify(planned["folder"], e, OUTPUT_DIR) != "unchanged" for e in planned["examples"]):
+                    continue
+                results = metadata_manager.load_pattern_results(planned["folder"])
+                if results is not None:
+                    unchanged_results[index] = results
+            if unchanged_results:
+                console.print(f"[dim]{len(unchanged_results)} patterns unchanged since the last run[/dim]\n")
+        pending = [index for index in range(len(patterns)) if index not in unchanged_results]
         
         # Step 2: Initialize screenshot capture
         console.print("[yellow]Step 2: Initializing browser...[/yellow]")
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         
-        capture = ScreenshotCapture(OUTPUT_DIR)
-        await capture.initialize()
-        console.print("[green] Browser initialized[/green]\n")
-        
-        # Step 3: Initialize metadata manager
-        metadata_manager = MetadataManager(OUTPUT_DIR)
+        capture = ScreenshotCapture(OUTPUT_DIR, manifest=manifest, http_cache_mode=http_cache)
+        if http_cache != "off":
+            console.print(f"[dim]HTTP cache: {http_cache} ({len(capture.http_cache.entries)} stored responses)[/dim]")
+        if not pending:
+            console.print("[green]Nothing to capture[/green]\n")
+        elif shards > 1:
+            console.print(f"[green]Capturing with {shards} worker processes, one browser each[/green]\n")
+        else:
+            await capture.initialize()
+            console.print("[green] Browser initialized[/green]\n")
         
         # Step 4: Capture screenshots for each pattern
         console.print("[yellow]Step 3: Capturing screenshots...[/yellow]")
+        console.print(
+            f"[dim]Up to {capture.scheduler.max_concurrent} pages in flight, "
+            f"{capture.scheduler.max_per_host} per host, "
+            f"{capture.scheduler.host_delay}s between requests to the same host[/dim]"
+        )
         
         with Progress(
             SpinnerColumn(),
@@ -96,46 +178,81 @@ async def main():
                 total=len(patterns)
             )
             
-            for pattern in patterns:
-                progress.update(
-                    main_task,
-                    description=f"[cyan]Processing {pattern.pattern_name}..."
-                )
-                
-                # Convert examples to dict format
-                examples_dict = [asdict(example) for example in pattern.examples]
-                
-                # Capture screenshots for this pattern
-                results = await capture.capture_pattern_screenshots(
-                    pattern.pattern_number,
-                    pattern.pattern_name,
-                    examples_dict
-                )
-                
-                # Update metadata
-                metadata_manager.update_summary(results)
-                capture.results.append(results)
+            completed_patterns = dict(unchanged_results)
+            progress.advance(main_task, len(unchanged_results))
+            
+            def report_pattern(index, results):
+                # Rebuild the global summary files from every pattern finished so far
+                completed_patterns[index] = results
+                metadata_manager.rebuild_summary([completed_patterns[i] for i in sorted(completed_patterns)])
+                metadata_manager.write_summary_files()
                 
                 # Update progress
                 progress.advance(main_task)
                 
                 # Show pattern completion
-                successful = sum(1 for e in results['examples'] if e['success'])
-                total = len(results['examples'])
+                successful = results.successful
+                total = len(results.examples)
                 console.print(
-                    f"  [green][/green] Pattern {pattern.pattern_number}: "
+                    f"  [green][/green] Pattern {results.pattern_number}: "
                     f"{successful}/{total} successful captures"
                 )
+            
+            async def process_pattern(index, pattern):
+                # Capture screenshots for this pattern; the scheduler bounds
+                # how many pages are in flight overall and per host
+                results = await capture.capture_pattern_screenshots(
+                    pattern.pattern_number,
+                    pattern.pattern_name,
+                    pattern.examples
+                )
+                report_pattern(index, results)
+                return results
+            
+            if shards > 1 and pending:
+                # Workers skip per-pattern metadata; write it once from the merged results
+                captured, spans = await capture_sharded(
+                    [patterns[index] for index in pending], shards, RESUME_MODE, http_cache
+                )
+                capture.spans.extend(spans)
+                for index, results in zip(pending, captured):
+                    await capture.save_pattern_results(results)
+                    report_pattern(index, results)
+            else:
+                await asyncio.gather(
+                    *(process_pattern(index, patterns[index]) for index in pending)
+                )
+            all_results = [completed_patterns[index] for index in range(len(patterns))]
+            
+            # Update metadata in document order
+            metadata_manager.rebuild_summary(all_results)
+            capture.results.extend(all_results)
         
         # Step 5: Generate final outputs
         console.print("\n[yellow]Step 4: Generating summary files...[/yellow]")
         
-        metadata_manager.save_summary()
-        metadata_manager.create_index_html()
-        metadata_manager.create_main_readme()
+        metadata_manager.write_summary_files()
+        # Derivatives rewrite metadata.json, so every queued artifact must be on disk first
+        await metadata_manager.flush()
+        await capture.writer.flush()
         
         console.print("[green] Summary files created[/green]\n")
         
+        if trace and capture.spans:
+            span_count = write_chrome_trace(capture.spans, TRACE_PATH)
+            console.print(f"[dim]Wrote {span_count} phase spans to {TRACE_PATH}[/dim]\n")
+        
+        if BUILD_DERIVATIVES:
+            console.print("[yellow]Step 5: Optimizing screenshots and building derivatives...[/yellow]")
+            # CPU-bound work in its own process pool; the browser is idle by now
+            derivative_stats = await asyncio.get_running_loop().run_in_executor(
+                None, build_derivatives, OUTPUT_DIR, [results.folder for results in all_results]
+            )
+            console.print(
+                f"[green] {derivative_stats['processed']} processed, "
+                f"{derivative_stats['skipped']} unchanged[/green]\n"
+            )
+        
         # Display final summary
         summary = capture.get_summary()
         
@@ -144,7 +261,14 @@ async def main():
         console.print(f"Total examples: {summary['total_examples']}")
         console.print(f"Successful captures: {summary['successful_captures']}")
         console.print(f"Failed captures: {summary['failed_captures']}")
+        if summary['skipped_by_preflight']:
+            console.print(f"Skipped by pre-flight check: {summary['skipped_by_preflight']}")
         console.print(f"Success rate: {summary['success_rate']}")
+        if summary['avg_setup_ms'] is not None:
+            console.print(
+                f"Average context setup: {summary['avg_setup_ms']} ms, "
+                f"plus {summary['avg_reset_ms']} ms reset on release"
+            )
         console.print(f"\nOutput directory: {OUTPUT_DIR}")
         console.print(f"View results: {OUTPUT_DIR / 'index.html'}")
         
@@ -160,8 +284,29 @@ async def main():
             console.print("\n[dim]Browser closed[/dim]")
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Privacy UI Pattern Screenshot Scraper")
+    arg_parser.add_argument(
+        "--shards", type=int, default=1,
+        help="Split captures across this many worker processes, each with its own browser (default: 1)"
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-parse the HTML document even if a cached parse of it exists"
+    )
+    arg_parser.add_argument(
+        "--trace", action="store_true", default=EXPORT_TRACE,
+        help=f"Export capture phase spans as a Chrome trace to {TRACE_PATH.name}"
+    )
+    arg_parser.add_argument(
+        "--http-cache", choices=["off", "record", "replay"], default=HTTP_CACHE_MODE,
+        help="Record every response to the on-disk HTTP cache, or replay captures from it without network"
+    )
+    args = arg_parser.parse_args()
+    
     try:
-        asyncio.run(main())
+        asyncio.run(main(
+            shards=args.shards, use_cache=not args.no_cache, trace=args.trace, http_cache=args.http_cache
+        ))
     except KeyboardInterrupt:
         console.print("\n[yellow]Process interrupted by user[/yellow]")
         sys.exit(1)
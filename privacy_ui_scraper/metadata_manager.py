@@ -1,45 +1,98 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from artifact_writer import ArtifactWriter
+from capture_timing import summarize_phases
+from records import PatternResults, dumps
+
 logger = logging.getLogger(__name__)
 
 class MetadataManager:
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, writer: Optional[ArtifactWriter] = None):
         self.output_dir = output_dir
+        self.writer = writer or ArtifactWriter()
         self.summary_data = {
             "generated_at": datetime.now().isoformat(),
             "total_patterns": 0,
             "total_examples": 0,
             "successful_captures": 0,
             "failed_captures": 0,
+            "phase_timings": {},
             "patterns": []
         }
+        self.phase_samples: Dict[str, List[float]] = {}
     
-    def update_summary(self, pattern_results: Dict):
+    def update_summary(self, pattern_results: PatternResults):
         """Update the overall summary with pattern results."""
+        total = len(pattern_results.examples)
+        successful = pattern_results.successful
         self.summary_data["patterns"].append({
-            "pattern_number": pattern_results["pattern_number"],
-            "pattern_name": pattern_results["pattern_name"],
-            "folder": pattern_results["folder"],
-            "total_examples": len(pattern_results["examples"]),
-            "successful": sum(1 for e in pattern_results["examples"] if e["success"]),
-            "failed": sum(1 for e in pattern_results["examples"] if not e["success"])
+            "pattern_number": pattern_results.pattern_number,
+            "pattern_name": pattern_results.pattern_name,
+            "folder": pattern_results.folder,
+            "total_examples": total,
+            "successful": successful,
+            "failed": total - successful
         })
         
         self.summary_data["total_patterns"] = len(self.summary_data["patterns"])
-        self.summary_data["total_examples"] += len(pattern_results["examples"])
-        self.summary_data["successful_captures"] += sum(1 for e in pattern_results["examples"] if e["success"])
-        self.summary_data["failed_captures"] += sum(1 for e in pattern_results["examples"] if not e["success"])
+        self.summary_data["total_examples"] += total
+        self.summary_data["successful_captures"] += successful
+        self.summary_data["failed_captures"] += total - successful
+        
+        for result in pattern_results.examples:
+            for phase, ms in (result.phases_ms or {}).items():
+                self.phase_samples.setdefault(phase, []).append(ms)
+        self.summary_data["phase_timings"] = summarize_phases(self.phase_samples)
+    
+    def rebuild_summary(self, all_pattern_results: List[PatternResults]):
+        """Recompute the overall summary from scratch, in the given pattern order."""
+        self.summary_data.update({
+            "total_patterns": 0,
+            "total_examples": 0,
+            "successful_captures": 0,
+            "failed_captures": 0,
+            "phase_timings": {},
+            "patterns": []
+        })
+        self.phase_samples = {}
+        for pattern_results in all_pattern_results:
+            self.update_summary(pattern_results)
+    
+    def load_pattern_results(self, folder: str) -> Optional[PatternResults]:
+        """Load a pattern's results from its metadata.json, if it has been captured before."""
+        metadata_path = self.output_dir / folder / "metadata.json"
+        if not metadata_path.exists():
+            return None
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                return PatternResults.from_dict(json.load(f))
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable {metadata_path}")
+            return None
+    
+    def write_summary_files(self):
+        """Queue summary.json, index.html and README.md from the current summary.
+
+        They are written in one batch off the event loop; await flush() to
+        wait until they are on disk.
+        """
+        self.save_summary()
+        self.create_index_html()
+        self.create_main_readme()
+    
+    async def flush(self):
+        """Wait until every queued summary file has been written."""
+        await self.writer.flush()
     
     def save_summary(self):
         """Save the overall summary to a JSON file."""
         summary_path = self.output_dir / "summary.json"
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(self.summary_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Saved summary to {summary_path}")
+        self.writer.write(summary_path, dumps(self.summary_data, indent=True))
+        logger.info(f"Queued summary for {summary_path}")
     
     def create_index_html(self):
         """Create an HTML index page for easy browsing."""
@@ -107,6 +160,13 @@ class MetadataManager:
             background: #f8d7da;
             color: #721c24;
         }}
+        .timings {{
+            border-collapse: collapse;
+        }}
+        .timings th, .timings td {{
+            padding: 4px 16px 4px 0;
+            text-align: left;
+        }}
         a {{
             color: #0066cc;
             text-decoration: none;
@@ -128,6 +188,7 @@ class MetadataManager:
         <p>Failed Captures: {self.summary_data['failed_captures']}</p>
         <p>Success Rate: {(self.summary_data['successful_captures'] / self.summary_data['total_examples'] * 100):.1f}%</p>
     </div>
+    {self._phase_table_html()}
     
     <h2>Privacy Patterns</h2>
     <div class="patterns">
@@ -151,9 +212,24 @@ class MetadataManager:
 </html>"""
         
         index_path = self.output_dir / "index.html"
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        logger.info(f"Created index.html at {index_path}")
+        self.writer.write(index_path, html_content.encode('utf-8'))
+        logger.info(f"Queued index.html for {index_path}")
+    
+    def _phase_table_html(self) -> str:
+        """Per-phase p50/p95 capture timings, or nothing if no timings were recorded."""
+        if not self.summary_data["phase_timings"]:
+            return ""
+        rows = "".join(
+            f"<tr><td>{phase}</td><td>{timing['count']}</td>"
+            f"<td>{timing['p50_ms']:.0f} ms</td><td>{timing['p95_ms']:.0f} ms</td></tr>"
+            for phase, timing in self.summary_data["phase_timings"].items()
+        )
+        return f"""<div class="summary">
+        <h2>Capture Timing</h2>
+        <table class="timings">
+            <tr><th>Phase</th><th>Captures</th><th>p50</th><th>p95</th></tr>{rows}
+        </table>
+    </div>"""
     
     def create_main_readme(self):
         """Create a main README.md file."""
@@ -193,11 +269,10 @@ A comprehensive collection of privacy UI pattern screenshots from real-world web
 ## Notes
 
 - Screenshots were captured at 1920x1080 viewport
-- Full page screenshots were taken where possible
+- Screenshots are cropped to the detected privacy banner, or the viewport when none is found; full-page captures are opt-in per pattern
 - Some sites may show different content based on region/cookies
 """
         
         readme_path = self.output_dir / "README.md"
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        logger.info(f"Created main README.md at {readme_path}")
\ No newline at end of file
+        self.writer.write(readme_path, readme_content.encode('utf-8'))
+        logger.info(f"Queued main README.md for {readme_path}")
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""In-page error verdict for a loaded page: ok, not_found, login_wall or blocked.
+
+The page only hands back its title, final URL, whether it shows a password
+field and the first few hundred characters of visible text, so even a huge
+page is checked without serializing its DOM.
+"""
+
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Page
+
+from config import ERROR_CHECK_TEXT_CHARS
+from url_validator import AUTH_INDICATORS, ERROR_TEXT_INDICATORS, is_auth_path
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND_STATUSES = {404, 410}
+LOGIN_STATUSES = {401, 407}
+
+# Bot walls and access denials, checked in the title and the visible text
+BLOCKED_INDICATORS = [
+    "access denied", "request blocked", "verify you are human", "are you a robot",
+    "unusual traffic", "attention required"
+]
+
+# Short indicators only count in the title; in body text they match real content
+NOT_FOUND_TITLE_INDICATORS = [
+    "404", "not found", "error 404", "oops", "something went wrong", "page doesn't exist"
+]
+
+LOGIN_TITLE_INDICATORS = ["sign in", "log in", "login"]
+
+# Walks visible text nodes from the top of <body> and stops after maxChars, so
+# the cost doesn't grow with the page
+PAGE_SIGNALS_SCRIPT = """
+({maxChars}) => {
+    const skip = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+    const visible = (el) => !el.checkVisibility || el.checkVisibility();
+    const parts = [];
+    let length = 0;
+    if (document.body) {
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, {
+            acceptNode: (node) => {
+                const parent = node.parentElement;
+                if (!parent || skip.has(parent.tagName) || !node.nodeValue.trim() || !visible(parent)) {
+                    return NodeFilter.FILTER_REJECT;
+                }
+                return NodeFilter.FILTER_ACCEPT;
+            }
+        });
+        while (length < maxChars && walker.nextNode()) {
+            const text = walker.currentNode.nodeValue.trim();
+            parts.push(text);
+            length += text.length + 1;
+        }
+    }
+    const password = document.querySelector('input[type="password"]');
+    return {
+        title: document.title,
+        url: location.href,
+        text: parts.join(' ').slice(0, maxChars),
+        password_field: !!password && visible(password)
+    };
+}
+"""
+
+def classify_verdict(http_status: Optional[int], signals: Dict) -> Dict:
+    """Verdict for a page from its HTTP status and the signals PAGE_SIGNALS_SCRIPT returned.
+
+    Returns {"verdict": ..., "reason": ..., "title": ...}; "reason" is None for ok pages.
+    """
+    title = (signals.get("title") or "").strip()
+    lowered_title = title.lower()
+    text = ' '.join((signals.get("text") or "").split()).lower()
+    url = signals.get("url") or ""
+
+    def verdict(name: str, reason: Optional[str] = None) -> Dict:
+        return {"verdict": name, "reason": reason, "title": title}
+
+    if http_status in NOT_FOUND_STATUSES:
+        return verdict("not_found", f"HTTP {http_status}")
+    if http_status in LOGIN_STATUSES:
+        return verdict("login_wall", f"HTTP {http_status}")
+    if http_status is not None and http_status >= 400:
+        return verdict("blocked", f"HTTP {http_status}")
+
+    for indicator in BLOCKED_INDICATORS:
+        if indicator in lowered_title or indicator in text:
+            return verdict("blocked", f'"{indicator}" on page')
+    for indicator in AUTH_INDICATORS:
+        if indicator in text:
+            return verdict("login_wall", f'"{indicator}" on page')
+    if is_auth_path(url):
+        return verdict("login_wall", f"Redirected to {urlparse(url).path}")
+    if signals.get("password_field") and any(indicator in lowered_title for indicator in LOGIN_TITLE_INDICATORS):
+        return verdict("login_wall", "Sign-in form")
+    for indicator in NOT_FOUND_TITLE_INDICATORS:
+        if indicator in lowered_title:
+            return verdict("not_found", f'"{indicator}" in title')
+    for indicator in ERROR_TEXT_INDICATORS:
+        if indicator in text:
+            return verdict("not_found", f'"{indicator}" on page')
+    return verdict("ok")
+
+async def page_verdict(page: Page, http_status: Optional[int], max_chars: int = ERROR_CHECK_TEXT_CHARS) -> Dict:
+    """Check the loaded page in place and return its verdict (see classify_verdict)."""
+    try:
+        signals = await page.evaluate(PAGE_SIGNALS_SCRIPT, {"maxChars": max_chars})
+    except Exception as e:
+        # Mid-navigation or a crashed page; fall back to the status alone
+        logger.debug(f"Page signals unavailable: {e}")
+        signals = {}
+    return classify_verdict(http_status, signals)
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def pattern_key(pattern: Dict) -> str:
+    """Identify a pattern section by its header (number and name)."""
+    return f"{pattern['pattern_number']}|{pattern['pattern_name']}"
+
+def example_key(example: Dict) -> str:
+    """Identify an example row the same way the capture manifest does."""
+    return f"{example['example_number']}|{example['url']}"
+
+def fingerprint(data) -> str:
+    """Stable hash of a parsed pattern or example."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def _example_fingerprints(pattern: Dict) -> Dict[str, List[str]]:
+    # A pattern's tables can repeat an example key, so keep every row's hash
+    rows: Dict[str, List[str]] = {}
+    for example in pattern["examples"]:
+        rows.setdefault(example_key(example), []).append(fingerprint(example))
+    return rows
+
+@dataclass
+class PatternChange:
+    pattern: str
+    added_examples: List[str] = field(default_factory=list)
+    removed_examples: List[str] = field(default_factory=list)
+    modified_examples: List[str] = field(default_factory=list)
+
+@dataclass
+class Changeset:
+    """Pattern- and example-level differences between two parses."""
+    added_patterns: List[str] = field(default_factory=list)
+    removed_patterns: List[str] = field(default_factory=list)
+    modified_patterns: List[PatternChange] = field(default_factory=list)
+    unchanged_patterns: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added_patterns or self.removed_patterns or self.modified_patterns)
+
+    def summary(self) -> str:
+        examples = {"added": 0, "removed": 0, "modified": 0}
+        for change in self.modified_patterns:
+            examples["added"] += len(change.added_examples)
+            examples["removed"] += len(change.removed_examples)
+            examples["modified"] += len(change.modified_examples)
+        return (
+            f"{len(self.added_patterns)} added, {len(self.removed_patterns)} removed, "
+            f"{len(self.modified_patterns)} modified, {len(self.unchanged_patterns)} unchanged patterns "
+            f"({examples['added']} examples added, {examples['removed']} removed, {examples['modified']} modified)"
+        )
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def load_parsed_data(path: Path) -> Optional[Dict]:
+    """Load a previous parsed_data.json, or None if there isn't a usable one."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable previous parse {path}")
+        return None
+
+def diff_parses(previous: Optional[Dict], current: Dict) -> Changeset:
+    """Compare two parsed_data.json-style dicts section by section.
+
+    Each pattern section (its header plus every example row from its tables)
+    is fingerprinted; only sections whose fingerprint changed are compared
+    example by example. Sections are matched by header, so moving a section
+    within the document is not a change.
+    """
+    changeset = Changeset()
+    previous_patterns = {pattern_key(p): p for p in (previous or {}).get("patterns", [])}
+    current_patterns = {pattern_key(p): p for p in current["patterns"]}
+
+    for key, pattern in current_patterns.items():
+        old = previous_patterns.get(key)
+        if old is None:
+            changeset.added_patterns.append(key)
+            continue
+        if fingerprint(old) == fingerprint(pattern):
+            changeset.unchanged_patterns.append(key)
+            continue
+
+        change = PatternChange(pattern=key)
+        old_rows = _example_fingerprints(old)
+        new_rows = _example_fingerprints(pattern)
+        for row_key, hashes in new_rows.items():
+            if row_key not in old_rows:
+                change.added_examples.append(row_key)
+            elif old_rows[row_key] != hashes:
+                change.modified_examples.append(row_key)
+        change.removed_examples = [row_key for row_key in old_rows if row_key not in new_rows]
+        changeset.modified_patterns.append(change)
+
+    changeset.removed_patterns = [key for key in previous_patterns if key not in current_patterns]
+    return changeset
@@ -0,0 +1,115 @@
+"""Frozen, slotted records for capture results, and a fast JSON writer for them.
+
+A CaptureResult keeps the parsed PrivacyExample it belongs to instead of
+copying its fields, and is only flattened into the metadata.json layout
+(example fields first, then the capture fields) when it is written out.
+"""
+
+import json
+import os
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from html_parser import PrivacyExample, EXAMPLE_FIELDS
+
+try:
+    import orjson
+except ImportError:  # The standard library encoder gives the same output, just slower
+    orjson = None
+
+@dataclass(frozen=True, slots=True)
+class CaptureResult:
+    """The outcome of capturing one example."""
+    example: PrivacyExample
+    screenshot_file: Optional[str]
+    timestamp: str
+    success: bool
+    error: Optional[str] = None
+    http_status: Optional[int] = None
+    goto_ms: Optional[float] = None
+    blocked_requests: Optional[int] = None
+    blocked_by_reason: Optional[Dict[str, int]] = None  # See request_blocker: resource type or "blocked_domain"
+    allowed_requests: Optional[int] = None
+    allowed_bytes: Optional[int] = None  # Transferred by the requests that were let through
+    setup_ms: Optional[float] = None
+    reset_ms: Optional[float] = None  # Returning the context to the pool clean, paid after the capture
+    banner_selector: Optional[str] = None
+    banner_detect_ms: Optional[float] = None
+    capture_mode: Optional[str] = None
+    preflight: Optional[str] = None
+    final_url: Optional[str] = None
+    phases_ms: Optional[Dict[str, float]] = None  # See capture_timing.PHASES
+    verdict: Optional[str] = None  # See page_verdict: ok, not_found, login_wall or blocked
+    failure: Optional[str] = None  # See retry_policy: why the last attempt failed
+    attempts: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The flat metadata.json row: example fields, then capture fields."""
+        row = self.example.to_dict()
+        row.update(zip(CAPTURE_FIELDS, _capture_values(self)))
+        return row
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any], example: Optional[PrivacyExample] = None) -> "CaptureResult":
+        """Rebuild a result from a flat row; keys it doesn't know (e.g. "derivatives") are dropped.
+
+        `example` replaces the row's own example fields, e.g. with the current parse.
+        """
+        if example is None:
+            example = PrivacyExample(**{name: row[name] for name in EXAMPLE_FIELDS if name in row})
+        return cls(example, **{name: row.get(name) for name in CAPTURE_FIELDS})
+
+CAPTURE_FIELDS = tuple(f.name for f in fields(CaptureResult) if f.name != "example")
+_capture_values = attrgetter(*CAPTURE_FIELDS)
+
+@dataclass(frozen=True, slots=True)
+class PatternResults:
+    """Every capture result for one pattern, in example order."""
+    pattern_number: int
+    pattern_name: str
+    folder: str
+    examples: Tuple[CaptureResult, ...] = ()
+
+    @property
+    def successful(self) -> int:
+        return sum(1 for result in self.examples if result.success)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The metadata.json layout."""
+        return {
+            "pattern_number": self.pattern_number,
+            "pattern_name": self.pattern_name,
+            "folder": self.folder,
+            "examples": [result.to_dict() for result in self.examples]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PatternResults":
+        return cls(
+            pattern_number=data["pattern_number"],
+            pattern_name=data["pattern_name"],
+            folder=data["folder"],
+            examples=tuple(CaptureResult.from_dict(row) for row in data["examples"])
+        )
+
+def _to_json(value):
+    """Encoder hook: records serialize through their to_dict()."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode records, dicts and lists as UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_to_json, option=option)
+    return json.dumps(data, default=_to_json, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def write_json(path: Path, data: Any, indent: bool = True) -> None:
+    """Write JSON to a temp file next to `path` and rename it into place."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(data, indent=indent))
+    os.replace(tmp_path, path)
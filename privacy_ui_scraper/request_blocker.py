@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+from playwright.async_api import Page, Route, Request
+
+from config import BLOCKED_RESOURCE_TYPES, BLOCKED_DOMAINS, CMP_ALLOWED_DOMAINS
+
+logger = logging.getLogger(__name__)
+
+def _matches_domain(host: str, domains: List[str]) -> bool:
+    """True if `host` is one of `domains` or a subdomain of one."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+class RequestBlocker:
+    """Abort heavy third-party requests that have nothing to do with privacy UI.
+
+    Requests are blocked by resource type (e.g. video/audio) or by domain
+    (ads, analytics). Consent-management-platform domains are always let
+    through, because their banners are what we capture.
+
+    Requests that were let through are counted with their transferred size
+    (headers plus body as sent, so chunked and compressed responses count);
+    call finish() before closing the page to include late requests.
+    """
+
+    def __init__(
+        self,
+        resource_types: Optional[List[str]] = None,
+        domains: Optional[List[str]] = None,
+        allowed_domains: Optional[List[str]] = None
+    ):
+        self.resource_types = set(BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.domains = BLOCKED_DOMAINS if domains is None else domains
+        self.allowed_domains = CMP_ALLOWED_DOMAINS if allowed_domains is None else allowed_domains
+        self.blocked = Counter()
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+        self._pending: Set[asyncio.Future] = set()
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Return why a request should be blocked, or None to let it through."""
+        host = (urlparse(url).hostname or "").lower()
+        if _matches_domain(host, self.allowed_domains):
+            return None
+        if resource_type in self.resource_types:
+            return resource_type
+        if _matches_domain(host, self.domains):
+            return "blocked_domain"
+        return None
+
+    async def attach(self, page: Page, block: bool = True):
+        """Route every request of `page` through the blocker.
+
+        With `block=False` nothing is routed and requests are only counted,
+        as a baseline for what blocking saves.
+        """
+        if block:
+            await page.route("**/*", self._handle_route)
+        page.on("requestfinished", self._record_finished)
+
+    async def _handle_route(self, route: Route, request: Request):
+        # Never block the page we were asked to capture; requests let through
+        # fall back to earlier routes (e.g. the HTTP cache) or the network
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            await route.fallback()
+            return
+
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason:
+            self.blocked[reason] += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def _record_finished(self, request: Request):
+        self.allowed_requests += 1
+        # Sizes are another round trip to the browser; finish() waits for them
+        task = asyncio.ensure_future(self._record_sizes(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record_sizes(self, request: Request):
+        try:
+            sizes = await request.sizes()
+        except Exception as e:
+            logger.debug(f"No transfer size for {request.url}: {e}")
+            return
+        self.allowed_bytes += max(0, sizes["responseHeadersSize"]) + max(0, sizes["responseBodySize"])
+
+    async def finish(self) -> Dict:
+        """Stats for everything the page has loaded, once every size lookup is in."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        return self.get_stats()
+
+    def get_stats(self) -> Dict:
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "blocked_by_reason": dict(self.blocked),
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes
+        }
@@ -0,0 +1,151 @@
+"""Failure classification, retry backoff and a per-host circuit breaker for captures.
+
+Only transient failures (timeouts, dropped connections, 5xx and rate limits)
+are retried; DNS and TLS errors, 4xx responses and error pages fail on the
+first attempt. Host-level failures also count towards the host's circuit
+breaker, which skips a host after repeated failures instead of spending a full
+navigation timeout on each of its remaining examples.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from config import (
+    MAX_RETRIES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+)
+
+logger = logging.getLogger(__name__)
+
+# Failure classes recorded on CaptureResult.failure
+TIMEOUT = "timeout"
+DNS = "dns"
+TLS = "tls"
+CONNECTION = "connection"
+HTTP_4XX = "http_4xx"
+HTTP_5XX = "http_5xx"
+RATE_LIMITED = "rate_limited"
+ERROR_PAGE = "error_page"
+CIRCUIT_OPEN = "circuit_open"
+OFFLINE = "offline"  # No network, or not in the HTTP cache during a replay
+UNKNOWN = "unknown"  # e.g. a crashed page or closed target
+
+TRANSIENT_FAILURES = {TIMEOUT, CONNECTION, HTTP_5XX, RATE_LIMITED, UNKNOWN}
+
+# Failures that say something about the host rather than the one URL
+HOST_FAILURES = {TIMEOUT, DNS, TLS, CONNECTION, HTTP_5XX, RATE_LIMITED}
+
+# Chromium network error codes (in Playwright error messages) per failure class
+NETWORK_ERRORS = [
+    (TIMEOUT, ("ERR_TIMED_OUT", "ERR_CONNECTION_TIMED_OUT")),
+    (DNS, ("ERR_NAME_NOT_RESOLVED", "ERR_NAME_RESOLUTION_FAILED")),
+    (TLS, ("ERR_CERT_", "ERR_SSL_", "ERR_BAD_SSL_")),
+    (OFFLINE, ("ERR_INTERNET_DISCONNECTED",)),
+    (CONNECTION, (
+        "ERR_CONNECTION_", "ERR_EMPTY_RESPONSE", "ERR_NETWORK_CHANGED", "ERR_ADDRESS_UNREACHABLE",
+        "ERR_HTTP2_PROTOCOL_ERROR"
+    )),
+]
+
+def classify_exception(error: BaseException) -> str:
+    """Failure class for an exception raised while capturing."""
+    message = str(error)
+    for failure, codes in NETWORK_ERRORS:
+        if any(code in message for code in codes):
+            return failure
+    if isinstance(error, (PlaywrightTimeoutError, asyncio.TimeoutError)):
+        return TIMEOUT
+    return UNKNOWN
+
+def classify_outcome(http_status: Optional[int]) -> str:
+    """Failure class for a page that loaded but failed its error-page verdict."""
+    if http_status == 429:
+        return RATE_LIMITED
+    if http_status is not None and http_status >= 500:
+        return HTTP_5XX
+    if http_status is not None and http_status >= 400:
+        return HTTP_4XX
+    return ERROR_PAGE
+
+class RetryPolicy:
+    """Decide whether a failed attempt is retried, and after how long.
+
+    Delays grow exponentially from `base` up to `cap` seconds, with equal
+    jitter (half fixed, half random) so retries of one host don't line up.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_RETRIES,
+        base: float = RETRY_BACKOFF_BASE,
+        cap: float = RETRY_BACKOFF_MAX,
+        rng: Optional[random.Random] = None
+    ):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.rng = rng or random.Random()
+
+    def should_retry(self, failure: str, attempt: int) -> bool:
+        return failure in TRANSIENT_FAILURES and attempt < self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the attempt after `attempt`."""
+        ceiling = min(self.cap, self.base * 2 ** (attempt - 1))
+        return ceiling / 2 + self.rng.uniform(0, ceiling / 2)
+
+class CircuitBreaker:
+    """Skip hosts after `threshold` consecutive host-level failures.
+
+    An open host stays skipped for `cooldown` seconds; after that a single
+    capture is let through as a probe. Its success closes the breaker, and
+    its failure opens it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failures: Dict[str, int] = defaultdict(int)
+        self._opened_at: Dict[str, float] = {}
+
+    def is_open(self, host: str) -> bool:
+        """Whether `host` is being skipped, without claiming a half-open probe."""
+        opened_at = self._opened_at.get(host)
+        return opened_at is not None and self.clock() - opened_at < self.cooldown
+
+    def allow(self, host: str) -> bool:
+        """Whether a capture of `host` may go ahead now."""
+        if host not in self._opened_at:
+            return True
+        if self.is_open(host):
+            return False
+        # Half-open: this capture probes the host, the rest wait another cooldown
+        self._opened_at[host] = self.clock()
+        return True
+
+    def record(self, host: str, failure: Optional[str]):
+        """Record an attempt's outcome; `failure` is None for a success."""
+        if failure not in HOST_FAILURES:
+            # The host answered, even if this page was a 404
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            return
+        self._failures[host] += 1
+        if self._failures[host] >= self.threshold:
+            if host not in self._opened_at:
+                logger.warning(
+                    f"Circuit open for {host} after {self._failures[host]} failures ({failure}); "
+                    f"skipping it for {self.cooldown:.0f}s"
+                )
+            self._opened_at[host] = self.clock()
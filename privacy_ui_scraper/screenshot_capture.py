@@ -1,23 +1,152 @@
 import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from playwright.async_api import async_playwright, Page, Browser
-import json
 
 from config import (
-    VIEWPORT, USER_AGENT, HEADLESS, TIMEOUT, SCREENSHOT_TIMEOUT,
-    DELAY_BETWEEN_REQUESTS, MAX_RETRIES, RESUME_MODE
+    HEADLESS, TIMEOUT, SCREENSHOT_TIMEOUT, BANNER_TIMEOUT, BANNER_RELOAD_TIMEOUT, BLOCK_HEAVY_RESOURCES,
+    CAPTURE_MODE, FULL_PAGE_PATTERNS, FULL_PAGE_TILED, FULL_PAGE_STITCH, MIN_BANNER_SIZE,
+    RESUME_MODE, VALIDATE_BEFORE_CAPTURE, HTTP_CACHE_MODE
 )
+from artifact_writer import ArtifactWriter, write_atomic
+from capture_scheduler import CaptureScheduler
+from capture_timing import PhaseTimer, Span
+from context_pool import ContextPool
+from capture_manifest import CaptureManifest
+from html_parser import PrivacyExample
+from http_cache import HttpCache
+from page_verdict import page_verdict
+from records import CaptureResult, PatternResults, dumps
+from request_blocker import RequestBlocker
+from tiled_capture import capture_tiles, finish_tiles, tile_dir_for
+from retry_policy import CIRCUIT_OPEN, CircuitBreaker, RetryPolicy, classify_exception, classify_outcome
+from url_validator import UrlPreflight
 
 logger = logging.getLogger(__name__)
 
+# Consent-specific selectors for privacy banners, in order of preference
+BANNER_SELECTORS = [
+    '[id*="cookie"]',
+    '[class*="cookie"]',
+    '[id*="consent"]',
+    '[class*="consent"]',
+    '[id*="gdpr"]',
+    '[class*="gdpr"]',
+    '.cookie-banner',
+    '.consent-banner',
+    '.privacy-notice',
+    '#cookie-notice',
+    '#consent-notice',
+    '.cmp-banner',
+    '[data-testid*="cookie"]',
+    '[data-testid*="consent"]'
+]
+
+# Generic selectors that also match privacy-policy links, footers and other
+# dialogs; they only count as a banner when fixed or sticky on the page. The
+# ARIA "banner" role is the site header, so it is never used.
+OVERLAY_SELECTORS = [
+    '[id*="privacy"]',
+    '[class*="privacy"]',
+    '[role="dialog"]'
+]
+
+# Attribute set on the matched banner element so it can be screenshotted
+BANNER_MARK_ATTRIBUTE = 'data-privacy-banner-match'
+
+# Resolves as soon as any banner selector matches a visible element, or an
+# overlay selector a visible fixed/sticky one (checked on every DOM mutation
+# and on a short interval for CSS-driven reveals), or with null once the
+# deadline passes. The matched element is marked with BANNER_MARK_ATTRIBUTE.
+BANNER_WAIT_SCRIPT = """
+({selectors, overlaySelectors, timeout, markAttribute}) => new Promise((resolve) => {
+    const start = performance.now();
+    document.querySelectorAll(`[${markAttribute}]`).forEach((el) => el.removeAttribute(markAttribute));
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return false;
+        const style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    const isOverlay = (el) => {
+        for (let node = el; node && node !== document.body; node = node.parentElement) {
+            const position = window.getComputedStyle(node).position;
+            if (position === 'fixed' || position === 'sticky') return true;
+        }
+        return false;
+    };
+    const match = (list, accept) => {
+        for (const selector of list) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (accept(el)) {
+                    el.setAttribute(markAttribute, '');
+                    return selector;
+                }
+            }
+        }
+        return null;
+    };
+    const check = () => match(selectors, isVisible) || match(overlaySelectors, (el) => isVisible(el) && isOverlay(el));
+    let observer = null;
+    let interval = null;
+    let timer = null;
+    const finish = (selector) => {
+        if (observer) observer.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        resolve(selector ? {selector, elapsed_ms: performance.now() - start} : null);
+    };
+    const found = check();
+    if (found) return finish(found);
+    observer = new MutationObserver(() => {
+        const selector = check();
+        if (selector) finish(selector);
+    });
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true,
+        attributeFilter: ['class', 'style', 'id', 'hidden', 'open']
+    });
+    interval = setInterval(() => {
+        const selector = check();
+        if (selector) finish(selector);
+    }, 250);
+    timer = setTimeout(() => finish(null), timeout);
+})
+"""
+
 class ScreenshotCapture:
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        scheduler: Optional[CaptureScheduler] = None,
+        manifest: Optional[CaptureManifest] = None,
+        validate: bool = VALIDATE_BEFORE_CAPTURE,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        http_cache_mode: str = HTTP_CACHE_MODE,
+        block_resources: bool = BLOCK_HEAVY_RESOURCES
+    ):
         self.output_dir = output_dir
+        self.block_resources = block_resources
+        self.manifest = manifest
+        self.http_cache = HttpCache.load(mode=http_cache_mode) if http_cache_mode != "off" else None
+        # Replays never touch the network, so there is nothing to pre-flight
+        self.validate = validate and http_cache_mode != "replay"
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.preflight: Optional[UrlPreflight] = None
         self.browser: Optional[Browser] = None
-        self.results: List[Dict] = []
+        self.results: List[PatternResults] = []
+        self.scheduler = scheduler or CaptureScheduler()
+        self.context_pool: Optional[ContextPool] = None
+        self.capture_stats: Dict[str, Dict] = {}
+        self.spans: List[Span] = []  # Every attempt's phase spans, for trace export
+        self.writer = ArtifactWriter()  # Pattern metadata and READMEs, written off the event loop
         
     async def initialize(self):
         """Initialize the Playwright browser."""
@@ -26,14 +155,26 @@ class ScreenshotCapture:
             headless=HEADLESS,
             args=['--disable-blink-features=AutomationControlled']
         )
+        self.context_pool = ContextPool(self.browser)
+        await self.context_pool.start()
+        if self.validate:
+            self.preflight = UrlPreflight()
+            await self.preflight.start()
         logger.info("Browser initialized")
     
     async def cleanup(self):
-        """Clean up browser resources."""
+        """Write queued artifacts and clean up browser resources."""
+        await self.writer.flush()
+        if self.preflight:
+            await self.preflight.close()
+        if self.context_pool:
+            await self.context_pool.close()
         if self.browser:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+        if self.http_cache:
+            logger.info(f"HTTP cache: {self.http_cache.get_stats()}")
         logger.info("Browser cleaned up")
     
     async def capture_screenshot(
@@ -41,135 +182,233 @@ class ScreenshotCapture:
         url: str, 
         filename: str, 
         folder_path: Path,
-        attempt: int = 1
+        resume: bool = RESUME_MODE,
+        capture_mode: str = CAPTURE_MODE
     ) -> Tuple[bool, str]:
-        """Capture a screenshot of the given URL."""
-        if RESUME_MODE and (folder_path / filename).exists():
+        """Capture a screenshot of the given URL, retrying transient failures.
+        
+        `capture_mode` is "element" (the detected banner, falling back to the
+        viewport), "viewport" or "full_page". Attempts wait for a scheduler
+        slot and follow the retry policy and circuit breaker.
+        """
+        if resume and (folder_path / filename).exists():
             logger.info(f"Skipping existing screenshot: {filename}")
             return True, "Already exists"
+        success, message, _ = await self._capture_with_retries(url, filename, folder_path, resume, capture_mode)
+        return success, message
+    
+    async def _capture_once(
+        self,
+        url: str,
+        filename: str,
+        folder_path: Path,
+        attempt: int = 1,
+        resume: bool = RESUME_MODE,
+        capture_mode: str = CAPTURE_MODE
+    ) -> Tuple[bool, str]:
+        """Make one capture attempt of the given URL.
         
-        context = None
-        page = None
+        Failed attempts record their failure class (see retry_policy) in
+        `capture_stats`; retrying is up to the caller.
+        """
+        if resume and (folder_path / filename).exists():
+            logger.info(f"Skipping existing screenshot: {filename}")
+            return True, "Already exists"
         
+        stats_key = str(folder_path / filename)
+        self.capture_stats.pop(stats_key, None)
         try:
-            # Create new context with EU settings to trigger GDPR banners
-            context = await self.browser.new_context(
-                viewport=VIEWPORT,
-                user_agent=USER_AGENT,
-                locale='en-GB',  # UK locale for GDPR
-                timezone_id='Europe/London',
-                geolocation={'latitude': 51.5074, 'longitude': -0.1278},  # London coordinates
-                permissions=['geolocation'],
-                extra_http_headers={
-                    'Accept-Language': 'en-GB,en;q=0.9'
-                }
-            )
-            
-            page = await context.new_page()
+            return await self._capture_attempt(url, filename, folder_path, attempt, capture_mode)
             
-            # Clear any existing cookies to trigger consent banners
-            await context.clear_cookies()
+        except Exception as e:
+            failure = classify_exception(e)
+            logger.error(f"Error capturing {url} ({failure}): {str(e)}")
+            self.capture_stats.setdefault(stats_key, {})["failure"] = failure
+            return False, str(e)
+    
+    async def _capture_attempt(
+        self,
+        url: str,
+        filename: str,
+        folder_path: Path,
+        attempt: int,
+        capture_mode: str
+    ) -> Tuple[bool, str]:
+        """Run a single capture attempt in a pooled context, timing each phase."""
+        timer = PhaseTimer(filename, url, attempt)
+        stats: Dict = {}
+        self.capture_stats[str(folder_path / filename)] = stats
+        
+        async with self._pooled_page(timer, stats) as page:
+            logger.info(f"Context ready for {url} in {stats['setup_ms']:.0f} ms")
             
             # Navigate to URL
-            logger.info(f"Navigating to {url} (attempt {attempt}/{MAX_RETRIES})")
-            await page.goto(url, wait_until='domcontentloaded', timeout=TIMEOUT)
-            
-            # Wait for privacy banners to appear
-            await page.wait_for_timeout(3000)
+            logger.info(f"Navigating to {url} (attempt {attempt}/{self.retry_policy.max_attempts})")
+            with timer.span("goto"):
+                response = await page.goto(url, wait_until='domcontentloaded', timeout=TIMEOUT)
+            stats["http_status"] = response.status if response else None
+            stats["goto_ms"] = timer.spans[-1].duration_ms
             
-            # Look for cookie/privacy banners before doing anything else
-            banner_found = await self._wait_for_privacy_banners(page)
+            # Error pages fail right away instead of waiting out the banner deadline
+            error = await self._check_error_page(page, url, timer, stats)
+            if error:
+                return False, error
             
-            if not banner_found:
-                # Try refreshing to trigger banners
-                await page.reload(wait_until='domcontentloaded')
-                await page.wait_for_timeout(2000)
-                await self._wait_for_privacy_banners(page)
+            # Look for cookie/privacy banners
+            with timer.span("banner_wait"):
+                banner = await self._wait_for_privacy_banners(page)
             
-            # Check for error pages before taking screenshot
-            page_title = await page.title()
-            page_content = await page.content()
+            if not banner and BANNER_RELOAD_TIMEOUT > 0:
+                # Try refreshing to trigger banners; a short second deadline, so
+                # pages without a banner don't wait out BANNER_TIMEOUT twice
+                with timer.span("reload"):
+                    await page.reload(wait_until='domcontentloaded')
+                with timer.span("banner_wait"):
+                    banner = await self._wait_for_privacy_banners(page, BANNER_RELOAD_TIMEOUT)
             
-            # Common error page indicators
-            error_indicators = [
-                "404", "not found", "page not found", "error 404",
-                "oops", "something went wrong", "page doesn't exist",
-                "sign in required", "login required", "access denied"
-            ]
+            stats["banner_selector"] = banner["selector"] if banner else None
+            stats["banner_detect_ms"] = round(banner["elapsed_ms"], 1) if banner else None
             
-            is_error_page = any(indicator in page_title.lower() or indicator in page_content.lower()[:1000] 
-                              for indicator in error_indicators)
+            # Check again: some sites only render their error page client-side
+            error = await self._check_error_page(page, url, timer, stats)
+            if error:
+                return False, error
             
-            if is_error_page:
-                logger.warning(f"Error page detected for {url}: {page_title}")
-                return False, f"Error page: {page_title}"
-            
-            # Take screenshot
+            # Take screenshot; Playwright encodes the PNG, we write it off the event loop.
+            # Writes are atomic, so resume never mistakes a truncated file for a capture
             screenshot_path = folder_path / filename
-            await page.screenshot(
-                path=str(screenshot_path),
-                full_page=True,
-                timeout=SCREENSHOT_TIMEOUT
-            )
+            loop = asyncio.get_running_loop()
+            if capture_mode == "full_page" and FULL_PAGE_TILED:
+                # Viewport strips straight to disk, stitched a band of rows at a time
+                with timer.span("screenshot"):
+                    tiles = await capture_tiles(page, tile_dir_for(screenshot_path))
+                with timer.span("write"):
+                    page_height = await loop.run_in_executor(
+                        None, finish_tiles, tiles, screenshot_path, FULL_PAGE_STITCH
+                    )
+                stats["capture_mode"] = "tiled"
+                logger.info(f"Captured {page_height} px of {url} in {len(tiles)} strips")
+            else:
+                with timer.span("screenshot"):
+                    image, stats["capture_mode"] = await self._take_screenshot(page, capture_mode, banner)
+                with timer.span("write"):
+                    await write_atomic(screenshot_path, image)
             
             # Check screenshot file size (very small files are usually error pages)
             file_size = screenshot_path.stat().st_size
-            if file_size < 30000:  # Less than 30KB is suspicious
+            if stats["capture_mode"] != "element" and file_size < 30000:  # Less than 30KB is suspicious
                 logger.warning(f"Very small screenshot ({file_size} bytes) for {url} - possible error page")
             
             logger.info(f"Successfully captured screenshot: {filename} ({file_size:,} bytes)")
             return True, "Success"
-            
-        except Exception as e:
-            error_msg = f"Error capturing {url}: {str(e)}"
-            logger.error(error_msg)
-            
-            if attempt < MAX_RETRIES:
-                await asyncio.sleep(DELAY_BETWEEN_REQUESTS)
-                return await self.capture_screenshot(url, filename, folder_path, attempt + 1)
-            
-            return False, str(e)
-            
+    
+    @asynccontextmanager
+    async def _pooled_page(self, timer: PhaseTimer, stats: Dict):
+        """A new page in a pooled context, timing its setup and the context reset on release.
+
+        The context comes pre-warmed with EU settings to trigger GDPR banners;
+        the pool clears cookies, storage and permissions before it is reused.
+        The request blocker's counts are taken just before the page is closed,
+        so requests made after navigation (video, ads) are included.
+        """
+        setup_start = time.perf_counter()
+        reset_start = None
+        try:
+            async with self.context_pool.acquire() as context:
+                page = await context.new_page()
+                timer.add("context", setup_start)
+                stats["setup_ms"] = timer.spans[-1].duration_ms
+                
+                if self.http_cache:
+                    # Routed first so the blocker below sees requests before the cache
+                    await self.http_cache.attach(page)
+                
+                # Skip video, ads and analytics (CMP scripts stay allow-listed);
+                # with blocking off, requests are still counted for comparison
+                blocker = RequestBlocker()
+                await blocker.attach(page, block=self.block_resources)
+                try:
+                    yield page
+                finally:
+                    blocking = await blocker.finish()
+                    stats.update(blocking)
+                    logger.info(
+                        f"{timer.url}: blocked {blocking['blocked_requests']} requests {blocking['blocked_by_reason']}, "
+                        f"loaded {blocking['allowed_requests']} ({blocking['allowed_bytes']:,} bytes)"
+                    )
+                    reset_start = time.perf_counter()
+                    await page.close()
         finally:
-            if page:
-                await page.close()
-            if context:
-                await context.close()
+            if reset_start is not None:
+                timer.add("reset", reset_start)
+                stats["reset_ms"] = timer.spans[-1].duration_ms
+            stats["phases_ms"] = timer.phases_ms()
+            self.spans.extend(timer.spans)
     
-    async def _wait_for_privacy_banners(self, page: Page) -> bool:
-        """Wait for privacy banners to appear and return True if found."""
-        # Common selectors for privacy banners
-        banner_selectors = [
-            '[id*="cookie"]',
-            '[class*="cookie"]',
-            '[id*="consent"]',
-            '[class*="consent"]',
-            '[id*="privacy"]',
-            '[class*="privacy"]',
-            '[id*="gdpr"]',
-            '[class*="gdpr"]',
-            '[role="dialog"]',
-            '[role="banner"]',
-            '.cookie-banner',
-            '.consent-banner',
-            '.privacy-notice',
-            '#cookie-notice',
-            '#consent-notice',
-            '.cmp-banner',
-            '[data-testid*="cookie"]',
-            '[data-testid*="consent"]'
-        ]
-        
-        for selector in banner_selectors:
+    async def _check_error_page(self, page: Page, url: str, timer: PhaseTimer, stats: Dict) -> Optional[str]:
+        """Record the page's verdict; returns the failure message for error pages."""
+        with timer.span("error_check"):
+            verdict = await page_verdict(page, stats["http_status"])
+        stats["verdict"] = verdict["verdict"]
+        if verdict["verdict"] == "ok":
+            return None
+        stats["failure"] = classify_outcome(stats["http_status"])
+        logger.warning(f"Error page detected for {url}: {verdict['verdict']} ({verdict['reason']})")
+        return f"Error page ({verdict['verdict']}): {verdict['reason']}"
+    
+    async def _take_screenshot(
+        self,
+        page: Page,
+        capture_mode: str,
+        banner: Optional[Dict]
+    ) -> Tuple[bytes, str]:
+        """Take a PNG screenshot in the requested mode; returns it and the mode actually used."""
+        if capture_mode == "element" and banner:
+            element = page.locator(f"[{BANNER_MARK_ATTRIBUTE}]").first
             try:
-                element = await page.wait_for_selector(selector, timeout=2000)
-                if element and await element.is_visible():
-                    logger.info(f"Found privacy banner with selector: {selector}")
-                    return True
-            except:
-                continue
+                box = await element.bounding_box()
+                if box and box["width"] >= MIN_BANNER_SIZE["width"] and box["height"] >= MIN_BANNER_SIZE["height"]:
+                    return await element.screenshot(timeout=SCREENSHOT_TIMEOUT), "element"
+                logger.info(f"Banner element too small ({box}), falling back to viewport")
+            except Exception as e:
+                logger.info(f"Banner element screenshot failed, falling back to viewport: {e}")
         
-        return False
+        full_page = capture_mode == "full_page"
+        image = await page.screenshot(
+            full_page=full_page,
+            timeout=SCREENSHOT_TIMEOUT
+        )
+        return image, "full_page" if full_page else "viewport"
+    
+    async def _wait_for_privacy_banners(
+        self,
+        page: Page,
+        timeout: int = BANNER_TIMEOUT
+    ) -> Optional[Dict]:
+        """Wait until any privacy banner candidate is visible, or the deadline passes.
+        
+        Returns {"selector": ..., "elapsed_ms": ...} for the first matching
+        selector, or None if nothing showed up within `timeout` ms.
+        """
+        try:
+            banner = await page.evaluate(
+                BANNER_WAIT_SCRIPT,
+                {
+                    "selectors": BANNER_SELECTORS,
+                    "overlaySelectors": OVERLAY_SELECTORS,
+                    "timeout": timeout,
+                    "markAttribute": BANNER_MARK_ATTRIBUTE
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Banner detection failed: {e}")
+            return None
+        
+        if banner:
+            logger.info(f"Found privacy banner with selector: {banner['selector']} after {banner['elapsed_ms']:.0f} ms")
+        else:
+            logger.info(f"No privacy banner found within {timeout} ms")
+        return banner
     
     async def _handle_cookie_banners(self, page: Page):
         """Try to handle common cookie consent banners (DO NOT CLICK - just detect)."""
@@ -181,91 +420,255 @@ class ScreenshotCapture:
         self,
         pattern_number: int,
         pattern_name: str,
-        examples: List[Dict]
-    ) -> Dict:
+        examples: List[PrivacyExample],
+        save_metadata: bool = True
+    ) -> PatternResults:
         """Capture all screenshots for a privacy pattern."""
+        # Full-page captures are opt-in per pattern
+        capture_mode = "full_page" if pattern_number in FULL_PAGE_PATTERNS else CAPTURE_MODE
+        
         # Create folder
-        folder_name = f"{pattern_number:02d}_{pattern_name.replace(' ', '_').replace('/', '_')}"
+        folder_name = self.folder_name_for(pattern_number, pattern_name)
         folder_path = self.output_dir / folder_name
         folder_path.mkdir(parents=True, exist_ok=True)
         
-        results = {
-            "pattern_number": pattern_number,
-            "pattern_name": pattern_name,
-            "folder": folder_name,
-            "examples": []
-        }
+        results = PatternResults(pattern_number, pattern_name, folder_name)
         
-        for example in examples:
-            filename = f"example_{example['example_number']}_{example['company'].replace(' ', '_').replace('/', '_')}.png"
+        completed: Dict[int, CaptureResult] = {}
+        
+        async def capture_and_save(index: int, example: PrivacyExample) -> CaptureResult:
+            result = await self._capture_example(example, folder_name, capture_mode)
+            completed[index] = result
             
-            # Add delay between requests
-            if example['example_number'] > 1:
-                await asyncio.sleep(DELAY_BETWEEN_REQUESTS)
+            # Rewrite the pattern files as each example finishes, so a crash
+            # mid-pattern keeps everything captured so far
+            if save_metadata:
+                await self._save_pattern_metadata(
+                    folder_path,
+                    replace(results, examples=tuple(completed[i] for i in sorted(completed)))
+                )
+            return result
+        
+        results = replace(results, examples=tuple(await asyncio.gather(
+            *(capture_and_save(index, example) for index, example in enumerate(examples))
+        )))
             
-            success, message = await self.capture_screenshot(
-                example['url'],
-                filename,
-                folder_path
-            )
+        # Save metadata, and wait until this pattern's files are on disk
+        if save_metadata:
+            await self._save_pattern_metadata(folder_path, results)
+            await self.writer.flush()
+        
+        return results
+    
+    async def save_pattern_results(self, results: PatternResults):
+        """Save metadata for pattern results captured elsewhere, e.g. by shard workers."""
+        folder_path = self.output_dir / results.folder
+        folder_path.mkdir(parents=True, exist_ok=True)  # No worker created it if the pattern had no examples
+        await self._save_pattern_metadata(folder_path, results)
+    
+    @staticmethod
+    def folder_name_for(pattern_number: int, pattern_name: str) -> str:
+        """Return the output folder name for a pattern."""
+        return f"{pattern_number:02d}_{pattern_name.replace(' ', '_').replace('/', '_')}"
+    
+    @staticmethod
+    def filename_for(example: PrivacyExample) -> str:
+        """Return the screenshot filename for an example."""
+        return f"example_{example.example_number}_{example.company.replace(' ', '_').replace('/', '_')}.png"
+    
+    async def _capture_example(
+        self, example: PrivacyExample, folder_name: str, capture_mode: str = CAPTURE_MODE
+    ) -> CaptureResult:
+        """Pre-flight check one example, then capture it once the scheduler grants it a slot.
+
+        Pre-flight checks have their own, wider concurrency limits, so the
+        examples of later patterns are validated while earlier ones are still
+        in the browser. URLs that aren't working or redirected never reach it.
+        """
+        folder_path = self.output_dir / folder_name
+        filename = self.filename_for(example)
+        
+        # With a reusing manifest, unchanged rows are served from it and
+        # everything else is recaptured even if a file with the same name exists
+        if self.manifest is not None:
+            cached = self.manifest.cached_result(folder_name, example, self.output_dir)
+            if cached is not None:
+                logger.info(f"Unchanged since last capture: {filename}")
+                return cached
+        resume = RESUME_MODE and self.manifest is None
+        
+        capture_url = example.url
+        preflight = None
+        
+        if resume and (folder_path / filename).exists():
+            # Nothing to fetch, so don't wait for a slot
+            logger.info(f"Skipping existing screenshot: {filename}")
+            success, message, attempts = True, "Already exists", None
+        else:
+            if self.preflight is not None:
+                preflight = await self.preflight.check(example.url)
+                if preflight["category"] not in ("working", "redirected", "inconclusive"):
+                    logger.warning(f"Skipping {example.url}: {preflight['category']} ({preflight.get('reason')})")
+                    result = self._preflight_failure(example, preflight)
+                    await self._record_manifest(folder_name, result)
+                    return result
+                # Go straight to where the URL ends up; inconclusive checks may
+                # have landed on a challenge page, so those start from the original
+                if preflight["category"] == "redirected":
+                    capture_url = preflight["final_url"]
+                    if self.http_cache is not None:
+                        # Recording: keep the redirect, so a replay can follow it without pre-flight
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, self.http_cache.record_redirect, example.url, capture_url
+                        )
+            elif self.http_cache is not None and self.http_cache.mode == "replay":
+                # Replays have no pre-flight; follow the redirects it recorded
+                capture_url = self.http_cache.resolve(example.url)
             
-            result = {
-                **example,
-                "screenshot_file": filename if success else None,
-                "timestamp": datetime.now().isoformat(),
-                "success": success,
-                "error": message if not success else None
-            }
+            success, message, attempts = await self._capture_with_retries(
+                capture_url, filename, folder_path, resume, capture_mode
+            )
+        
+        stats = self.capture_stats.pop(str(folder_path / filename), {})
+        
+        result = CaptureResult(
+            example,
+            screenshot_file=filename if success else None,
+            timestamp=datetime.now().isoformat(),
+            success=success,
+            error=message if not success else None,
+            http_status=stats.get("http_status"),
+            goto_ms=stats.get("goto_ms"),
+            blocked_requests=stats.get("blocked_requests"),
+            blocked_by_reason=stats.get("blocked_by_reason"),
+            allowed_requests=stats.get("allowed_requests"),
+            allowed_bytes=stats.get("allowed_bytes"),
+            setup_ms=stats.get("setup_ms"),
+            reset_ms=stats.get("reset_ms"),
+            banner_selector=stats.get("banner_selector"),
+            banner_detect_ms=stats.get("banner_detect_ms"),
+            capture_mode=stats.get("capture_mode"),
+            preflight=preflight["category"] if preflight else None,
+            final_url=capture_url if capture_url != example.url else None,
+            phases_ms=stats.get("phases_ms"),
+            verdict=stats.get("verdict"),
+            failure=stats.get("failure") if not success else None,
+            attempts=attempts
+        )
+        
+        # Flush one event line per finished capture
+        await self._record_manifest(folder_name, result)
+        
+        return result
+    
+    async def _record_manifest(self, folder_name: str, result: CaptureResult):
+        """Append the result to the manifest, if any; hashing and the append run off the event loop."""
+        if self.manifest is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.manifest.record, folder_name, result, self.output_dir
+            )
+    
+    async def _capture_with_retries(
+        self, url: str, filename: str, folder_path: Path, resume: bool, capture_mode: str
+    ) -> Tuple[bool, str, Optional[int]]:
+        """Capture `url`, retrying transient failures; returns (success, message, attempts made).
+
+        Each attempt waits for its own scheduler slot. A retry gives its slot
+        up during the backoff and queues behind the captures already waiting,
+        so a flaky site doesn't hold up the rest of the run.
+        """
+        stats_key = str(folder_path / filename)
+        host = self.scheduler.host_for(url)
+        attempt = 0
+        while True:
+            allowed = False
+            if not self.circuit_breaker.is_open(host):
+                async with self.scheduler.slot(url):
+                    # The breaker may have opened while this capture was queued
+                    allowed = self.circuit_breaker.allow(host)
+                    if allowed:
+                        attempt += 1
+                        success, message = await self._capture_once(
+                            url,
+                            filename,
+                            folder_path,
+                            attempt=attempt,
+                            resume=resume,
+                            capture_mode=capture_mode
+                        )
+            if not allowed:
+                logger.warning(f"Skipping {url}: circuit open for {host}")
+                self.capture_stats[stats_key] = {**self.capture_stats.get(stats_key, {}), "failure": CIRCUIT_OPEN}
+                return False, f"Circuit open for {host}", attempt or None
             
-            results["examples"].append(result)
+            failure = None if success else self.capture_stats.get(stats_key, {}).get("failure")
+            self.circuit_breaker.record(host, failure)
+            if success or not self.retry_policy.should_retry(failure, attempt):
+                return success, message, attempt
             
-        # Save metadata
-        await self._save_pattern_metadata(folder_path, results)
-        
-        return results
+            delay = self.retry_policy.delay(attempt)
+            logger.info(f"Retrying {url} after {failure} in {delay:.1f}s (attempt {attempt + 1}/{self.retry_policy.max_attempts})")
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _preflight_failure(example: PrivacyExample, preflight: Dict) -> CaptureResult:
+        """Result for an example whose URL failed the pre-flight check."""
+        return CaptureResult(
+            example,
+            screenshot_file=None,
+            timestamp=datetime.now().isoformat(),
+            success=False,
+            error=f"Pre-flight {preflight['category']}: {preflight.get('reason', 'unknown')}",
+            http_status=preflight["status"],
+            preflight=preflight["category"],
+            final_url=preflight["final_url"] if preflight["final_url"] != example.url else None
+        )
     
-    async def _save_pattern_metadata(self, folder_path: Path, results: Dict):
-        """Save metadata.json and README.md for a pattern."""
+    async def _save_pattern_metadata(self, folder_path: Path, results: PatternResults):
+        """Queue metadata.json and README.md for a pattern; see ArtifactWriter."""
         # Save metadata.json
-        metadata_path = folder_path / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        self.writer.write(folder_path / "metadata.json", dumps(results, indent=True))
         
         # Create README.md
-        readme_content = f"""# {results['pattern_name']}
+        readme_content = f"""# {results.pattern_name}
 
-Privacy UI pattern #{results['pattern_number']}
+Privacy UI pattern #{results.pattern_number}
 
 ## Examples
 
 """
-        for example in results['examples']:
-            status = "" if example['success'] else "L"
-            readme_content += f"### Example {example['example_number']}: {example['company']} {status}\n"
-            readme_content += f"- **URL**: {example['url']}\n"
-            readme_content += f"- **Title**: {example['title']}\n"
-            readme_content += f"- **Use Case**: {example['use_case']}\n"
-            if example['success']:
-                readme_content += f"- **Screenshot**: [{example['screenshot_file']}](./{example['screenshot_file']})\n"
+        for result in results.examples:
+            example = result.example
+            status = "" if result.success else "L"
+            readme_content += f"### Example {example.example_number}: {example.company} {status}\n"
+            readme_content += f"- **URL**: {example.url}\n"
+            readme_content += f"- **Title**: {example.title}\n"
+            readme_content += f"- **Use Case**: {example.use_case}\n"
+            if result.success:
+                readme_content += f"- **Screenshot**: [{result.screenshot_file}](./{result.screenshot_file})\n"
             else:
-                readme_content += f"- **Error**: {example.get('error', 'Unknown error')}\n"
+                readme_content += f"- **Error**: {result.error or 'Unknown error'}\n"
             readme_content += "\n"
         
-        readme_path = folder_path / "README.md"
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        self.writer.write(folder_path / "README.md", readme_content.encode('utf-8'))
     
     def get_summary(self) -> Dict:
         """Get summary of all captures."""
         total_patterns = len(self.results)
-        total_examples = sum(len(r['examples']) for r in self.results)
-        successful = sum(1 for r in self.results for e in r['examples'] if e['success'])
+        total_examples = sum(len(r.examples) for r in self.results)
+        successful = sum(r.successful for r in self.results)
         failed = total_examples - successful
+        setup_times = [e.setup_ms for r in self.results for e in r.examples if e.setup_ms is not None]
+        reset_times = [e.reset_ms for r in self.results for e in r.examples if e.reset_ms is not None]
+        skipped = sum(1 for r in self.results for e in r.examples if e.preflight not in (None, "working", "redirected"))
         
         return {
             "total_patterns": total_patterns,
             "total_examples": total_examples,
             "successful_captures": successful,
             "failed_captures": failed,
-            "success_rate": f"{(successful/total_examples)*100:.1f}%" if total_examples > 0 else "0%"
+            "success_rate": f"{(successful/total_examples)*100:.1f}%" if total_examples > 0 else "0%",
+            "skipped_by_preflight": skipped,
+            "avg_setup_ms": round(sum(setup_times) / len(setup_times), 1) if setup_times else None,
+            "avg_reset_ms": round(sum(reset_times) / len(reset_times), 1) if reset_times else None
         }
\ No newline at end of file
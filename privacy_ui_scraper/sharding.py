@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from html_parser import PrivacyExample, PrivacyPattern
+from records import CaptureResult, PatternResults
+from capture_scheduler import CaptureScheduler
+from capture_timing import Span
+from capture_manifest import CaptureManifest
+from config import HTTP_CACHE_MODE
+from screenshot_capture import ScreenshotCapture
+
+logger = logging.getLogger(__name__)
+
+# One pattern's share of a shard: (pattern_index, pattern_number, pattern_name, [(example_index, example), ...])
+ShardPattern = Tuple[int, int, str, List[Tuple[int, PrivacyExample]]]
+
+# A worker's output: (pattern_index, folder, [(example_index, result), ...])
+ShardResult = Tuple[int, str, List[Tuple[int, CaptureResult]]]
+
+def shard_for_url(url: str, shard_count: int) -> int:
+    """Return the shard a URL belongs to.
+
+    URLs are keyed by hostname so every request to a site stays in one
+    worker, where the per-host politeness limits still apply, and a stable
+    hash keeps the assignment identical across runs.
+    """
+    key = CaptureScheduler.host_for(url) or url
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+def split_patterns(patterns: List[PrivacyPattern], shard_count: int) -> List[List[ShardPattern]]:
+    """Split every pattern's examples across `shard_count` shards."""
+    shards: List[List[ShardPattern]] = [[] for _ in range(shard_count)]
+
+    for pattern_index, pattern in enumerate(patterns):
+        buckets: Dict[int, List[Tuple[int, PrivacyExample]]] = {}
+        for example_index, example in enumerate(pattern.examples):
+            shard = shard_for_url(example.url, shard_count)
+            buckets.setdefault(shard, []).append((example_index, example))
+
+        for shard, examples in buckets.items():
+            shards[shard].append((pattern_index, pattern.pattern_number, pattern.pattern_name, examples))
+
+    return shards
+
+def run_shard(
+    output_dir: Path, shard_patterns: List[ShardPattern], reuse: bool = False, http_cache_mode: str = HTTP_CACHE_MODE
+) -> Tuple[List[ShardResult], List[Span]]:
+    """Worker process entry point: capture one shard with its own browser.
+
+    Every worker appends its finished captures to the shared manifest, and
+    returns its results with the phase spans of every capture attempt.
+    """
+    return asyncio.run(_capture_shard(output_dir, shard_patterns, reuse, http_cache_mode))
+
+async def _capture_shard(
+    output_dir: Path, shard_patterns: List[ShardPattern], reuse: bool, http_cache_mode: str
+) -> Tuple[List[ShardResult], List[Span]]:
+    manifest = CaptureManifest.load(reuse=reuse)
+    capture = ScreenshotCapture(output_dir, manifest=manifest, http_cache_mode=http_cache_mode)
+
+    async def process_pattern(pattern_index, pattern_number, pattern_name, indexed_examples):
+        results = await capture.capture_pattern_screenshots(
+            pattern_number,
+            pattern_name,
+            [example for _, example in indexed_examples],
+            save_metadata=False
+        )
+        example_indexes = [example_index for example_index, _ in indexed_examples]
+        return pattern_index, results.folder, list(zip(example_indexes, results.examples))
+
+    try:
+        await capture.initialize()
+        results = list(await asyncio.gather(
+            *(process_pattern(*pattern) for pattern in shard_patterns)
+        ))
+        return results, capture.spans
+    finally:
+        await capture.cleanup()
+
+def merge_shard_results(patterns: List[PrivacyPattern], shard_results: List[List[ShardResult]]) -> List[PatternResults]:
+    """Reassemble per-pattern results in document and example order.
+
+    There is one PatternResults per pattern in `patterns`, so callers can
+    zip them back up; patterns no worker captured (e.g. ones without
+    examples) come back empty.
+    """
+    examples_by_pattern: Dict[int, List[Tuple[int, CaptureResult]]] = {}
+    folders: Dict[int, str] = {}
+
+    for shard in shard_results:
+        for pattern_index, folder, indexed_results in shard:
+            folders[pattern_index] = folder
+            examples_by_pattern.setdefault(pattern_index, []).extend(indexed_results)
+
+    merged = []
+    for pattern_index, pattern in enumerate(patterns):
+        indexed_results = sorted(examples_by_pattern.get(pattern_index, []), key=lambda item: item[0])
+        merged.append(PatternResults(
+            pattern_number=pattern.pattern_number,
+            pattern_name=pattern.pattern_name,
+            folder=folders.get(pattern_index) or ScreenshotCapture.folder_name_for(
+                pattern.pattern_number, pattern.pattern_name
+            ),
+            examples=tuple(result for _, result in indexed_results)
+        ))
+
+    return merged
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""Check that artifact writes are coalesced, batched, atomic and surface errors on flush."""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+from artifact_writer import ArtifactWriter
+
+def test_writes_are_coalesced():
+    """A burst of writes lands as one batch holding the latest content per file, with no temp files left."""
+    async def test(folder):
+        writer = ArtifactWriter(delay=0.05)
+        for version in range(20):
+            writer.write(folder / "metadata.json", f'{{"version": {version}}}'.encode())
+            writer.write(folder / "README.md", f"# v{version}\n".encode())
+        assert not (folder / "metadata.json").exists()  # Nothing touches the disk inside the burst
+
+        await asyncio.sleep(0.2)
+        assert writer.batches == 1 and writer.files_written == 2
+        assert (folder / "metadata.json").read_bytes() == b'{"version": 19}'
+        assert (folder / "README.md").read_text() == "# v19\n"
+        assert sorted(path.name for path in folder.iterdir()) == ["README.md", "metadata.json"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(test(Path(tmp)))
+
+def test_flush_waits_for_disk():
+    """flush() writes whatever is queued without waiting out the delay."""
+    async def test(folder):
+        writer = ArtifactWriter(delay=60)
+        writer.write(folder / "summary.json", b"{}")
+        await writer.flush()
+        assert (folder / "summary.json").read_bytes() == b"{}"
+        await writer.flush()  # Nothing queued: no empty batch
+        assert writer.batches == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(test(Path(tmp)))
+
+def test_flush_raises_write_errors():
+    """A failed write is raised from flush(); the rest of the batch, and writes queued meanwhile, are still written."""
+    async def test(folder):
+        writer = ArtifactWriter(delay=60)
+        writer.write(folder / "missing" / "metadata.json", b"{}")
+        writer.write(folder / "index.html", b"<html></html>")
+        flushing = asyncio.ensure_future(writer.flush())
+        await asyncio.sleep(0)  # The first batch is on its way to disk
+        writer.write(folder / "summary.json", b"{}")
+        try:
+            await flushing
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("the failed write must be raised")
+        assert (folder / "index.html").read_bytes() == b"<html></html>"
+        assert (folder / "summary.json").read_bytes() == b"{}"
+        assert writer.batches == 2 and writer.files_written == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(test(Path(tmp)))
+
+if __name__ == "__main__":
+    for test in [test_writes_are_coalesced, test_flush_waits_for_disk, test_flush_raises_write_errors]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""Check the offline fixture site and the capture benchmark scoring."""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from benchmark_capture import build_report, compare_blocking
+from capture_fixtures import FIXTURES, Fixture, fixture_server, recorded_fixtures
+from html_parser import PrivacyExample
+from records import CaptureResult
+from url_validator import UrlPreflight
+
+EXPECTED_PREFLIGHT = {
+    "not_found": "broken",
+    "login_wall": "auth_required",
+    "bot_wall": "inconclusive",  # The browser gets to try; its verdict fails the page
+}
+
+def test_fixture_pages():
+    """Every fixture is served offline, and pre-flight sorts the error pages correctly."""
+    async def test():
+        with tempfile.TemporaryDirectory() as tmp:
+            recorded_dir = Path(tmp)
+            (recorded_dir / "ico.html").write_text("<html><title>ICO</title></html>", encoding='utf-8')
+            (recorded_dir / "expectations.json").write_text(json.dumps({"ico": {"banner": False}}), encoding='utf-8')
+            fixtures = FIXTURES + recorded_fixtures(recorded_dir)
+            assert fixtures[-1] == Fixture("recorded_ico", "/recorded/ico", True, False, "Recorded page ico.html")
+
+            async with fixture_server(recorded_dir) as base_url:
+                preflight = UrlPreflight()
+                await preflight.start()
+                try:
+                    for fixture in fixtures:
+                        check = await preflight.check(base_url + fixture.path)
+                        print(f"  {fixture.name:<16} -> {check['category']} ({check['status']})")
+                        assert check["category"] == EXPECTED_PREFLIGHT.get(fixture.name, "working"), fixture
+                finally:
+                    await preflight.close()
+    asyncio.run(test())
+
+def test_build_report():
+    """Outcome and banner accuracy, throughput and latency percentiles per fixture."""
+    fixtures = [
+        Fixture("banner", "/banner", True, True, ""),
+        Fixture("missing", "/missing", False, False, ""),
+    ]
+    example = PrivacyExample(1, "Acme", "https://acme.example", "", "")
+
+    def result(success, banner, goto_ms):
+        return CaptureResult(
+            example, None, "", success,
+            banner_selector='[id*="cookie"]' if banner else None,
+            phases_ms={"goto": goto_ms, "write": 1.0},
+            blocked_requests=1, blocked_by_reason={"media": 1}, allowed_requests=5, allowed_bytes=1000
+        )
+
+    results = [
+        result(True, True, 100.0), result(False, False, 10.0),  # Run 1: both right
+        result(True, False, 300.0), result(True, False, 20.0),  # Run 2: banner missed, error page captured
+    ]
+    report = build_report(fixtures, results, wall_seconds=2.0, settings={"repeat": 2})
+    print(f"  {json.dumps({k: report[k] for k in ('throughput_per_min', 'latency', 'banner_accuracy')})}")
+
+    assert report["captures"] == 4
+    assert report["throughput_per_min"] == 120.0
+    assert report["outcome_accuracy"] == 0.75
+    assert report["banner_accuracy"] == 0.75
+    assert report["latency"] == {"count": 4, "p50_ms": 61.0, "p95_ms": 271.0, "max_ms": 301.0}
+    assert report["fixtures"]["banner"]["banner_accuracy"] == 0.5
+    assert report["fixtures"]["missing"]["outcome_accuracy"] == 0.5
+    assert report["phase_timings"]["goto"]["count"] == 4
+    assert report["transfer"] == {
+        "captures": 4, "allowed_requests": 20, "allowed_bytes": 4000, "bytes_per_capture": 1000,
+        "blocked_requests": 4, "blocked_by_reason": {"media": 4}
+    }
+
+def test_compare_blocking():
+    """The blocking comparison reports bytes and latency saved against a run without blocking."""
+    fixtures = [Fixture("video", "/video", True, True, "")]
+    example = PrivacyExample(1, "Acme", "https://acme.example", "", "")
+
+    def report(blocked, allowed_bytes, goto_ms):
+        result = CaptureResult(
+            example, None, "", True, banner_selector='[id*="cookie"]', phases_ms={"goto": goto_ms},
+            blocked_requests=blocked, blocked_by_reason={"media": blocked} if blocked else {},
+            allowed_requests=3, allowed_bytes=allowed_bytes
+        )
+        return build_report(fixtures, [result], wall_seconds=1.0, settings={})
+
+    comparison = compare_blocking(report(1, 50_000, 400.0), report(0, 4_050_000, 900.0))
+    print(f"  saved: {comparison['saved']}")
+    assert comparison["saved"] == {"bytes_per_capture": 4_000_000, "p50_ms": 500.0, "p95_ms": 500.0}
+    assert comparison["blocking"]["bytes_per_capture"] == 50_000
+    assert comparison["blocked_by_reason"] == {"media": 1}
+
+if __name__ == "__main__":
+    for test in [test_fixture_pages, test_build_report, test_compare_blocking]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
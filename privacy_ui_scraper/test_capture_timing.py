@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+"""Check per-phase capture timing, its percentiles and the Chrome trace export."""
+
+import asyncio
+import json
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from capture_timing import PHASES, PhaseTimer, percentile, summarize_phases, write_chrome_trace
+from config import BANNER_RELOAD_TIMEOUT, BANNER_TIMEOUT
+from html_parser import PrivacyExample
+from metadata_manager import MetadataManager
+from records import CaptureResult, PatternResults
+from screenshot_capture import ScreenshotCapture
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+
+class FakeRequest:
+    url = "https://acme.example/video.mp4"
+
+    async def sizes(self):
+        await asyncio.sleep(0.01)
+        return {"responseHeadersSize": 200, "responseBodySize": 4_000_000}
+
+class FakePage:
+    """Just enough of a Playwright page; the banner only shows up after a reload."""
+
+    def __init__(self, title="Privacy settings"):
+        self.page_title = title
+        self.reloaded = False
+        self.banner_timeouts = []
+        self.routes = []
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+    async def goto(self, url, **options):
+        await asyncio.sleep(0.02)
+        return type("Response", (), {"status": 200})()
+
+    async def evaluate(self, script, options):
+        if "maxChars" in options:  # page_verdict's signals
+            return {"title": self.page_title, "url": "https://acme.example/", "text": "", "password_field": False}
+        self.banner_timeouts.append(options["timeout"])
+        await asyncio.sleep(0.01)
+        return {"selector": '[id*="cookie"]', "elapsed_ms": 10.0} if self.reloaded else None
+
+    async def reload(self, **options):
+        self.reloaded = True
+
+    async def content(self):
+        raise AssertionError("the error check must not serialize the DOM")
+
+    async def screenshot(self, **options):
+        self.listeners["requestfinished"](FakeRequest())  # Finished long after navigation
+        return PNG
+
+    def locator(self, selector):
+        return self  # page.locator(...).first
+
+    @property
+    def first(self):
+        return self
+
+    async def bounding_box(self):
+        return {"width": 10, "height": 10}  # Too small, so the viewport is captured
+
+    async def close(self):
+        pass
+
+class FakePool:
+    def __init__(self, page):
+        self.page = page
+
+    @asynccontextmanager
+    async def acquire(self):
+        context = type("Context", (), {})()
+
+        async def new_page():
+            return self.page
+        context.new_page = new_page
+        yield context
+        await asyncio.sleep(0.01)  # The reset on release
+
+def _capture(page, folder, **options):
+    capture = ScreenshotCapture(folder, validate=False, **options)
+    capture.context_pool = FakePool(page)
+    return capture, asyncio.run(capture._capture_attempt("https://acme.example", "shot.png", folder, 1, "element"))
+
+def test_phases_recorded():
+    """A capture records a span for every phase, and writes the PNG Playwright returned."""
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        page = FakePage()
+        capture, outcome = _capture(page, folder, block_resources=False)
+        assert outcome == (True, "Success")
+        assert page.banner_timeouts == [BANNER_TIMEOUT, BANNER_RELOAD_TIMEOUT]
+        assert (folder / "shot.png").read_bytes() == PNG
+        assert [path.name for path in folder.iterdir()] == ["shot.png"]  # Written atomically, no temp file left
+
+        stats = capture.capture_stats[str(folder / "shot.png")]
+        print(f"  phases: {stats['phases_ms']}")
+        assert list(stats["phases_ms"]) == PHASES
+        assert stats["phases_ms"]["goto"] >= 20
+        assert stats["goto_ms"] == stats["phases_ms"]["goto"]
+        assert stats["reset_ms"] == stats["phases_ms"]["reset"] >= 10
+        assert [span.phase for span in capture.spans].count("banner_wait") == 2
+        assert [span.phase for span in capture.spans].count("error_check") == 2
+        assert stats["verdict"] == "ok"
+
+        # Error pages stop at the first check, without waiting for a banner
+        capture, outcome = _capture(FakePage(title="Page not found"), folder, block_resources=False)
+        assert outcome == (False, 'Error page (not_found): "not found" in title')
+        stats = capture.capture_stats[str(folder / "shot.png")]
+        assert list(stats["phases_ms"]) == ["context", "goto", "error_check", "reset"]
+        assert stats["verdict"] == "not_found"
+
+def test_transfer_counted_on_release():
+    """Requests finishing after navigation are counted, with their transferred size, before the page is released."""
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        page = FakePage()
+        capture, outcome = _capture(page, folder)
+        assert outcome == (True, "Success")
+        assert page.routes == ["**/*"]
+        stats = capture.capture_stats[str(folder / "shot.png")]
+        print(f"  allowed: {stats['allowed_requests']} requests, {stats['allowed_bytes']:,} bytes")
+        assert stats["allowed_requests"] == 1
+        assert stats["allowed_bytes"] == 4_000_200
+        assert stats["blocked_requests"] == 0 and stats["blocked_by_reason"] == {}
+
+        # Blocking off still counts, so runs with and without it can be compared
+        page = FakePage()
+        capture, _ = _capture(page, folder, block_resources=False)
+        assert page.routes == []
+        assert capture.capture_stats[str(folder / "shot.png")]["allowed_bytes"] == 4_000_200
+
+def test_summary_percentiles():
+    """summary.json and index.html get p50/p95 per phase across every example."""
+    assert percentile([1, 2, 3, 4], 0.5) == 2.5
+    assert percentile([7], 0.95) == 7
+
+    example = PrivacyExample(1, "Acme", "https://acme.example", "Banner", "GDPR")
+    results = PatternResults(1, "Cookie Consent Banners", "01_Cookie_Consent_Banners", tuple(
+        CaptureResult(example, "shot.png", "2025-01-01T00:00:00", True, phases_ms={"goto": float(ms), "write": 1.0})
+        for ms in range(1, 101)
+    ) + (CaptureResult(example, None, "2025-01-01T00:00:00", False),))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = MetadataManager(Path(tmp))
+        manager.rebuild_summary([results])
+        manager.rebuild_summary([results])  # Rebuilding must not double-count samples
+
+        async def write():
+            manager.write_summary_files()
+            await manager.flush()
+
+        asyncio.run(write())
+        summary = json.loads((Path(tmp) / "summary.json").read_text(encoding='utf-8'))
+        index_html = (Path(tmp) / "index.html").read_text(encoding='utf-8')
+
+    print(f"  phase_timings: {summary['phase_timings']}")
+    assert summary["phase_timings"] == {
+        "goto": {"count": 100, "p50_ms": 50.5, "p95_ms": 95.0},
+        "write": {"count": 100, "p50_ms": 1.0, "p95_ms": 1.0}
+    }
+    assert "<td>goto</td><td>100</td><td>50 ms</td><td>95 ms</td>" in index_html
+
+def test_chrome_trace():
+    """Spans export as complete ("X") trace events, one named track per screenshot."""
+    spans = []
+    for label in ("a.png", "b.png"):
+        timer = PhaseTimer(label, f"https://{label}.example", attempt=2)
+        for phase in ("goto", "screenshot"):
+            with timer.span(phase):
+                pass
+        spans.extend(timer.spans)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.json"
+        assert write_chrome_trace(spans, path) == 4
+        trace = json.loads(path.read_text(encoding='utf-8'))
+
+    events = trace["traceEvents"]
+    names = {event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert sorted(names.values()) == ["a.png", "b.png"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in complete if names[event["tid"]] == "a.png"] == ["goto", "screenshot"]
+    assert all(event["args"]["attempt"] == 2 and event["dur"] >= 0 for event in complete)
+    assert [event["ts"] for event in complete] == sorted(event["ts"] for event in complete)
+
+def test_summarize_phases_order():
+    """Phases are reported in capture order, with unknown phases last."""
+    summary = summarize_phases({"write": [1.0], "extra": [2.0], "goto": [3.0], "reload": []})
+    assert list(summary) == ["goto", "write", "extra"]
+
+if __name__ == "__main__":
+    for test in [test_phases_recorded, test_transfer_counted_on_release, test_summary_percentiles, test_chrome_trace, test_summarize_phases_order]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
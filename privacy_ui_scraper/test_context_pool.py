@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""Check that the context pool keeps its size when contexts can't be reset or replaced."""
+
+import asyncio
+
+from context_pool import ContextPool
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+
+    def on(self, event, handler):
+        pass
+
+    async def clear_cookies(self):
+        if self.browser.broken_resets:
+            self.browser.broken_resets -= 1
+            raise RuntimeError("Target page, context or browser has been closed")
+
+    async def clear_permissions(self):
+        pass
+
+    async def grant_permissions(self, permissions):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    """Creates contexts, except while `failing_creates` is non-zero."""
+
+    def __init__(self):
+        self.broken_resets = 0
+        self.failing_creates = 0
+        self.created = 0
+
+    async def new_context(self, **options):
+        if self.failing_creates:
+            self.failing_creates -= 1
+            raise RuntimeError("Browser has been closed")
+        self.created += 1
+        return FakeContext(self)
+
+def test_failed_replacement_keeps_the_slot():
+    """A context that can't be reset or replaced leaves an empty slot that the next borrower fills."""
+    async def test():
+        browser = FakeBrowser()
+        pool = ContextPool(browser, size=1)
+        await pool.start()
+
+        browser.broken_resets, browser.failing_creates = 1, 1
+        async with pool.acquire() as first:
+            pass
+        assert first.closed and pool._idle.qsize() == 1
+
+        # The next borrower can't get a context yet either, and must not take the slot with it
+        browser.failing_creates = 1
+        try:
+            async with pool.acquire():
+                raise AssertionError("no context to borrow")
+        except RuntimeError as e:
+            assert "Browser has been closed" in str(e)
+        assert pool._idle.qsize() == 1
+
+        async with pool.acquire() as context:
+            assert context is not first and not context.closed
+        async with asyncio.timeout(1):  # Would wait forever if the slot had been lost
+            async with pool.acquire() as again:
+                assert again is context
+        print(f"  contexts created: {browser.created}")
+        assert browser.created == 2
+        await pool.close()
+
+    asyncio.run(test())
+
+if __name__ == "__main__":
+    for test in [test_failed_replacement_keeps_the_slot]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
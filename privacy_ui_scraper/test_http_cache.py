@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+"""Check that the HTTP cache records responses and replays them without network."""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+from capture_scheduler import CaptureScheduler
+from html_parser import PrivacyExample
+from http_cache import HttpCache, request_key
+from screenshot_capture import ScreenshotCapture
+
+class FakeRequest:
+    def __init__(self, url, method="GET", post_data_buffer=None):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = post_data_buffer
+
+class FakeResponse:
+    """What route.fetch() returns: the network response."""
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+class FakeRoute:
+    """Records what the cache did with the request."""
+
+    def __init__(self, network=None):
+        self.network = network
+        self.outcome = None
+
+    async def fetch(self):
+        if self.network is None:
+            raise RuntimeError("net::ERR_NAME_NOT_RESOLVED")
+        return self.network
+
+    async def fulfill(self, response=None, status=None, headers=None, body=None):
+        self.outcome = ("fulfill", response.status if response else status, headers, body)
+
+    async def abort(self, error_code=None):
+        self.outcome = ("abort", error_code)
+
+    async def fallback(self):
+        self.outcome = ("fallback",)
+
+PAGE = b"<html><body><div id='cookie-banner'>We use cookies</div></body></html>"
+
+def test_record_then_replay():
+    """Recorded responses replay byte for byte from a fresh load; misses are aborted."""
+    async def test(cache_dir):
+        recorder = HttpCache.load(cache_dir, "record")
+        headers = {"content-type": "text/html", "content-encoding": "gzip", "content-length": "123"}
+        for url in ("https://news.example/", "https://news.example/?utm_source=feed", "https://mirror.example/"):
+            route = FakeRoute(FakeResponse(200, headers, PAGE))
+            await recorder._handle_route(route, FakeRequest(url))
+            assert route.outcome[:2] == ("fulfill", 200)
+        post = FakeRoute(FakeResponse(201, {}, b"{}"))
+        await recorder._handle_route(post, FakeRequest("https://news.example/api", "POST", b'{"consent": true}'))
+
+        # Network failures aren't recorded; the browser retries the request itself
+        failed = FakeRoute()
+        await recorder._handle_route(failed, FakeRequest("https://gone.example/"))
+        assert failed.outcome == ("fallback",)
+        assert recorder.get_stats() == {"mode": "record", "hits": 0, "misses": 0, "recorded": 4}
+
+        # Identical bodies are stored once
+        blobs = [path for path in (cache_dir / "blobs").rglob("*") if path.is_file()]
+        assert len(blobs) == 2
+
+        replayer = HttpCache.load(cache_dir, "replay")
+        assert len(replayer.entries) == 4
+        for url in ("https://news.example/", "https://news.example/#consent", "https://news.example/?cb=1697"):
+            route = FakeRoute()
+            await replayer._handle_route(route, FakeRequest(url))
+            assert route.outcome == ("fulfill", 200, {"content-type": "text/html"}, PAGE), url
+
+        route = FakeRoute()
+        await replayer._handle_route(route, FakeRequest("https://news.example/api", "POST", b'{"consent": true}'))
+        assert route.outcome[:2] == ("fulfill", 201)
+        for request in (FakeRequest("https://news.example/api", "POST", b'{"consent": false}'),
+                        FakeRequest("https://gone.example/")):
+            route = FakeRoute()
+            await replayer._handle_route(route, request)
+            assert route.outcome == ("abort", "internetdisconnected"), request.url
+        print(f"  {replayer.get_stats()}")
+        assert replayer.get_stats() == {"mode": "replay", "hits": 4, "misses": 2, "recorded": 0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(test(Path(tmp) / "http"))
+
+def test_index_last_line_wins():
+    """A re-recorded response replaces the old one, and broken index lines are skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(Path(tmp), "record")
+        cache.store("GET", "https://news.example/", None, 200, {}, b"old")
+        with open(cache.index_path, 'ab') as f:
+            f.write(b'{"truncated\n')
+        cache.store("get", "https://news.example/", None, 200, {}, b"new")
+
+        entry = HttpCache.load(Path(tmp), "replay").lookup("GET", "https://news.example/")
+        assert entry["key"] == request_key("GET", "https://news.example/")
+        assert cache.blob_path(entry["body"]).read_bytes() == b"new"
+
+def test_replay_follows_preflight_redirects():
+    """A URL that pre-flight saw redirect is recorded at its final address and replays from the original."""
+    site = {"https://moved.example/home": FakeResponse(200, {"content-type": "text/html"}, PAGE)}
+
+    class FakePreflight:
+        async def check(self, url):
+            return {"category": "redirected", "status": 200, "final_url": "https://moved.example/home"}
+
+    async def attempt(url, filename, folder_path, attempt, capture_mode):
+        # Stands in for page.goto(): the document request goes through the cache's route
+        route = FakeRoute(site.get(url))
+        await capture.http_cache._handle_route(route, FakeRequest(url))
+        capture.capture_stats[str(folder_path / filename)] = {"http_status": route.outcome[1]}
+        if route.outcome[0] != "fulfill":
+            capture.capture_stats[str(folder_path / filename)]["failure"] = "offline"
+            return False, "net::ERR_INTERNET_DISCONNECTED"
+        return True, "Success"
+
+    example = PrivacyExample(1, "Moved", "https://moved.example/", "", "")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("record", "replay"):
+            capture = ScreenshotCapture(Path(tmp) / mode, scheduler=CaptureScheduler(host_delay=0), validate=False)
+            capture.http_cache = HttpCache.load(Path(tmp) / "http", mode)
+            if mode == "record":
+                capture.preflight = FakePreflight()
+            capture._capture_attempt = attempt
+            result = asyncio.run(capture._capture_example(example, "01_Redirects"))
+            print(f"  {mode}: success={result.success}, final_url={result.final_url}")
+            assert (result.success, result.final_url) == (True, "https://moved.example/home"), mode
+        assert capture.http_cache.get_stats()["hits"] == 1
+
+if __name__ == "__main__":
+    for test in [test_record_then_replay, test_index_last_line_wins, test_replay_follows_preflight_redirects]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""Test perceptual hashing, duplicate clustering and blank-page scoring on generated images."""
+
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from image_analysis import analyze_images, find_duplicate_clusters, classify_entropy, screenshot_paths
+from tiled_capture import tile_dir_for
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+def _page(seed: int) -> Image.Image:
+    """A busy, page-like image with blocks of colour and noise."""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(270, 480, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels)
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.integers(0, 400), rng.integers(0, 200)
+        draw.rectangle([x, y, x + 80, y + 60], fill=tuple(int(c) for c in rng.integers(0, 256, 3)))
+    return image
+
+def _write_images(folder: Path) -> dict:
+    paths = {
+        "page": folder / "page.png",
+        "page_copy": folder / "copy" / "page.png",
+        "page_resized": folder / "page_resized.png",
+        "other": folder / "other.png",
+        "blank": folder / "blank.png",
+    }
+    paths["page_copy"].parent.mkdir()
+    _page(1).save(paths["page"])
+    _page(1).save(paths["page_copy"])
+    _page(1).resize((960, 540)).save(paths["page_resized"])
+    _page(2).save(paths["other"])
+    Image.new("RGB", (480, 270), "white").save(paths["blank"])
+    return paths
+
+def test_duplicates_and_blank_pages():
+    """Copies and resized copies cluster together; a blank page is flagged."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_images(Path(tmp))
+        records = analyze_images(list(paths.values()), workers=2)
+        by_name = dict(zip(paths, records))
+
+        clusters = find_duplicate_clusters(records)
+        names = [sorted(name for name, path in paths.items() if str(path) in {r["path"] for r in cluster}) for cluster in clusters]
+        print(f"  clusters: {names}")
+        assert names == [["page", "page_copy", "page_resized"]]
+
+        for name, record in by_name.items():
+            print(f"  {name:<13} entropy {record['entropy']:.2f} -> {record['verdict']}")
+        assert by_name["blank"]["verdict"] == "blank"
+        assert by_name["page"]["verdict"] == "ok"
+        assert by_name["page"]["dhash"] == by_name["page_copy"]["dhash"]
+
+def test_palette_screenshot():
+    """Large palette-mode PNGs are downscaled and hashed like RGB ones, not reported unreadable."""
+    with tempfile.TemporaryDirectory() as tmp:
+        rgb_path, palette_path = Path(tmp) / "rgb.png", Path(tmp) / "palette.png"
+        page = _page(3).resize((1400, 3000))
+        page.save(rgb_path)
+        page.convert("P", palette=Image.ADAPTIVE).save(palette_path)
+        rgb, palette = analyze_images([rgb_path, palette_path], workers=1)
+        print(f"  palette: {palette.get('verdict')} {palette.get('error', '')}")
+        assert "error" not in palette and palette["verdict"] == "ok"
+        assert (palette["width"], palette["height"]) == (1400, 3000)
+        assert find_duplicate_clusters([rgb, palette]) != []
+
+def test_unreadable_file_is_reported():
+    """A corrupt PNG is reported instead of crashing the worker pool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        broken = Path(tmp) / "broken.png"
+        broken.write_bytes(b"not a png")
+        records = analyze_images([broken], workers=1)
+        print(f"  {records[0]}")
+        assert "error" in records[0]
+        assert find_duplicate_clusters(records) == []
+
+def test_entropy_thresholds():
+    """Entropy and background share map to the expected verdicts."""
+    assert classify_entropy(0.2, 0.5) == "blank"
+    assert classify_entropy(4.0, 0.995) == "blank"
+    assert classify_entropy(1.5, 0.8) == "error_like"
+    assert classify_entropy(5.0, 0.3) == "ok"
+
+def test_unstitched_strips_are_skipped():
+    """Strips kept next to an unstitched full-page capture aren't analyzed as screenshots."""
+    with tempfile.TemporaryDirectory() as tmp:
+        screenshot = Path(tmp) / "01_Cookie_Consent_Banners" / "example_1_Acme.png"
+        tile_dir = tile_dir_for(screenshot)
+        tile_dir.mkdir(parents=True)
+        for path in (screenshot, tile_dir / "tile_000.png", tile_dir / "tile_001.png"):
+            path.write_bytes(b"png")
+        assert screenshot_paths(Path(tmp)) == [screenshot]
+
+if __name__ == "__main__":
+    for test in [
+        test_duplicates_and_blank_pages, test_palette_screenshot, test_unreadable_file_is_reported, test_entropy_thresholds,
+        test_unstitched_strips_are_skipped
+    ]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""Test the PNG optimization and derivative stage on a generated pattern folder."""
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from image_derivatives import build_derivatives
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+def _make_pattern(output_dir: Path) -> Path:
+    folder = output_dir / "01_Test"
+    folder.mkdir()
+    examples = []
+    for number in (1, 2):
+        image = Image.new("RGB", (1200, 800), "white")
+        ImageDraw.Draw(image).rectangle([100, 100 * number, 900, 300 * number], fill=(30, 90, 200))
+        image.save(folder / f"example_{number}.png", compress_level=0)
+        examples.append({"example_number": number, "screenshot_file": f"example_{number}.png", "success": True})
+    examples.append({"example_number": 3, "screenshot_file": None, "success": False})
+    with open(folder / "metadata.json", "w") as f:
+        json.dump({"pattern_number": 1, "folder": folder.name, "examples": examples}, f)
+    return folder
+
+def _metadata(folder: Path) -> dict:
+    with open(folder / "metadata.json") as f:
+        return json.load(f)
+
+def test_derivatives_are_incremental():
+    """Derivatives are written and recorded once, and redone only when the PNG changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        folder = _make_pattern(output_dir)
+
+        stats = build_derivatives(output_dir, workers=2)
+        print(f"  first run: {stats}")
+        assert stats["processed"] == 2 and stats["skipped"] == 0
+        assert stats["png_bytes_after"] < stats["png_bytes_before"]
+
+        entry = _metadata(folder)["examples"][0]["derivatives"]
+        assert (folder / entry["webp"]["file"]).exists()
+        assert entry["thumbnail"]["width"] == 480 and entry["thumbnail"]["height"] == 320
+        assert "derivatives" not in _metadata(folder)["examples"][2]
+
+        # A capture run rewrites metadata.json without the entries
+        metadata = _metadata(folder)
+        for example in metadata["examples"]:
+            example.pop("derivatives", None)
+        with open(folder / "metadata.json", "w") as f:
+            json.dump(metadata, f)
+
+        stats = build_derivatives(output_dir, workers=2)
+        print(f"  second run: {stats}")
+        assert stats["processed"] == 0 and stats["skipped"] == 2
+        assert _metadata(folder)["examples"][0]["derivatives"] == entry
+
+        Image.new("RGB", (600, 400), "black").save(folder / "example_2.png")
+        stats = build_derivatives(output_dir, workers=2)
+        print(f"  after recapture: {stats}")
+        assert stats["processed"] == 1 and stats["skipped"] == 1
+
+if __name__ == "__main__":
+    for test in [test_derivatives_are_incremental]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
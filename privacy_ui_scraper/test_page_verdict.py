@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""Check the in-page error verdict on the signals a page hands back."""
+
+import asyncio
+
+from page_verdict import classify_verdict, page_verdict
+
+def _signals(title="Daily News", url="https://news.example/article", text="", password_field=False):
+    return {"title": title, "url": url, "text": text, "password_field": password_field}
+
+def test_classify_verdict():
+    """HTTP status first, then bot walls, login walls and not-found markers."""
+    cases = [
+        (200, _signals(text="We use cookies. Accept all"), "ok"),
+        (200, _signals(text="Error 404 is a famous status code, see our guide"), "ok"),  # "404" only counts in the title
+        (404, _signals(), "not_found"),
+        (410, _signals(), "not_found"),
+        (401, _signals(), "login_wall"),
+        (403, _signals(), "blocked"),
+        (503, _signals(), "blocked"),
+        (None, _signals(), "ok"),
+        (200, _signals(title="404 - Page Not Found"), "not_found"),
+        (200, _signals(text="Sorry, this page doesn't exist."), "not_found"),
+        (200, _signals(title="Sign in", text="Sign in required to view this page."), "login_wall"),
+        (200, _signals(title="Welcome", url="https://news.example/account/login?next=/"), "login_wall"),
+        (200, _signals(title="Ad settings", url="https://adssettings.google.com/authenticated"), "ok"),
+        (200, _signals(title="Jane Doe", url="https://news.example/author/jane-doe"), "ok"),
+        (200, _signals(title="Log in | News", password_field=True), "login_wall"),
+        (200, _signals(title="Daily News", password_field=True), "ok"),  # Header login box on a normal page
+        (200, _signals(title="Just a moment...", text="Verify you are human by completing the action below."), "blocked"),
+        (200, _signals(title="Access Denied"), "blocked"),
+    ]
+    for status, signals, expected in cases:
+        verdict = classify_verdict(status, signals)
+        print(f"  {status} {signals['title']!r:<24} -> {verdict['verdict']} ({verdict['reason']})")
+        assert verdict["verdict"] == expected, (status, signals, verdict)
+        assert (verdict["reason"] is None) == (expected == "ok")
+
+def test_unreadable_page():
+    """A page that can't be evaluated is judged on its HTTP status alone."""
+    class ClosedPage:
+        async def evaluate(self, script, options):
+            raise RuntimeError("Execution context was destroyed")
+
+    assert asyncio.run(page_verdict(ClosedPage(), 200))["verdict"] == "ok"
+    assert asyncio.run(page_verdict(ClosedPage(), 404)) == {"verdict": "not_found", "reason": "HTTP 404", "title": ""}
+
+if __name__ == "__main__":
+    for test in [test_classify_verdict, test_unreadable_page]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+"""Test the section-level changeset between two parses."""
+
+import copy
+import json
+import logging
+
+from parse_diff import diff_parses
+from config import OUTPUT_DIR
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+def _example(number, url, title="Title"):
+    return {"example_number": number, "company": "Acme", "url": url, "title": title, "use_case": ""}
+
+PREVIOUS = {
+    "patterns": [
+        {"pattern_number": 1, "pattern_name": "Cookie Banners", "description": "",
+         "examples": [_example(1, "https://a.example"), _example(2, "https://b.example")]},
+        {"pattern_number": 2, "pattern_name": "Privacy Settings", "description": "",
+         "examples": [_example(1, "https://c.example")]},
+        {"pattern_number": 3, "pattern_name": "Data Access", "description": "",
+         "examples": [_example(1, "https://d.example")]},
+    ]
+}
+
+def test_changeset():
+    """Added, removed and modified patterns and examples are reported; the rest is unchanged."""
+    current = copy.deepcopy(PREVIOUS)
+    banners = current["patterns"][0]
+    banners["examples"][0]["title"] = "New title"
+    banners["examples"][1]["url"] = "https://b2.example"
+    banners["examples"].append(_example(3, "https://e.example"))
+    del current["patterns"][2]
+    current["patterns"].append({"pattern_number": 4, "pattern_name": "Child Privacy", "description": "",
+                                "examples": [_example(1, "https://f.example")]})
+
+    changeset = diff_parses(PREVIOUS, current)
+    print(f"  {changeset.summary()}")
+
+    assert changeset.added_patterns == ["4|Child Privacy"]
+    assert changeset.removed_patterns == ["3|Data Access"]
+    assert changeset.unchanged_patterns == ["2|Privacy Settings"]
+    [change] = changeset.modified_patterns
+    assert change.pattern == "1|Cookie Banners"
+    assert change.modified_examples == ["1|https://a.example"]
+    assert change.added_examples == ["2|https://b2.example", "3|https://e.example"]
+    assert change.removed_examples == ["2|https://b.example"]
+
+def test_reordering_and_first_run():
+    """Moving sections is not a change; with no previous parse everything is added."""
+    reordered = {"patterns": list(reversed(PREVIOUS["patterns"]))}
+    assert diff_parses(PREVIOUS, reordered).is_empty
+    assert len(diff_parses(None, PREVIOUS).added_patterns) == 3
+
+def test_real_parse_is_unchanged():
+    """Re-diffing the committed parsed_data.json against itself finds no changes."""
+    parsed_data_path = OUTPUT_DIR / "parsed_data.json"
+    if not parsed_data_path.exists():
+        print(f"  No {parsed_data_path}, skipping")
+        return
+    with open(parsed_data_path, encoding='utf-8') as f:
+        data = json.load(f)
+    changeset = diff_parses(data, copy.deepcopy(data))
+    print(f"  {changeset.summary()}")
+    assert changeset.is_empty
+    assert len(changeset.unchanged_patterns) == len(data["patterns"])
+
+if __name__ == "__main__":
+    for test in [test_changeset, test_reordering_and_first_run, test_real_parse_is_unchanged]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
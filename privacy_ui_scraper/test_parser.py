@@ -3,6 +3,9 @@
 """Test script to verify HTML parser functionality."""
 
 import logging
+import shutil
+import tempfile
+import time
 from pathlib import Path
 from html_parser import PrivacyPatternParser
 from config import HTML_PATH
@@ -59,5 +62,93 @@ def test_parser():
         import traceback
         traceback.print_exc()
 
+def test_parse_cache():
+    """A cached parse matches a fresh one and is invalidated when the file changes."""
+    if not HTML_PATH.exists():
+        print(f"ERROR: HTML file not found at {HTML_PATH}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "cache"
+        html_path = Path(tmp) / HTML_PATH.name
+        shutil.copy(HTML_PATH, html_path)
+        
+        fresh = PrivacyPatternParser(html_path, use_cache=False).parse()
+        cold = PrivacyPatternParser(html_path, cache_dir=cache_dir).parse()
+        cache_files = list(cache_dir.iterdir())
+        warm_parser = PrivacyPatternParser(html_path, cache_dir=cache_dir)
+        
+        def must_not_parse(*args):
+            raise AssertionError("a cache hit must not parse")
+        # Every backend's parse path, so the check holds whichever one is configured
+        for method in ("_parse_structured_lxml", "_parse_structured_html", "_parse_text_lines"):
+            setattr(warm_parser, method, must_not_parse)
+        warm = warm_parser.parse()
+        
+        print(f"Cache files after first parse: {[p.name for p in cache_files]}")
+        assert len(cache_files) == 1
+        assert fresh == cold == warm
+        
+        # Any edit to the document changes its hash, so the old entry is replaced
+        with open(html_path, 'a', encoding='utf-8') as f:
+            f.write("<!-- edited -->")
+        edited = PrivacyPatternParser(html_path, cache_dir=cache_dir).parse()
+        assert edited == fresh
+        assert [p.name for p in cache_dir.iterdir()] != [p.name for p in cache_files]
+        assert len(list(cache_dir.iterdir())) == 1
+
+TEXT_DOCUMENT = """<html><body><pre>
+1. Cookie Consent Banners
+Banners that ask for consent before any cookie is set.
+
+1 | Acme Corp https://acme.example/privacy | Banner | GDPR | Clear choices | Yes | H1, H3
+2 | Beta Ltd https://beta.example | Modal | CCPA | Granular | Partly | H5
+2. Privacy Dashboards
+1 | Gamma https://gamma.example | Dashboard | Overview
+3 | Delta <b>Inc</b> https://delta.example/settings | Settings | Toggle
+3. Just-in-Time Notices
+4 Epsilon location prompt https://epsilon.example/location
+</pre></body></html>"""
+
+def test_text_fallback():
+    """Documents without headed tables go through the streaming text parser."""
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = Path(tmp) / "plain.html"
+        html_path.write_text(TEXT_DOCUMENT, encoding='utf-8')
+        patterns = PrivacyPatternParser(html_path, use_cache=False, backend="html.parser").parse()
+    
+    print(f"Parsed {[(p.pattern_number, len(p.examples)) for p in patterns]}")
+    assert [p.pattern_name for p in patterns] == [
+        "Cookie Consent Banners", "Privacy Dashboards", "Just-in-Time Notices"
+    ]
+    detailed, simple, loose = patterns
+    assert detailed.description == "Banners that ask for consent before any cookie is set."
+    assert [(e.company, e.url, e.nielsen_heuristics) for e in detailed.examples] == [
+        ("Acme Corp", "https://acme.example/privacy", "H1, H3"),
+        ("Beta Ltd", "https://beta.example", "H5"),
+    ]
+    # Markup inside a row is joined back into one line
+    assert [(e.example_number, e.company, e.use_case) for e in simple.examples] == [
+        (1, "Gamma", "Overview"), (3, "Delta Inc", "Toggle")
+    ]
+    assert [(e.example_number, e.url, e.title) for e in loose.examples] == [
+        (4, "https://epsilon.example/location", "Epsilon location prompt")
+    ]
+
+def test_text_fallback_pathological_input():
+    """An unterminated row followed by 100k blank lines parses in linear time."""
+    text = "1. Cookie Consent Banners\n1 | Acme https://acme.example |" + "\n" * 100_000 + "end\n"
+    parser = PrivacyPatternParser(Path("pathological.txt"), use_cache=False)
+    start_time = time.perf_counter()
+    parser._parse_patterns(text)
+    duration = time.perf_counter() - start_time
+    print(f"Parsed {len(text):,} characters in {duration:.3f}s")
+    # Too few cells for a table row, so only the loose URL match remains
+    assert [e.url for p in parser.patterns for e in p.examples] == ["https://acme.example"]
+    assert duration < 5
+
 if __name__ == "__main__":
-    test_parser()
\ No newline at end of file
+    test_parser()
+    test_parse_cache()
+    test_text_fallback()
+    test_text_fallback_pathological_input()
\ No newline at end of file
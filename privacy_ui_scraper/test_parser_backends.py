@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""Check that the lxml and html.parser backends produce identical parses."""
+
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from html_parser import PrivacyPatternParser, BACKENDS
+from config import HTML_PATH, OUTPUT_DIR
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+EDGE_CASES = """<html><body>
+<p>Intro table before any header is ignored</p>
+<table><tr><td>1</td><td>Ignored https://ignored.example</td></tr></table>
+<p class=MsoNormal>1. Cookie Consent&nbsp;Banners and more</p>
+<table>
+<tr><th>#</th><th>Example</th><th>Title</th></tr>
+<tr><td>1</td><td>Acme Corp <a href="https://acme.example/privacy">link</a></td><td>Banner &amp; modal</td><td>GDPR</td></tr>
+<tr><td>2</td><td>Plain text URL https://plain.example/settings</td><td>Toggle</td></tr>
+<tr><td>3</td><td>Bookmark only <a name="_Toc1">anchor</a> https://ignored.example</td><td>Skipped</td></tr>
+<tr><td>4</td><td>Nested<table><tr><td>inner https://nested.example</td></tr></table></td><td>Nested cell</td></tr>
+</table>
+<p>2. Pattern Overview is not a header</p>
+<p>3. Just-in-Time Notices<br>with a line break</p>
+<table><tr><td> 5 </td><td><a href="https://jit.example">JIT</a></td></tr></table>
+</body></html>"""
+
+def _parse(html_path: Path, backend: str) -> dict:
+    parser = PrivacyPatternParser(html_path, use_cache=False, backend=backend)
+    parser.parse()
+    return parser.to_dict()
+
+def test_backends_match_parsed_data():
+    """Every backend reproduces the committed parsed_data.json from the real library file."""
+    if not HTML_PATH.exists():
+        print(f"ERROR: HTML file not found at {HTML_PATH}")
+        return
+
+    with open(OUTPUT_DIR / "parsed_data.json", encoding='utf-8') as f:
+        expected = json.load(f)
+
+    for backend in BACKENDS:
+        data = _parse(HTML_PATH, backend)
+        examples = sum(len(p["examples"]) for p in data["patterns"])
+        print(f"  {backend:<12} {len(data['patterns'])} patterns, {examples} examples")
+        assert data == expected, f"{backend} output differs from parsed_data.json"
+
+def test_backends_match_on_edge_cases():
+    """Links without href, URLs in text, nested tables and non-header paragraphs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = Path(tmp) / "edge_cases.html"
+        html_path.write_text(EDGE_CASES, encoding='utf-8')
+        results = {backend: _parse(html_path, backend) for backend in BACKENDS}
+
+    reference = results["html.parser"]
+    urls = [e["url"] for p in reference["patterns"] for e in p["examples"]]
+    print(f"  urls: {urls}")
+    assert urls == [
+        "https://acme.example/privacy", "https://plain.example/settings",
+        "https://nested.example", "https://jit.example"
+    ]
+    for backend, data in results.items():
+        assert data == reference, f"{backend} differs on edge cases"
+
+def test_backend_timing():
+    """Time each backend on the real library file (best of 3)."""
+    if not HTML_PATH.exists():
+        print(f"ERROR: HTML file not found at {HTML_PATH}")
+        return
+
+    timings = {}
+    for backend in BACKENDS:
+        runs = []
+        for _ in range(3):
+            start_time = time.perf_counter()
+            _parse(HTML_PATH, backend)
+            runs.append(time.perf_counter() - start_time)
+        timings[backend] = min(runs)
+
+    baseline = timings["html.parser"]
+    for backend, seconds in timings.items():
+        print(f"  {backend:<12} {seconds * 1000:8.1f} ms  ({baseline / seconds:.1f}x)")
+
+if __name__ == "__main__":
+    for test in [test_backends_match_parsed_data, test_backends_match_on_edge_cases, test_backend_timing]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""Check the capture record types and their JSON layout."""
+
+import dataclasses
+import hashlib
+import json
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import records
+from capture_manifest import CaptureManifest, row_hash
+from html_parser import PrivacyExample
+from records import CaptureResult, PatternResults, write_json
+
+EXAMPLE = PrivacyExample(
+    example_number=3,
+    company="Acme “Corp”",
+    url="https://acme.example/privacy",
+    title="Banner",
+    use_case="GDPR",
+    nielsen_heuristics="H1"
+)
+
+def _result(**changes) -> CaptureResult:
+    values = dict(
+        screenshot_file="example_3_Acme.png",
+        timestamp="2025-01-01T00:00:00",
+        success=True,
+        http_status=200,
+        goto_ms=812.4
+    )
+    values.update(changes)
+    return CaptureResult(EXAMPLE, **values)
+
+def test_records_are_frozen_and_slotted():
+    """Records have no __dict__, can't be changed and survive pickling for shard workers."""
+    result = _result()
+    for record, field in ((EXAMPLE, "url"), (result, "success")):
+        assert not hasattr(record, "__dict__")
+        try:
+            setattr(record, field, None)
+        except dataclasses.FrozenInstanceError:
+            pass
+        else:
+            raise AssertionError(f"{type(record).__name__} is mutable")
+    assert pickle.loads(pickle.dumps(result)) == result
+
+def test_flat_layout():
+    """A result serializes as the old flat row: example fields first, then capture fields."""
+    row = _result().to_dict()
+    print(f"  keys: {list(row)}")
+    assert list(row)[:9] == list(dataclasses.asdict(EXAMPLE))
+    assert row == {
+        **dataclasses.asdict(EXAMPLE),
+        "screenshot_file": "example_3_Acme.png",
+        "timestamp": "2025-01-01T00:00:00",
+        "success": True,
+        "error": None,
+        "http_status": 200,
+        "goto_ms": 812.4,
+        "blocked_requests": None,
+        "blocked_by_reason": None,
+        "allowed_requests": None,
+        "allowed_bytes": None,
+        "setup_ms": None,
+        "reset_ms": None,
+        "banner_selector": None,
+        "banner_detect_ms": None,
+        "capture_mode": None,
+        "preflight": None,
+        "final_url": None,
+        "phases_ms": None,
+        "verdict": None,
+        "failure": None,
+        "attempts": None
+    }
+    # Extra keys written later, e.g. by the derivatives stage, are ignored on load
+    assert CaptureResult.from_dict({**row, "derivatives": {"webp": {}}}) == _result()
+
+def test_writer_matches_json_dump():
+    """metadata.json is byte-identical to json.dump(indent=2), with and without orjson."""
+    results = PatternResults(1, "Cookie Consent Banners", "01_Cookie_Consent_Banners", (
+        _result(), _result(success=False, screenshot_file=None, error="Timeout")
+    ))
+    expected = json.dumps(results.to_dict(), indent=2, ensure_ascii=False)
+
+    backends = [records.orjson, None] if records.orjson is not None else [None]
+    original = records.orjson
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "metadata.json"
+        try:
+            for backend in backends:
+                records.orjson = backend
+                write_json(path, results)
+                assert path.read_text(encoding='utf-8') == expected, backend
+        finally:
+            records.orjson = original
+        assert [p.name for p in Path(tmp).iterdir()] == ["metadata.json"]
+        assert PatternResults.from_dict(json.loads(expected)) == results
+    print(f"  writers checked: {['orjson' if b else 'json' for b in backends]}")
+
+def _old_row_hash(row: dict) -> str:
+    fields = {name: row.get(name) for name in dataclasses.asdict(EXAMPLE)}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def test_manifest_round_trip():
+    """Manifest rows hash like the old dict rows and replay as records."""
+    old_row = {**dataclasses.asdict(EXAMPLE), "success": True}
+    assert row_hash(EXAMPLE) == _old_row_hash(old_row)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        folder = output_dir / "01_Cookie_Consent_Banners"
+        folder.mkdir()
+        (folder / "example_3_Acme.png").write_bytes(b"png")
+
+        result = _result(timestamp=datetime.now().isoformat())
+        manifest = CaptureManifest(output_dir / "manifest.jsonl")
+        manifest.record(folder.name, result, output_dir)
+        reloaded = CaptureManifest.load(output_dir / "manifest.jsonl")
+        assert reloaded.cached_result(folder.name, EXAMPLE, output_dir) == result
+
+if __name__ == "__main__":
+    for test in [
+        test_records_are_frozen_and_slotted, test_flat_layout,
+        test_writer_matches_json_dump, test_manifest_round_trip
+    ]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+"""Check failure classification, retry backoff, the circuit breaker and deferred retries."""
+
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from capture_scheduler import CaptureScheduler
+from html_parser import PrivacyExample
+from retry_policy import CircuitBreaker, RetryPolicy, classify_exception, classify_outcome
+from screenshot_capture import ScreenshotCapture
+
+def test_classify_failures():
+    """Exceptions by Chromium error code, loaded error pages by HTTP status."""
+    cases = [
+        (PlaywrightTimeoutError("Timeout 30000ms exceeded."), "timeout"),
+        (asyncio.TimeoutError(), "timeout"),
+        (PlaywrightError("net::ERR_NAME_NOT_RESOLVED at https://gone.example/"), "dns"),
+        (PlaywrightError("net::ERR_CERT_DATE_INVALID at https://old.example/"), "tls"),
+        (PlaywrightError("net::ERR_SSL_PROTOCOL_ERROR at https://old.example/"), "tls"),
+        (PlaywrightError("net::ERR_CONNECTION_RESET at https://flaky.example/"), "connection"),
+        (PlaywrightError("net::ERR_CONNECTION_TIMED_OUT at https://slow.example/"), "timeout"),
+        (PlaywrightError("net::ERR_INTERNET_DISCONNECTED at https://news.example/"), "offline"),
+        (PlaywrightError("Target page, context or browser has been closed"), "unknown"),
+    ]
+    for error, expected in cases:
+        assert classify_exception(error) == expected, (error, expected)
+
+    assert classify_outcome(404) == "http_4xx"
+    assert classify_outcome(429) == "rate_limited"
+    assert classify_outcome(503) == "http_5xx"
+    assert classify_outcome(200) == "error_page"
+    assert classify_outcome(None) == "error_page"
+
+def test_retry_policy():
+    """Only transient failures are retried, with capped, jittered exponential delays."""
+    policy = RetryPolicy(max_attempts=3, base=2, cap=5, rng=random.Random(7))
+    assert policy.should_retry("timeout", 1) and policy.should_retry("http_5xx", 2)
+    assert not policy.should_retry("timeout", 3)
+    for failure in ("dns", "tls", "offline", "http_4xx", "error_page", "circuit_open", None):
+        assert not policy.should_retry(failure, 1), failure
+
+    for attempt, (low, high) in enumerate([(1, 2), (2, 4), (2.5, 5), (2.5, 5)], start=1):
+        delays = [policy.delay(attempt) for _ in range(200)]
+        print(f"  attempt {attempt}: {min(delays):.2f}-{max(delays):.2f}s")
+        assert all(low <= delay <= high for delay in delays)
+        assert len(set(delays)) > 1
+
+def test_circuit_breaker():
+    """Consecutive host failures open the breaker; after the cooldown one probe goes through."""
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=2, cooldown=60, clock=lambda: now[0])
+
+    breaker.record("a.example", "timeout")
+    breaker.record("a.example", "http_4xx")  # The host answered: the count starts over
+    breaker.record("a.example", "timeout")
+    assert breaker.allow("a.example")
+    breaker.record("a.example", "dns")
+    assert breaker.is_open("a.example") and not breaker.allow("a.example")
+    assert breaker.allow("b.example")
+
+    now[0] = 61
+    assert not breaker.is_open("a.example")
+    assert breaker.allow("a.example")  # The probe...
+    assert not breaker.allow("a.example")  # ...and nobody else
+    breaker.record("a.example", "timeout")
+    now[0] = 100
+    assert not breaker.allow("a.example")
+
+    now[0] = 200
+    assert breaker.allow("a.example")
+    breaker.record("a.example", None)
+    assert breaker.allow("a.example") and breaker.allow("a.example")
+
+def test_deferred_retries():
+    """Retries wait behind queued captures, permanent failures aren't retried, open hosts are skipped."""
+    calls = []
+    failures = {
+        "https://flaky.example/": [PlaywrightTimeoutError("Timeout 30000ms exceeded.")] * 2,
+        "https://gone.example/a": [PlaywrightError("net::ERR_NAME_NOT_RESOLVED")],
+        "https://gone.example/b": [PlaywrightError("net::ERR_NAME_NOT_RESOLVED")],
+        "https://gone.example/c": [PlaywrightError("net::ERR_NAME_NOT_RESOLVED")],
+        "https://missing.example/": ["http_4xx"],
+    }
+
+    async def attempt(url, filename, folder_path, attempt, capture_mode):
+        calls.append(url)
+        await asyncio.sleep(0.02)
+        stats = capture.capture_stats[str(folder_path / filename)] = {"http_status": 200}
+        if failures.get(url):
+            failure = failures[url].pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            stats["failure"] = failure
+            return False, "Error page (not_found): HTTP 404"
+        return True, "Success"
+
+    urls = [
+        "https://flaky.example/", "https://gone.example/a", "https://missing.example/",
+        "https://steady.example/", "https://gone.example/b", "https://gone.example/c",
+        "https://gone.example/d"
+    ]
+    examples = [PrivacyExample(i, f"Company {i}", url, "", "") for i, url in enumerate(urls, start=1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = ScreenshotCapture(
+            Path(tmp),
+            scheduler=CaptureScheduler(max_concurrent=1, max_per_host=1, host_delay=0),
+            validate=False,
+            retry_policy=RetryPolicy(max_attempts=3, base=0.01, cap=0.01),
+            circuit_breaker=CircuitBreaker(threshold=3, cooldown=60)
+        )
+        capture._capture_attempt = attempt
+        results = asyncio.run(capture.capture_pattern_screenshots(1, "Retries", examples, save_metadata=False))
+
+    print(f"  calls: {[url.split('//')[1] for url in calls]}")
+    outcomes = {result.example.url: (result.success, result.failure, result.attempts) for result in results.examples}
+    assert outcomes == {
+        "https://flaky.example/": (True, None, 3),
+        "https://gone.example/a": (False, "dns", 1),
+        "https://missing.example/": (False, "http_4xx", 1),
+        "https://steady.example/": (True, None, 1),
+        "https://gone.example/b": (False, "dns", 1),
+        "https://gone.example/c": (False, "dns", 1),
+        "https://gone.example/d": (False, "circuit_open", None),
+    }
+    # The first retry of the flaky host waits until the captures queued before it have run
+    assert calls.index("https://flaky.example/", 1) > calls.index("https://steady.example/")
+    assert "https://gone.example/d" not in calls
+
+def test_resume_and_direct_captures():
+    """Existing screenshots are resumed without an attempt; direct capture_screenshot calls still retry."""
+    attempts = []
+
+    async def attempt(url, filename, folder_path, attempt, capture_mode):
+        attempts.append(attempt)
+        capture.capture_stats[str(folder_path / filename)] = {"http_status": None}
+        if attempt < 2:
+            raise PlaywrightTimeoutError("Timeout 30000ms exceeded.")
+        (folder_path / filename).write_bytes(b"png")
+        return True, "Success"
+
+    example = PrivacyExample(1, "Acme", "https://acme.example/", "", "")
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = ScreenshotCapture(
+            Path(tmp),
+            scheduler=CaptureScheduler(max_concurrent=1, max_per_host=1, host_delay=0),
+            validate=False,
+            retry_policy=RetryPolicy(max_attempts=3, base=0.01, cap=0.01)
+        )
+        capture._capture_attempt = attempt
+        folder_path = Path(tmp) / "01_Resume"
+        folder_path.mkdir()
+
+        assert asyncio.run(capture.capture_screenshot(example.url, "direct.png", folder_path, resume=False)) == (True, "Success")
+        assert attempts == [1, 2]
+
+        (folder_path / capture.filename_for(example)).write_bytes(b"png")
+        result = asyncio.run(capture._capture_example(example, folder_path.name))
+        assert (result.success, result.attempts, result.screenshot_file) == (True, None, capture.filename_for(example))
+        assert attempts == [1, 2]
+
+def test_inconclusive_preflight_is_captured():
+    """URLs whose pre-flight was blocked or timed out still go to the browser; gone ones are skipped."""
+    checks = {
+        "https://cdn-walled.example/": {"category": "inconclusive", "status": 403,
+                                        "final_url": "https://cdn-walled.example/challenge", "reason": "HTTP 403"},
+        "https://moved.example/": {"category": "redirected", "status": 200, "final_url": "https://moved.example/home"},
+        "https://gone.example/": {"category": "broken", "status": 410, "final_url": "https://gone.example/",
+                                  "reason": "HTTP 410"},
+    }
+    calls = []
+
+    class FakePreflight:
+        async def check(self, url):
+            return checks[url]
+
+    async def attempt(url, filename, folder_path, attempt, capture_mode):
+        calls.append(url)
+        return True, "Success"
+
+    examples = [PrivacyExample(i, f"Company {i}", url, "", "") for i, url in enumerate(checks, start=1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = ScreenshotCapture(Path(tmp), scheduler=CaptureScheduler(host_delay=0), validate=False)
+        capture.preflight = FakePreflight()
+        capture._capture_attempt = attempt
+        results = asyncio.run(capture.capture_pattern_screenshots(1, "Preflight", examples, save_metadata=False))
+
+    assert sorted(calls) == ["https://cdn-walled.example/", "https://moved.example/home"]
+    assert [(result.success, result.preflight) for result in results.examples] == [
+        (True, "inconclusive"), (True, "redirected"), (False, "broken")
+    ]
+
+if __name__ == "__main__":
+    for test in [test_classify_failures, test_retry_policy, test_circuit_breaker, test_deferred_retries,
+                 test_resume_and_direct_captures, test_inconclusive_preflight_is_captured]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
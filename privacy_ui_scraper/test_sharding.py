@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+"""Check that sharded results merge back into one PatternResults per pattern, in order."""
+
+from html_parser import PrivacyExample, PrivacyPattern
+from records import CaptureResult
+from sharding import merge_shard_results, split_patterns
+
+def _pattern(number, name, hosts):
+    examples = [
+        PrivacyExample(index + 1, host, f"https://{host}/privacy", "", "") for index, host in enumerate(hosts)
+    ]
+    return PrivacyPattern(number, name, "", examples)
+
+def test_merge_keeps_every_pattern():
+    """Patterns without examples come back empty, so results still line up with the patterns."""
+    patterns = [
+        _pattern(1, "Cookie Consent Banners", ["a.example", "b.example", "c.example"]),
+        _pattern(2, "Empty Pattern", []),
+        _pattern(3, "Privacy Dashboards", ["b.example"]),
+    ]
+
+    shard_results = []
+    for shard in split_patterns(patterns, 2):
+        shard_results.append([
+            (pattern_index, f"{number:02d}_folder", [
+                (example_index, CaptureResult(example, None, "", True)) for example_index, example in indexed
+            ])
+            for pattern_index, number, _, indexed in shard
+        ])
+
+    merged = merge_shard_results(patterns, shard_results)
+    print(f"  {[(results.folder, len(results.examples)) for results in merged]}")
+    assert [results.pattern_number for results in merged] == [1, 2, 3]
+    assert [len(results.examples) for results in merged] == [3, 0, 1]
+    assert [result.example.company for result in merged[0].examples] == ["a.example", "b.example", "c.example"]
+    assert merged[1].folder == "02_Empty_Pattern"
+
+if __name__ == "__main__":
+    for test in [test_merge_keeps_every_pattern]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
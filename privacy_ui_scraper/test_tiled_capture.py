@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""Check tiled full-page capture: strips, stitching, the height cap and the PNG row writer."""
+
+import asyncio
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from tiled_capture import (
+    HIDE_FIXED_SCRIPT, SCROLL_SCRIPT, PngRowWriter, capture_tiles, finish_tiles, tile_dir_for
+)
+
+WIDTH, VIEWPORT = 40, 50
+
+def page_rows(top: int, count: int) -> np.ndarray:
+    """The page's pixels: row y is (y % 256, y // 256, 7)."""
+    y = np.arange(top, top + count)
+    rows = np.stack([y % 256, y // 256, np.full_like(y, 7)], axis=-1).astype(np.uint8)
+    return np.repeat(rows[:, None, :], WIDTH, axis=1)
+
+class TallPage:
+    """A page of `height` px that renders each viewport from page_rows()."""
+
+    def __init__(self, height, grows_by=0):
+        self.height = height
+        self.grows_by = grows_by  # Lazy loading: the page gets taller on every scroll
+        self.scroll_y = 0
+        self.hidden_fixed = 0
+        self.screenshots = 0
+
+    async def evaluate(self, script, arg=None):
+        if script == HIDE_FIXED_SCRIPT:
+            self.hidden_fixed += 1
+            return 1
+        assert script == SCROLL_SCRIPT
+        self.height += self.grows_by
+        self.scroll_y = max(0, min(arg, self.height - VIEWPORT))
+        return {"scrollY": self.scroll_y, "viewport": VIEWPORT, "height": self.height}
+
+    async def screenshot(self, **options):
+        assert not options.get("full_page")
+        self.screenshots += 1
+        buffer = io.BytesIO()
+        Image.fromarray(page_rows(self.scroll_y, VIEWPORT)).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+def _capture(page, folder, max_height=10000, stitch=True):
+    screenshot_path = folder / "shot.png"
+    tiles = asyncio.run(capture_tiles(page, tile_dir_for(screenshot_path), max_height=max_height))
+    height = finish_tiles(tiles, screenshot_path, stitch)
+    return tiles, height, screenshot_path
+
+def test_stitched_capture():
+    """Strips stitch into exactly the page, including a last strip that couldn't scroll a full viewport."""
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        page = TallPage(height=1234)
+        tiles, height, path = _capture(page, folder)
+
+        assert height == 1234 and len(tiles) == 25
+        assert tiles[-1].offset == 16 and tiles[-1].rows == 34  # 1234 = 24 * 50 + 34
+        assert page.hidden_fixed == 1  # Fixed banners only appear in the first strip
+        with Image.open(path) as image:
+            assert image.size == (WIDTH, 1234)
+            assert np.array_equal(np.asarray(image), page_rows(0, 1234))
+        assert not tile_dir_for(path).exists()
+
+        # A short page is one strip
+        tiles, height, path = _capture(TallPage(height=30), folder)
+        assert len(tiles) == 1 and height == 30
+        with Image.open(path) as image:
+            assert np.array_equal(np.asarray(image), page_rows(0, 30))
+
+def test_height_cap():
+    """Endlessly growing pages stop at the height cap; unstitched strips are kept."""
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        page = TallPage(height=400, grows_by=100)
+        tiles, height, path = _capture(page, folder, max_height=1000, stitch=False)
+
+        print(f"  {page.screenshots} strips, page grew to {page.height} px")
+        assert height == 1000 and page.screenshots == 20
+        assert sorted(p.name for p in tile_dir_for(path).iterdir())[-1] == "tile_019.png"
+        with Image.open(path) as image:
+            assert np.array_equal(np.asarray(image), page_rows(0, VIEWPORT))
+
+def test_png_row_writer():
+    """The streamed PNG decodes to the rows written, and incomplete images are discarded."""
+    rng = np.random.default_rng(3)
+    image = rng.integers(0, 256, size=(300, 17, 3), dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rows.png"
+        with PngRowWriter(path, 17, 300) as writer:
+            for start in range(0, 300, 64):
+                writer.write_rows(image[start:start + 64])
+        with Image.open(path) as decoded:
+            assert np.array_equal(np.asarray(decoded), image)
+
+        try:
+            with PngRowWriter(Path(tmp) / "short.png", 17, 300) as writer:
+                writer.write_rows(image[:10])
+        except ValueError as e:
+            assert "Wrote 10 rows" in str(e)
+        else:
+            raise AssertionError("an incomplete image must not be written")
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ["rows.png"]
+
+if __name__ == "__main__":
+    for test in [test_stitched_capture, test_height_cap, test_png_row_writer]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+"""Test the URL validator against a local aiohttp stand-in server."""
+
+import asyncio
+import logging
+from aiohttp import web
+from capture_scheduler import CaptureScheduler
+from url_validator import UrlPreflight, check_url, create_session, is_auth_path, validate_examples
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+OK_PAGE = (
+    "<html><head><title>Privacy settings</title>"
+    "<script>window.onerror = function() { console.log('error 404 not found'); };</script>"
+    "</head><body>Manage your choices</body></html>"
+)
+LOGIN_PAGE = "<html><head><title>Account</title></head><body>Please sign in to continue</body></html>"
+MISSING_PAGE = "<html><head><title>Page not found</title></head><body>Sorry</body></html>"
+
+def build_app(stats: dict) -> web.Application:
+    """Stand-in site: 200s, redirects, 404s, login walls and a slow host."""
+    stats.setdefault("requests", 0)
+
+    async def ok(request):
+        if request.method == "GET":
+            stats["requests"] += 1
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    async def redirect(request):
+        raise web.HTTPFound("/ok")
+
+    async def missing(request):
+        return web.Response(text=MISSING_PAGE, status=404, content_type="text/html")
+
+    async def soft_404(request):
+        return web.Response(text=MISSING_PAGE, content_type="text/html")
+
+    async def login_wall(request):
+        raise web.HTTPFound("/accounts/login")
+
+    async def login_page(request):
+        return web.Response(text=LOGIN_PAGE, content_type="text/html")
+
+    async def login_text(request):
+        return web.Response(text=LOGIN_PAGE, content_type="text/html")
+
+    async def gone(request):
+        return web.Response(status=410)
+
+    async def bot_protected(request):
+        # Like a CDN bot filter: only browsers that send a language get the page
+        if "Chrome/" not in request.headers.get("User-Agent", "") or "Accept-Language" not in request.headers:
+            return web.Response(text="Access denied", status=403)
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    async def blocked(request):
+        return web.Response(text="Access denied", status=403)
+
+    async def rate_limited(request):
+        return web.Response(status=429, headers={"Retry-After": "30"})
+
+    async def slow(request):
+        await asyncio.sleep(2)
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    async def no_head(request):
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    async def slow_head(request):
+        if request.method == "HEAD":
+            await asyncio.sleep(2)
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    async def huge(request):
+        # A small good page followed by megabytes that mention an error
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+        await response.prepare(request)
+        try:
+            await response.write(OK_PAGE.encode() + b" " * (128 * 1024))
+            for _ in range(64):
+                await response.write(b"error " * 16 * 1024)
+            stats["huge_completed"] = True
+        except ConnectionError:
+            pass  # The validator hung up early, as it should
+        return response
+
+    async def counted(request):
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        await asyncio.sleep(0.1)
+        stats["in_flight"] -= 1
+        return web.Response(text=OK_PAGE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/redirect", redirect)
+    app.router.add_get("/missing", missing)
+    app.router.add_get("/soft-404", soft_404)
+    app.router.add_get("/private", login_wall)
+    app.router.add_get("/accounts/login", login_page)
+    app.router.add_get("/members", login_text)
+    app.router.add_get("/gone", gone)
+    app.router.add_get("/bot-protected", bot_protected)
+    app.router.add_get("/blocked", blocked)
+    app.router.add_get("/rate-limited", rate_limited)
+    app.router.add_get("/slow", slow)
+    app.router.add_route("*", "/no-head", no_head)
+    app.router.add_route("*", "/slow-head", slow_head)
+    app.router.add_get("/huge", huge)
+    app.router.add_get("/counted/{n}", counted)
+    return app
+
+async def _with_server(test):
+    stats = {"in_flight": 0, "max_in_flight": 0, "huge_completed": False}
+    runner = web.AppRunner(build_app(stats), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        await test(f"http://127.0.0.1:{port}", stats)
+    finally:
+        await runner.cleanup()
+
+def run(test):
+    asyncio.run(_with_server(test))
+
+def test_status_classification():
+    """200s, redirects, 404s, soft 404s, login walls and bot walls land in the right bucket."""
+    async def test(base, stats):
+        expected = {
+            "/ok": "working",
+            "/redirect": "redirected",
+            "/missing": "broken",
+            "/soft-404": "broken",
+            "/private": "auth_required",
+            "/members": "auth_required",
+            "/no-head": "working",
+            "/gone": "broken",
+            "/bot-protected": "working",  # Sent the browser's User-Agent and Accept-Language
+            "/blocked": "inconclusive",
+            "/rate-limited": "inconclusive",
+        }
+        async with create_session() as session:
+            for path, category in expected.items():
+                result = await check_url(session, base + path)
+                print(f"  {path:<14} -> {result['category']} ({result['status']})")
+                assert result["category"] == category, (path, result)
+
+        async with create_session() as session:
+            result = await check_url(session, base + "/missing")
+            assert result["status"] == 404
+            assert result["reason"] == "HTTP 404"
+            result = await check_url(session, "http://no-such-host.invalid/")
+            print(f"  unresolvable host -> {result['category']} ({result['reason']})")
+            assert result["category"] == "broken"
+    run(test)
+
+def test_auth_paths():
+    """Login pages are recognised by whole path segments, not by substrings like "auth" in "author"."""
+    for url in (
+        "https://news.example/accounts/login?next=/", "https://news.example/auth/callback",
+        "https://shop.example/Sign-In", "https://forum.example/login.php"
+    ):
+        assert is_auth_path(url), url
+    for url in (
+        "https://adssettings.google.com/authenticated", "https://news.example/author/jane-doe",
+        "https://docs.example/oauth-info", "https://news.example/loginhelp-faq/privacy"
+    ):
+        assert not is_auth_path(url), url
+
+def test_slow_host_times_out():
+    """A host slower than the timeout is inconclusive instead of hanging, so the browser still tries it."""
+    async def test(base, stats):
+        async with create_session(timeout=0.5) as session:
+            result = await check_url(session, base + "/slow")
+        print(f"  /slow -> {result}")
+        assert result["category"] == "inconclusive"
+        assert result["reason"] == "Timeout"
+    run(test)
+
+def test_hanging_head_falls_back_quickly():
+    """A HEAD that hangs only costs the short HEAD timeout before the GET decides."""
+    async def test(base, stats):
+        async with create_session(timeout=5) as session:
+            start = asyncio.get_running_loop().time()
+            result = await check_url(session, base + "/slow-head", head_timeout=0.3)
+            elapsed = asyncio.get_running_loop().time() - start
+        print(f"  /slow-head -> {result['category']} in {elapsed:.2f} s")
+        assert result["category"] == "working"
+        assert elapsed < 1.5
+    run(test)
+
+def test_body_read_is_capped():
+    """Only the first N KB are read, so later error text doesn't matter."""
+    async def test(base, stats):
+        async with create_session() as session:
+            result = await check_url(session, base + "/huge", max_body_kb=64)
+        print(f"  /huge -> {result['category']}")
+        assert result["category"] == "working"
+        await asyncio.sleep(0.1)
+        assert not stats["huge_completed"]
+    run(test)
+
+def test_per_host_limit():
+    """No more than the per-host limit of requests hit one host at a time."""
+    async def test(base, stats):
+        examples = [{"url": f"{base}/counted/{n}"} for n in range(10)]
+        scheduler = CaptureScheduler(max_concurrent=8, max_per_host=2, host_delay=0)
+        results = await validate_examples(examples, scheduler=scheduler)
+        print(f"  max in flight for one host: {stats['max_in_flight']}")
+        assert [r["category"] for r in results] == ["working"] * 10
+        assert stats["max_in_flight"] <= 2
+    run(test)
+
+def test_preflight_checks_each_url_once():
+    """Examples sharing a URL trigger a single pre-flight check."""
+    async def test(base, stats):
+        preflight = UrlPreflight()
+        await preflight.start()
+        try:
+            results = await asyncio.gather(*(preflight.check(base + "/ok") for _ in range(5)))
+        finally:
+            await preflight.close()
+        print(f"  5 checks -> {stats['requests']} GET request(s)")
+        assert all(r["category"] == "working" for r in results)
+        assert stats["requests"] == 1
+    run(test)
+
+if __name__ == "__main__":
+    for test in [
+        test_status_classification, test_auth_paths, test_slow_host_times_out, test_hanging_head_falls_back_quickly,
+        test_body_read_is_capped,
+        test_per_host_limit, test_preflight_checks_each_url_once
+    ]:
+        print(f"\n{test.__name__}: {test.__doc__}")
+        test()
+        print("  ✅ passed")
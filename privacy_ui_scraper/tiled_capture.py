@@ -0,0 +1,194 @@
+"""Memory-bounded full-page capture for very tall pages.
+
+Instead of page.screenshot(full_page=True), which renders the whole page into
+one bitmap, the page is scrolled one viewport at a time and each strip is
+written to disk as it is taken. The strips are then stitched into a single PNG
+by PngRowWriter, which encodes a band of rows at a time, so neither the
+browser nor this process ever holds more than one viewport of pixels.
+
+Strips are in device pixels; the capture contexts use a device scale factor
+of 1, so one CSS pixel of scroll is one row of image.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import struct
+import zlib
+from pathlib import Path
+from typing import List, NamedTuple
+
+import numpy as np
+from PIL import Image
+from playwright.async_api import Page
+
+from config import SCREENSHOT_TIMEOUT, FULL_PAGE_MAX_HEIGHT, TILE_DIR_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Scrolls to `y` and resolves after the next frame has painted, with where the
+# browser actually ended up (it clamps at the bottom of the page)
+SCROLL_SCRIPT = """
+(y) => new Promise((resolve) => {
+    window.scrollTo(0, y);
+    requestAnimationFrame(() => requestAnimationFrame(() => resolve({
+        scrollY: Math.round(window.scrollY),
+        viewport: window.innerHeight,
+        height: Math.max(document.documentElement.scrollHeight, document.body ? document.body.scrollHeight : 0)
+    })));
+})
+"""
+
+# Fixed and sticky elements (banners, headers) would repeat in every strip;
+# after the first strip they are hidden. The page is closed after capture, so
+# they are not restored.
+HIDE_FIXED_SCRIPT = """
+() => {
+    let hidden = 0;
+    for (const el of document.querySelectorAll('body *')) {
+        const position = window.getComputedStyle(el).position;
+        if (position === 'fixed' || position === 'sticky') {
+            el.style.setProperty('visibility', 'hidden', 'important');
+            hidden++;
+        }
+    }
+    return hidden;
+}
+"""
+
+class Tile(NamedTuple):
+    """One viewport strip on disk and the rows of it that belong to the page image."""
+    path: Path
+    offset: int  # First row to use; non-zero when the last strip couldn't scroll a full viewport
+    rows: int
+
+def tile_dir_for(screenshot_path: Path) -> Path:
+    return screenshot_path.with_name(f"{screenshot_path.stem}{TILE_DIR_SUFFIX}")
+
+async def capture_tiles(
+    page: Page,
+    tile_dir: Path,
+    max_height: int = FULL_PAGE_MAX_HEIGHT,
+    timeout: int = SCREENSHOT_TIMEOUT
+) -> List[Tile]:
+    """Scroll through the page a viewport at a time, writing each strip to `tile_dir`.
+
+    Pages that grow while scrolling (lazy loading, infinite feeds) are
+    followed up to `max_height` pixels.
+    """
+    if tile_dir.exists():
+        shutil.rmtree(tile_dir)  # Left over from an earlier attempt
+    tile_dir.mkdir(parents=True)
+    loop = asyncio.get_running_loop()
+
+    tiles: List[Tile] = []
+    top = 0
+    while True:
+        position = await page.evaluate(SCROLL_SCRIPT, top)
+        page_height = min(position["height"], max_height)
+        offset = top - position["scrollY"]
+        rows = min(position["viewport"] - offset, page_height - top)
+        if tiles and rows <= 0:
+            break
+
+        image = await page.screenshot(timeout=timeout)
+        path = tile_dir / f"tile_{len(tiles):03d}.png"
+        await loop.run_in_executor(None, path.write_bytes, image)
+        tiles.append(Tile(path, offset, max(rows, 1)))
+        top += max(rows, 1)
+
+        if len(tiles) == 1:
+            await page.evaluate(HIDE_FIXED_SCRIPT)
+
+    if position["height"] > max_height:
+        logger.info(f"Page is {position['height']} px tall; captured the first {max_height} px")
+    return tiles
+
+class PngRowWriter:
+    """Write an 8-bit RGB PNG a band of rows at a time.
+
+    Rows use the Sub filter and are deflated incrementally into IDAT chunks,
+    so memory holds one band rather than the whole image. The file is written
+    to a temporary path and renamed into place once complete.
+    """
+
+    def __init__(self, path: Path, width: int, height: int, level: int = 6):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.level = level
+        self.rows_written = 0
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    def __enter__(self) -> "PngRowWriter":
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0))
+        self._compressor = zlib.compressobj(self.level)
+        return self
+
+    def write_rows(self, rows: np.ndarray):
+        """Append rows given as a (rows, width, 3) uint8 array."""
+        if rows.shape[1:] != (self.width, 3):
+            raise ValueError(f"Expected rows of shape (n, {self.width}, 3), got {rows.shape}")
+        flat = rows.reshape(len(rows), -1)
+        filtered = np.empty((len(rows), flat.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 1  # Sub: each byte minus the same channel of the pixel to its left
+        filtered[:, 1:4] = flat[:, :3]
+        filtered[:, 4:] = flat[:, 3:] - flat[:, :-3]
+        self._write_chunk(b"IDAT", self._compressor.compress(filtered.tobytes()))
+        self.rows_written += len(rows)
+
+    def _write_chunk(self, tag: bytes, data: bytes):
+        if tag == b"IDAT" and not data:
+            return  # zlib is still buffering
+        self._file.write(struct.pack(">I", len(data)) + tag + data)
+        self._file.write(struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff))
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                if self.rows_written != self.height:
+                    raise ValueError(f"Wrote {self.rows_written} rows, expected {self.height}")
+                self._write_chunk(b"IDAT", self._compressor.flush())
+                self._write_chunk(b"IEND", b"")
+        finally:
+            self._file.close()
+            if exc_type is None and self.rows_written == self.height:
+                os.replace(self._tmp_path, self.path)
+            else:
+                self._tmp_path.unlink(missing_ok=True)
+
+def stitch_tiles(tiles: List[Tile], output_path: Path) -> int:
+    """Stitch strips into one PNG, one strip in memory at a time; returns the image height."""
+    with Image.open(tiles[0].path) as first:
+        width = first.width
+    height = sum(tile.rows for tile in tiles)
+
+    with PngRowWriter(output_path, width, height) as writer:
+        for tile in tiles:
+            with Image.open(tile.path) as image:
+                # crop() pads with black if a strip is narrower than the first
+                band = image.convert("RGB").crop((0, tile.offset, width, tile.offset + tile.rows))
+                writer.write_rows(np.asarray(band))
+    return height
+
+def finish_tiles(tiles: List[Tile], screenshot_path: Path, stitch: bool) -> int:
+    """Turn captured strips into the screenshot; returns the captured page height.
+
+    Stitched strips are deleted. Unstitched ones stay in their folder, and the
+    screenshot is a copy of the first strip (the top of the page).
+    """
+    tile_dir = tiles[0].path.parent
+    if stitch:
+        height = stitch_tiles(tiles, screenshot_path)
+        shutil.rmtree(tile_dir)
+        return height
+    # Copied next to the screenshot and renamed, like PngRowWriter's output
+    tmp_path = screenshot_path.with_name(f".{screenshot_path.name}.{os.getpid()}.tmp")
+    shutil.copyfile(tiles[0].path, tmp_path)
+    os.replace(tmp_path, screenshot_path)
+    return sum(tile.rows for tile in tiles)
@@ -5,133 +5,297 @@
 import asyncio
 import aiohttp
 import json
+import re
+import socket
 from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+from capture_scheduler import CaptureScheduler
+from config import (
+    VALIDATOR_MAX_CONCURRENT, VALIDATOR_MAX_PER_HOST, VALIDATOR_TIMEOUT, VALIDATOR_HEAD_TIMEOUT, VALIDATOR_MAX_BODY_KB,
+    USER_AGENT, ACCEPT_LANGUAGE
+)
+
+logger = logging.getLogger(__name__)
+
+# Phrases that mean the page wants the visitor to log in
+AUTH_INDICATORS = [
+    "sign in required", "login required", "please sign in", "please log in",
+    "log in to continue", "sign in to continue"
+]
+# Path segments of login pages, matched whole so /author/… and
+# /authenticated don't count; a file extension is ignored (login.php)
+AUTH_PATH_SEGMENTS = {"login", "log-in", "signin", "sign-in", "sign_in", "auth"}
+
+# Common error page indicators
+ERROR_INDICATORS = [
+    "404", "not found", "page not found",
+    "error", "oops", "something went wrong",
+    "access denied"
+]
+
+# Statuses that mean the URL itself is gone. Other failed responses (bot
+# protection, rate limits, flaky servers) may still load in the browser, so
+# they are "inconclusive" and left to the capture and its retry policy.
+GONE_STATUSES = {404, 410}
+
+# Look like the capture browser, so bot protection treats both alike
+REQUEST_HEADERS = {"User-Agent": USER_AGENT, "Accept-Language": ACCEPT_LANGUAGE}
+
+# Phrases that only count as an error when they appear in the visible text
+ERROR_TEXT_INDICATORS = [
+    "page not found", "something went wrong", "access denied", "page doesn't exist"
+]
+
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+HIDDEN_BLOCK_PATTERN = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def create_session(
+    max_concurrent: int = VALIDATOR_MAX_CONCURRENT,
+    max_per_host: int = VALIDATOR_MAX_PER_HOST,
+    timeout: float = VALIDATOR_TIMEOUT
+) -> aiohttp.ClientSession:
+    """Create a session with a pooled, keep-alive connector and a DNS cache."""
+    connector = aiohttp.TCPConnector(
+        limit=max_concurrent,
+        limit_per_host=max_per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=30
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers=REQUEST_HEADERS
+    )
+
+async def _read_capped(response: aiohttp.ClientResponse, max_bytes: int) -> str:
+    """Read at most `max_bytes` of the body and stop."""
+    chunks = []
+    remaining = max_bytes
+    while remaining > 0:
+        chunk = await response.content.read(min(remaining, 16 * 1024))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks).decode(response.charset or 'utf-8', errors='replace')
+
+def _visible_text(snippet: str) -> str:
+    """Approximate the visible text of an HTML snippet (no scripts, styles or tags)."""
+    text = TAG_PATTERN.sub(' ', HIDDEN_BLOCK_PATTERN.sub(' ', snippet))
+    return ' '.join(text.split()).lower()
+
+def is_auth_path(url: str) -> bool:
+    """Whether the URL's path has a login segment, e.g. /accounts/login or /auth/callback."""
+    segments = urlparse(url).path.lower().split('/')
+    return any(segment.split('.', 1)[0] in AUTH_PATH_SEGMENTS for segment in segments)
+
+def classify_page(url: str, final_url: str, status: int, snippet: str) -> Dict:
+    """Classify a 200 response from its final URL and the start of its body.
+
+    Short indicators such as "404" or "error" only count in the title, since
+    they show up in scripts and markup of almost every page.
+    """
+    text = _visible_text(snippet)
+    title_match = TITLE_PATTERN.search(snippet)
+    title = title_match.group(1).strip().lower() if title_match else ""
+    if is_auth_path(final_url) or any(indicator in text for indicator in AUTH_INDICATORS):
+        return {"category": "auth_required", "status": status, "final_url": final_url, "reason": "Authentication required"}
+    if any(indicator in title for indicator in ERROR_INDICATORS) or any(indicator in text for indicator in ERROR_TEXT_INDICATORS):
+        return {"category": "broken", "status": status, "final_url": final_url, "reason": "Error page content"}
+    if url != final_url:
+        return {"category": "redirected", "status": status, "final_url": final_url}
+    return {"category": "working", "status": status, "final_url": final_url}
+
+async def check_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    max_body_kb: int = VALIDATOR_MAX_BODY_KB,
+    head_timeout: float = VALIDATOR_HEAD_TIMEOUT
+) -> Dict:
+    """Check a single URL: HEAD first, then a ranged, size-capped GET.
+
+    The HEAD probe gets its own short timeout, so a server that ignores HEAD
+    costs `head_timeout` rather than a full request timeout before the GET.
+
+    Returns a dict with "category" (working / redirected / auth_required /
+    broken / inconclusive), "status", "final_url" and, for anything but
+    working and redirected, "reason". Only 404/410 responses, error pages
+    and unresolvable hosts are broken; timeouts and other failed responses
+    are inconclusive and still worth a try in the browser.
+    """
+    max_bytes = max_body_kb * 1024
+    head_timeout = min(head_timeout, session.timeout.total or head_timeout)
+
+    try:
+        status = None
+        try:
+            async with session.head(
+                url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=head_timeout)
+            ) as response:
+                status = response.status
+                final_url = str(response.url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = None  # Some servers drop HEAD; try GET below
+
+        if status in GONE_STATUSES:
+            return {"category": "broken", "status": status, "final_url": final_url, "reason": f"HTTP {status}"}
+
+        headers = {"Range": f"bytes=0-{max_bytes - 1}"}
+        async with session.get(url, allow_redirects=True, headers=headers) as response:
+            status = response.status
+            final_url = str(response.url)
+            if status in GONE_STATUSES:
+                return {"category": "broken", "status": status, "final_url": final_url, "reason": f"HTTP {status}"}
+            if status not in (200, 206):
+                return {"category": "inconclusive", "status": status, "final_url": final_url, "reason": f"HTTP {status}"}
+            snippet = await _read_capped(response, max_bytes)
+
+        return classify_page(url, final_url, 200, snippet)
+
+    except asyncio.TimeoutError:
+        return {"category": "inconclusive", "status": None, "final_url": url, "reason": "Timeout"}
+    except aiohttp.ClientConnectorError as e:
+        category = "broken" if isinstance(e.os_error, socket.gaierror) else "inconclusive"
+        return {"category": category, "status": None, "final_url": url, "reason": str(e) or e.__class__.__name__}
+    except Exception as e:
+        return {"category": "inconclusive", "status": None, "final_url": url, "reason": str(e) or e.__class__.__name__}
+
+async def validate_examples(
+    examples: List[Dict],
+    session: Optional[aiohttp.ClientSession] = None,
+    scheduler: Optional[CaptureScheduler] = None
+) -> List[Dict]:
+    """Check every example's URL with bounded overall and per-host concurrency.
+
+    Results are returned in the same order as `examples`.
+    """
+    own_session = session is None
+    session = session or create_session()
+    scheduler = scheduler or CaptureScheduler(
+        max_concurrent=VALIDATOR_MAX_CONCURRENT,
+        max_per_host=VALIDATOR_MAX_PER_HOST,
+        host_delay=0
+    )
+
+    async def check(example):
+        async with scheduler.slot(example["url"]):
+            return await check_url(session, example["url"])
+
+    try:
+        return list(await asyncio.gather(*(check(example) for example in examples)))
+    finally:
+        if own_session:
+            await session.close()
+
+class UrlPreflight:
+    """Shared pre-flight checks for a capture run.
+
+    Holds one pooled session and its own concurrency limits, and checks each
+    distinct URL only once even when several examples share it.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = VALIDATOR_MAX_CONCURRENT,
+        max_per_host: int = VALIDATOR_MAX_PER_HOST
+    ):
+        self.scheduler = CaptureScheduler(max_concurrent=max_concurrent, max_per_host=max_per_host, host_delay=0)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._checks: Dict[str, asyncio.Task] = {}
+
+    async def start(self):
+        self.session = create_session(self.scheduler.max_concurrent, self.scheduler.max_per_host)
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+
+    async def check(self, url: str) -> Dict:
+        """Check `url`, reusing the result of an earlier or in-flight check."""
+        if url not in self._checks:
+            self._checks[url] = asyncio.ensure_future(self._check(url))
+        return await asyncio.shield(self._checks[url])
+
+    async def _check(self, url: str) -> Dict:
+        async with self.scheduler.slot(url):
+            return await check_url(self.session, url)
+
+def build_report(data: Dict, checks: List[Dict]) -> Dict:
+    """Group check results into the url_validation_results.json layout."""
+    results = {
+        "working": [],
+        "broken": [],
+        "auth_required": [],
+        "redirected": [],
+        "inconclusive": []
+    }
+
+    examples = [(pattern, example) for pattern in data["patterns"] for example in pattern["examples"]]
+    for (pattern, example), check in zip(examples, checks):
+        entry = {
+            "pattern": pattern["pattern_name"],
+            "company": example["company"],
+        }
+        if check["category"] == "redirected":
+            entry.update({"original_url": example["url"], "final_url": check["final_url"], "status": check["status"]})
+        else:
+            entry.update({"url": example["url"], "status": check["status"]})
+            if "reason" in check:
+                entry["reason"] = check["reason"]
+        results[check["category"]].append(entry)
+
+    return results
 
 async def validate_urls():
     """Validate all URLs from parsed data before screenshotting."""
-    
+
     parsed_data_path = Path("privacy_ui_screenshots/parsed_data.json")
-    
+
     if not parsed_data_path.exists():
         print("No parsed_data.json found. Run the parser first.")
         return
-    
+
     with open(parsed_data_path) as f:
         data = json.load(f)
-    
+
     print(f"🔍 Validating URLs from {len(data['patterns'])} patterns...")
-    
-    results = {
-        "working": [],
-        "broken": [],
-        "auth_required": [],
-        "redirected": []
-    }
-    
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-        for pattern in data["patterns"]:
-            print(f"\n📋 Pattern {pattern['pattern_number']}: {pattern['pattern_name']}")
-            
-            for example in pattern["examples"]:
-                url = example["url"]
-                print(f"  🌐 Testing: {url}")
-                
-                try:
-                    async with session.get(url, allow_redirects=True) as response:
-                        status = response.status
-                        final_url = str(response.url)
-                        
-                        if status == 200:
-                            # Check for common error page indicators
-                            text = await response.text()
-                            error_indicators = [
-                                "404", "not found", "page not found", 
-                                "error", "oops", "something went wrong",
-                                "sign in", "login required", "access denied"
-                            ]
-                            
-                            is_error = any(indicator in text.lower() for indicator in error_indicators)
-                            is_redirect = url != final_url
-                            
-                            if is_error:
-                                results["broken"].append({
-                                    "pattern": pattern["pattern_name"],
-                                    "company": example["company"],
-                                    "url": url,
-                                    "status": status,
-                                    "reason": "Error page content"
-                                })
-                                print(f"    ❌ Error page detected")
-                            elif "login" in text.lower() or "sign in" in text.lower():
-                                results["auth_required"].append({
-                                    "pattern": pattern["pattern_name"],
-                                    "company": example["company"],
-                                    "url": url,
-                                    "status": status,
-                                    "reason": "Authentication required"
-                                })
-                                print(f"    🔐 Login required")
-                            elif is_redirect:
-                                results["redirected"].append({
-                                    "pattern": pattern["pattern_name"],
-                                    "company": example["company"],
-                                    "original_url": url,
-                                    "final_url": final_url,
-                                    "status": status
-                                })
-                                print(f"    ↪️  Redirected to: {final_url[:50]}...")
-                            else:
-                                results["working"].append({
-                                    "pattern": pattern["pattern_name"],
-                                    "company": example["company"],
-                                    "url": url,
-                                    "status": status
-                                })
-                                print(f"    ✅ Working ({status})")
-                        
-                        else:
-                            results["broken"].append({
-                                "pattern": pattern["pattern_name"],
-                                "company": example["company"],
-                                "url": url,
-                                "status": status,
-                                "reason": f"HTTP {status}"
-                            })
-                            print(f"    ❌ HTTP {status}")
-                
-                except Exception as e:
-                    results["broken"].append({
-                        "pattern": pattern["pattern_name"],
-                        "company": example["company"],
-                        "url": url,
-                        "status": None,
-                        "reason": str(e)
-                    })
-                    print(f"    💥 Error: {str(e)[:50]}...")
-                
-                # Small delay between requests
-                await asyncio.sleep(0.5)
-    
+
+    examples = [example for pattern in data["patterns"] for example in pattern["examples"]]
+    checks = await validate_examples(examples)
+    results = build_report(data, checks)
+
+    icons = {"working": "✅", "redirected": "↪️ ", "auth_required": "🔐", "broken": "❌", "inconclusive": "❔"}
+    index = 0
+    for pattern in data["patterns"]:
+        print(f"\n📋 Pattern {pattern['pattern_number']}: {pattern['pattern_name']}")
+        for example in pattern["examples"]:
+            check = checks[index]
+            index += 1
+            detail = check.get("reason") or check["final_url"][:50]
+            print(f"  {icons[check['category']]} {example['url']} - {detail}")
+
     # Summary
-    total = len(results["working"]) + len(results["broken"]) + len(results["auth_required"]) + len(results["redirected"])
-    
+    total = sum(len(entries) for entries in results.values())
+
     print(f"\n📊 URL VALIDATION SUMMARY")
     print(f"Total URLs tested: {total}")
     print(f"✅ Working: {len(results['working'])}")
     print(f"↪️  Redirected: {len(results['redirected'])}")
     print(f"🔐 Auth required: {len(results['auth_required'])}")
     print(f"❌ Broken: {len(results['broken'])}")
+    print(f"❔ Inconclusive (left to the browser): {len(results['inconclusive'])}")
     print(f"Success rate: {(len(results['working']) + len(results['redirected'])) / total * 100:.1f}%")
-    
+
     # Save results
     with open("url_validation_results.json", "w") as f:
         json.dump(results, f, indent=2)
-    
+
     print(f"\n💾 Results saved to url_validation_results.json")
-    
+
     # Show most problematic
     if results["broken"]:
         print(f"\n🚨 BROKEN URLS:")
@@ -139,4 +303,5 @@ async def validate_urls():
             print(f"  {item['pattern']} - {item['company']} - {item['reason']}")
 
 if __name__ == "__main__":
-    asyncio.run(validate_urls())
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    asyncio.run(validate_urls())
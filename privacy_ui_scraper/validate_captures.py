@@ -8,6 +8,8 @@ from pathlib import Path
 from playwright.async_api import async_playwright
 import logging
 
+from image_analysis import analyze_images, find_duplicate_clusters
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 
 async def validate_screenshot_quality():
@@ -22,8 +24,6 @@ async def validate_screenshot_quality():
     print(f"\n🔍 Validating {len(pattern_folders)} completed patterns...")
     
     for folder in sorted(pattern_folders):
-        print(f"\n📁 {folder.name}")
-        
         # Check metadata.json for URLs and success status
         metadata_file = folder / "metadata.json"
         if metadata_file.exists():
@@ -46,12 +46,6 @@ async def validate_screenshot_quality():
                     if "404" in filename.lower() or "error" in filename.lower():
                         suspicious.append("error_filename")
                     
-                    status = "⚠️" if suspicious else "✅"
-                    print(f"  {status} {filename:<40} {file_size:>8,} bytes | {url[:50]}...")
-                    
-                    if suspicious:
-                        print(f"      Issues: {', '.join(suspicious)}")
-                    
                     results.append({
                         "pattern": folder.name,
                         "filename": filename,
@@ -61,15 +55,39 @@ async def validate_screenshot_quality():
                         "suspicious": suspicious
                     })
     
+    # Score every screenshot's content and find near-duplicates across folders
+    records = analyze_images([screenshot_dir / r["pattern"] / r["filename"] for r in results])
+    duplicates = {record["path"] for cluster in find_duplicate_clusters(records) for record in cluster}
+    
+    current_folder = None
+    for r, record in zip(results, records):
+        if record.get("verdict") in ("blank", "error_like"):
+            r["suspicious"].append(f"{record['verdict']}_page")
+        if record["path"] in duplicates:
+            r["suspicious"].append("duplicate")
+        r["entropy"] = record.get("entropy")
+        
+        if r["pattern"] != current_folder:
+            current_folder = r["pattern"]
+            print(f"\n📁 {current_folder}")
+        status = "⚠️" if r["suspicious"] else "✅"
+        print(f"  {status} {r['filename']:<40} {r['file_size']:>8,} bytes | {r['url'][:50]}...")
+        if r["suspicious"]:
+            print(f"      Issues: {', '.join(r['suspicious'])}")
+    
     # Summary
     total = len(results)
     suspicious_count = len([r for r in results if r["suspicious"]])
     small_files = len([r for r in results if r["file_size"] < 50000])
+    low_content = len([r for r in results if any(issue in r["suspicious"] for issue in ("blank_page", "error_like_page"))])
+    duplicate_count = len([r for r in results if "duplicate" in r["suspicious"]])
     
     print(f"\n📊 VALIDATION SUMMARY")
     print(f"Total screenshots: {total}")
     print(f"Suspicious captures: {suspicious_count}")
     print(f"Very small files (<50KB): {small_files}")
+    print(f"Blank or error-like pages: {low_content}")
+    print(f"Near-duplicates: {duplicate_count}")
     print(f"Success rate: {((total - suspicious_count) / total * 100):.1f}%")
     
     # List most suspicious